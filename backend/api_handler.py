@@ -2,18 +2,20 @@ import json
 import logging
 import os
 from argparse import Namespace
+from contextlib import contextmanager
 from time import perf_counter
 
-from ariadne import (
-    gql,
-    graphql_sync,
-)
+from ariadne import graphql_sync
 
-from dataall.api.Objects import bootstrap as bootstrap_schema, get_executable_schema
+from dataall.api.Objects import (
+    bootstrap as bootstrap_schema,
+    get_executable_schema,
+    load_type_defs,
+)
 from dataall.aws.handlers.service_handlers import Worker
 from dataall.aws.handlers.sqs import SqsQueue
 from dataall.db import init_permissions, get_engine, api, permissions
-from dataall.searchproxy import connect
+from dataall.searchproxy import LazyConnection
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
@@ -23,14 +25,35 @@ start = perf_counter()
 for name in ['boto3', 's3transfer', 'botocore', 'boto']:
     logging.getLogger(name).setLevel(logging.ERROR)
 
-SCHEMA = bootstrap_schema()
-TYPE_DEFS = gql(SCHEMA.gql(with_directives=False))
+# SDL rendered at image build time, see backend/docker/prod/lambda/Dockerfile
+SCHEMA_PATH = os.getenv(
+    'GRAPHQL_SCHEMA_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.graphql'),
+)
+timings = {}
+
+
+@contextmanager
+def phase(name):
+    phase_start = perf_counter()
+    yield
+    timings[name] = perf_counter() - phase_start
+
+
+with phase('schema'):
+    SCHEMA = bootstrap_schema()
+    executable_schema = get_executable_schema(
+        schema=SCHEMA, type_defs=load_type_defs(SCHEMA_PATH)
+    )
 ENVNAME = os.getenv('envname', 'local')
-ENGINE = get_engine(envname=ENVNAME)
-ES = connect(envname=ENVNAME)
+with phase('engine'):
+    ENGINE = get_engine(envname=ENVNAME)
+# Connects on first search instead of at cold start
+ES = LazyConnection(envname=ENVNAME)
 Worker.queue = SqsQueue.send
 
-init_permissions(ENGINE)
+with phase('permissions'):
+    init_permissions(ENGINE)
 
 
 def resolver_adapter(resolver):
@@ -51,9 +74,11 @@ def resolver_adapter(resolver):
     return adapted
 
 
-executable_schema = get_executable_schema()
 end = perf_counter()
-print(f'Lambda Context ' f'Initialization took: {end - start:.3f} sec')
+print(
+    f'Lambda Context Initialization took: {end - start:.3f} sec '
+    f'({", ".join(f"{k}: {v:.3f}" for k, v in timings.items())})'
+)
 
 
 def get_groups(claims):
@@ -116,20 +141,16 @@ def handler(event, context):
         try:
             groups = get_groups(event['requestContext']['authorizer']['claims'])
             with ENGINE.scoped_session() as session:
-                for group in groups:
-                    policy = api.TenantPolicy.find_tenant_policy(
-                        session, group, 'dataall'
+                provisioned = api.TenantPolicy.provision_groups(
+                    session=session,
+                    groups=groups,
+                    permissions=permissions.TENANT_ALL,
+                    tenant_name='dataall',
+                )
+                if provisioned:
+                    print(
+                        f'No policy found for Teams {provisioned}. Attached TENANT_ALL permissions'
                     )
-                    if not policy:
-                        print(
-                            f'No policy found for Team {group}. Attaching TENANT_ALL permissions'
-                        )
-                        api.TenantPolicy.attach_group_tenant_policy(
-                            session=session,
-                            group=group,
-                            permissions=permissions.TENANT_ALL,
-                            tenant_name='dataall',
-                        )
 
         except Exception as e:
             print(f'Error managing groups due to: {e}')
@@ -147,9 +168,10 @@ def handler(event, context):
         raise Exception(f'Could not initialize user context from event {event}')
 
     query = json.loads(event.get('body'))
-    success, response = graphql_sync(
-        schema=executable_schema, data=query, context_value=app_context
-    )
+    with SqsQueue.buffer():
+        success, response = graphql_sync(
+            schema=executable_schema, data=query, context_value=app_context
+        )
     response = json.dumps(response)
 
     log.info('Lambda Response %s', response)
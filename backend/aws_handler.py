@@ -21,4 +21,6 @@ def handler(event, context=None):
         log.info('Consumed record from queue: %s' % record)
         message = json.loads(record['body'])
         log.info(f'Extracted Message: {message}')
-        Worker.process(engine=engine, task_ids=message)
+        responses = Worker.process(engine=engine, task_ids=message) or []
+        for response in responses:
+            log.info(f'Task {response["taskUri"]} {response["status"]}')
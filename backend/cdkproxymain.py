@@ -2,10 +2,11 @@ import logging
 import os
 import sys
 from datetime import datetime
+from typing import List
 
 import boto3
 from botocore.exceptions import ClientError
-from fastapi import FastAPI, BackgroundTasks, status, Response
+from fastapi import FastAPI, BackgroundTasks, Body, status, Response
 
 import dataall.cdkproxy.cdk_cli_wrapper as wrapper
 from dataall.cdkproxy.stacks import StackManager
@@ -156,9 +157,12 @@ async def create_stack(
                     'error': 'ObjectNotFound',
                     'message': f'Stack {stackid} not found',
                 }
+            previous_status = stack.status
             stack.status = 'RUNNING'
         logger.info('Adding bg task')
-        background_tasks.add_task(wrapper.deploy_cdk_stack, engine, stackid)
+        background_tasks.add_task(
+            wrapper.deploy_cdk_stack, engine, stackid, previous_status=previous_status
+        )
         results.append(
             {
                 'DH_DOCKER_VERSION': os.environ.get('DH_DOCKER_VERSION'),
@@ -169,6 +173,56 @@ async def create_stack(
     return results
 
 
+@app.post('/stacks', status_code=status.HTTP_202_ACCEPTED)
+async def create_stacks(
+    background_tasks: BackgroundTasks,
+    response: Response,
+    stackids: List[str] = Body(..., embed=True),
+):
+    """Deploys or updates a batch of stacks, synthesized together per account and region"""
+    logger.info(f'POST /stacks {stackids}')
+    try:
+        engine = connect()
+    except Exception as e:
+        logger.exception('DBCONNECTION')
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        return {
+            'DH_DOCKER_VERSION': os.environ.get('DH_DOCKER_VERSION'),
+            '_ts': datetime.now().isoformat(),
+            'error': str(e),
+            'message': f'Failed to connect to database for environment `{ENVNAME}`',
+        }
+
+    with engine.scoped_session() as session:
+        stacks: [db.models.Stack] = (
+            session.query(db.models.Stack)
+            .filter(db.models.Stack.stackUri.in_(stackids))
+            .all()
+        )
+        missing = set(stackids) - {stack.stackUri for stack in stacks}
+        if missing:
+            logger.warning(f'Could not find stacks with stackUri `{missing}`')
+            response.status_code = status.HTTP_404_NOT_FOUND
+            return {
+                'DH_DOCKER_VERSION': os.environ.get('DH_DOCKER_VERSION'),
+                '_ts': datetime.now().isoformat(),
+                'error': 'ObjectNotFound',
+                'message': f'Stacks {sorted(missing)} not found',
+            }
+        previous_statuses = {stack.stackUri: stack.status for stack in stacks}
+        for stack in stacks:
+            stack.status = 'RUNNING'
+    logger.info('Adding bg task')
+    background_tasks.add_task(
+        wrapper.deploy_cdk_stacks, engine, stackids, previous_statuses=previous_statuses
+    )
+    return {
+        'DH_DOCKER_VERSION': os.environ.get('DH_DOCKER_VERSION'),
+        '_ts': datetime.now().isoformat(),
+        'message': f'Starting creation of {len(stackids)} stacks',
+    }
+
+
 @app.delete('/stack/{stackid}', status_code=status.HTTP_202_ACCEPTED)
 async def delete_stack(
     stackid: str, background_tasks: BackgroundTasks, response: Response
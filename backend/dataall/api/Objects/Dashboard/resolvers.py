@@ -199,15 +199,11 @@ def resolve_user_role(context: Context, source: models.Dashboard):
 
 
 def get_dashboard_organization(context: Context, source: models.Dashboard, **kwargs):
-    with context.engine.scoped_session() as session:
-        org = session.query(models.Organization).get(source.organizationUri)
-    return org
+    return context.loaders.get(models.Organization, source, 'organizationUri')
 
 
 def get_dashboard_environment(context: Context, source: models.Dashboard, **kwargs):
-    with context.engine.scoped_session() as session:
-        env = session.query(models.Environment).get(source.environmentUri)
-    return env
+    return context.loaders.get(models.Environment, source, 'environmentUri')
 
 
 def request_dashboard_share(
@@ -104,9 +104,7 @@ def get_pipeline(context: Context, source, DataPipelineUri: str = None):
 def get_pipeline_env(context: Context, source: models.DataPipeline, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        env = session.query(models.Environment).get(source.environmentUri)
-    return env
+    return context.loaders.get(models.Environment, source, 'environmentUri')
 
 
 def resolve_user_role(context: Context, source: models.DataPipeline):
@@ -121,6 +119,9 @@ def resolve_user_role(context: Context, source: models.DataPipeline):
 
 def get_pipeline_environment(context: Context, source: models.DataPipelineEnvironment, **kwargs):
     with context.engine.scoped_session() as session:
+        context.loaders.preload_permissions(
+            session, context.groups, source, 'envPipelineUri'
+        )
         return Pipeline.get_pipeline_environment(
             session=session,
             username=context.username,
@@ -174,20 +175,18 @@ def cat(context: Context, source, input: dict = None):
             data=None,
             check_perm=True,
         )
-        task = models.Task(
-            action='repo.datapipeline.cat',
-            targetUri=input.get('DataPipelineUri'),
-            payload={
-                'absolutePath': input.get('absolutePath'),
-                'branch': input.get('branch', 'master'),
-            },
-        )
-        session.add(task)
 
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
+    response = Worker.run(
+        engine=context.engine,
+        action='repo.datapipeline.cat',
+        target_uri=input.get('DataPipelineUri'),
+        payload={
+            'absolutePath': input.get('absolutePath'),
+            'branch': input.get('branch', 'master'),
+        },
+        cached=True,
     )
-    return response[0]['response'].decode('ascii')
+    return response.decode('ascii')
 
 
 def ls(context: Context, source, input: dict = None):
@@ -200,20 +199,18 @@ def ls(context: Context, source, input: dict = None):
             data=None,
             check_perm=True,
         )
-        task = models.Task(
-            action='repo.datapipeline.ls',
-            targetUri=input.get('DataPipelineUri'),
-            payload={
-                'folderPath': input.get('folderPath', '/'),
-                'branch': input.get('branch', 'master'),
-            },
-        )
-        session.add(task)
 
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
+    response = Worker.run(
+        engine=context.engine,
+        action='repo.datapipeline.ls',
+        target_uri=input.get('DataPipelineUri'),
+        payload={
+            'folderPath': input.get('folderPath', '/'),
+            'branch': input.get('branch', 'master'),
+        },
+        cached=True,
     )
-    return json.dumps(response[0]['response'])
+    return json.dumps(response)
 
 
 def list_branches(context: Context, source, DataPipelineUri: str = None):
@@ -226,13 +223,13 @@ def list_branches(context: Context, source, DataPipelineUri: str = None):
             data=None,
             check_perm=True,
         )
-        task = models.Task(action='repo.datapipeline.branches', targetUri=DataPipelineUri)
-        session.add(task)
 
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
+    return Worker.run(
+        engine=context.engine,
+        action='repo.datapipeline.branches',
+        target_uri=DataPipelineUri,
+        cached=True,
     )
-    return response[0]['response']
 
 
 def get_stack(context, source: models.DataPipeline, **kwargs):
@@ -248,29 +245,21 @@ def get_stack(context, source: models.DataPipeline, **kwargs):
 def get_job_runs(context, source: models.DataPipeline, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        task = models.Task(targetUri=source.DataPipelineUri, action='glue.job.runs')
-        session.add(task)
-
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
-    )[0]
-    return response['response']
+    return Worker.run(
+        engine=context.engine,
+        action='glue.job.runs',
+        target_uri=source.DataPipelineUri,
+    )
 
 
 def get_pipeline_executions(context: Context, source: models.DataPipeline, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        task = models.Task(
-            targetUri=source.DataPipelineUri, action='datapipeline.pipeline.executions'
-        )
-        session.add(task)
-
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
-    )[0]
-    return response['response']
+    return Worker.run(
+        engine=context.engine,
+        action='datapipeline.pipeline.executions',
+        target_uri=source.DataPipelineUri,
+    )
 
 
 def get_creds(context: Context, source, DataPipelineUri: str = None):
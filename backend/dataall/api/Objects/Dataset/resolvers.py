@@ -122,19 +122,24 @@ def resolve_user_role(context: Context, source: models.Dataset, **kwargs):
     elif source.stewards in context.groups:
         return DatasetRole.DataSteward.value
     else:
-        with context.engine.scoped_session() as session:
-            share = (
-                session.query(models.ShareObject)
-                .filter(models.ShareObject.datasetUri == source.datasetUri)
-                .first()
-            )
-            if share and (
-                share.owner == context.username or share.principalId in context.groups
-            ):
+        shares = context.loaders.load(_load_dataset_share_principals, source, 'datasetUri')
+        for owner, principal_id in shares or []:
+            if owner == context.username or principal_id in context.groups:
                 return DatasetRole.Shared.value
     return DatasetRole.NoPermission.value
 
 
+def _load_dataset_share_principals(session, dataset_uris):
+    principals = {}
+    for dataset_uri, owner, principal_id in session.query(
+        models.ShareObject.datasetUri,
+        models.ShareObject.owner,
+        models.ShareObject.principalId,
+    ).filter(models.ShareObject.datasetUri.in_(dataset_uris)):
+        principals.setdefault(dataset_uri, []).append((owner, principal_id))
+    return principals
+
+
 def get_file_upload_presigned_url(
     context, source, datasetUri: str = None, input: dict = None
 ):
@@ -203,15 +208,23 @@ def list_tables(context, source: models.Dataset, filter: dict = None):
 def get_dataset_organization(context, source: models.Dataset, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        return Organization.get_organization_by_uri(session, source.organizationUri)
+    if not source.organizationUri:
+        raise exceptions.RequiredParameter(param_name='organizationUri')
+    org = context.loaders.get(models.Organization, source, 'organizationUri')
+    if not org:
+        raise exceptions.ObjectNotFound('Organization', source.organizationUri)
+    return org
 
 
 def get_dataset_environment(context, source: models.Dataset, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        return Environment.get_environment_by_uri(session, source.environmentUri)
+    if not source.environmentUri:
+        raise exceptions.RequiredParameter('environmentUri')
+    environment = context.loaders.get(models.Environment, source, 'environmentUri')
+    if not environment:
+        raise exceptions.ObjectNotFound(models.Environment.__name__, source.environmentUri)
+    return environment
 
 
 def get_dataset_owners_group(context, source: models.Dataset, **kwargs):
@@ -249,18 +262,20 @@ def update_dataset(context, source, datasetUri: str = None, input: dict = None):
 def get_dataset_statistics(context: Context, source: models.Dataset, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        count_tables = db.api.Dataset.count_dataset_tables(session, source.datasetUri)
-        count_locations = db.api.Dataset.count_dataset_locations(
-            session, source.datasetUri
-        )
-        count_upvotes = db.api.Vote.count_upvotes(
-            session, None, None, source.datasetUri, {'targetType': 'dataset'}
-        )
+    return context.loaders.load(_load_dataset_statistics, source, 'datasetUri')
+
+
+def _load_dataset_statistics(session, dataset_uris):
+    count_tables = db.api.Dataset.count_tables_by_datasets(session, dataset_uris)
+    count_locations = db.api.Dataset.count_locations_by_datasets(session, dataset_uris)
+    count_upvotes = db.api.Vote.count_upvotes_by_targets(session, dataset_uris, 'dataset')
     return {
-        'tables': count_tables or 0,
-        'locations': count_locations or 0,
-        'upvotes': count_upvotes or 0,
+        uri: {
+            'tables': count_tables.get(uri, 0),
+            'locations': count_locations.get(uri, 0),
+            'upvotes': count_upvotes.get(uri, 0),
+        }
+        for uri in dataset_uris
     }
 
 
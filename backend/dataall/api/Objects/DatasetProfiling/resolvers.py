@@ -9,6 +9,9 @@ from ....db.api import ResourcePolicy
 
 log = logging.getLogger(__name__)
 
+# Glue job run states after which the status of a run no longer changes
+FINAL_RUN_STATES = ['SUCCEEDED', 'FAILED', 'STOPPED', 'TIMEOUT', 'ERROR']
+
 
 def resolve_dataset(context, source: models.DatasetProfilingRun):
     if not source:
@@ -51,12 +54,16 @@ def start_profiling_run(context: Context, source, input: dict = None):
 def get_profiling_run_status(context: Context, source: models.DatasetProfilingRun):
     if not source:
         return None
+    if source.status in FINAL_RUN_STATES:
+        return source.status
     with context.engine.scoped_session() as session:
-        task = models.Task(
-            targetUri=source.profilingRunUri, action='glue.job.profiling_run_status'
+        task = api.TaskRefresh.request_refresh(
+            session,
+            target_uri=source.profilingRunUri,
+            action='glue.job.profiling_run_status',
         )
-        session.add(task)
-    Worker.queue(engine=context.engine, task_ids=[task.taskUri])
+    if task:
+        Worker.queue(engine=context.engine, task_ids=[task.taskUri])
     return source.status
 
 
@@ -122,9 +129,7 @@ def get_last_table_profiling_run(context: Context, source, tableUri=None):
 
 
 def get_profiling_results_from_s3(environment, dataset, table, run):
-    s3 = SessionHelper.remote_session(environment.AwsAccountId).client(
-        's3', region_name=environment.region
-    )
+    s3 = SessionHelper.remote_client('s3', environment.AwsAccountId, environment.region)
     try:
         key = f'profiling/results/{dataset.datasetUri}/{table.GlueTableName}/{run.GlueJobRunId}/results.json'
         s3.head_object(Bucket=environment.EnvironmentDefaultBucketName, Key=key)
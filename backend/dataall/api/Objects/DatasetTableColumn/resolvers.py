@@ -1,9 +1,7 @@
-from sqlalchemy import or_
-
 from .... import db
 from ....api.context import Context
 from ....aws.handlers.service_handlers import Worker
-from ....db import paginate, permissions, models
+from ....db import paginate, permissions, models, search_filter
 from ....db.api import ResourcePolicy
 
 
@@ -31,9 +29,10 @@ def list_table_columns(
         term = filter.get('term')
         if term:
             q = q.filter(
-                or_(
-                    models.DatasetTableColumn.label.ilike('%' + term + '%'),
-                    models.DatasetTableColumn.description.ilike('%' + term + '%'),
+                search_filter(
+                    term,
+                    models.DatasetTableColumn.label,
+                    models.DatasetTableColumn.description,
                 )
             ).order_by(models.DatasetTableColumn.columnType.asc())
 
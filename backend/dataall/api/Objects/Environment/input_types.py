@@ -98,7 +98,8 @@ EnvironmentDataItemFilter = gql.InputType(
         gql.Argument('term', gql.String),
         gql.Argument('page', gql.Integer),
         gql.Argument('pageSize', gql.Integer),
-        gql.Argument('uniqueShares', gql.Boolean)
+        gql.Argument('uniqueShares', gql.Boolean),
+        gql.Argument('cursor', gql.String),
     ],
 )
 
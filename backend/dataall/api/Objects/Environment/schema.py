@@ -144,6 +144,7 @@ EnvironmentPublishedItemSearchResults = gql.ObjectType(
         gql.Field(name='pages', type=gql.Integer),
         gql.Field(name='hasNext', type=gql.Boolean),
         gql.Field(name='hasPrevious', type=gql.Boolean),
+        gql.Field(name='nextCursor', type=gql.String),
         gql.Field(name='nodes', type=gql.ArrayType(EnvironmentPublishedItem)),
     ],
 )
@@ -40,18 +40,16 @@ def resolve_feed_target_type(obj, *_):
 def resolve_target(context: Context, source: Feed, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        model = {
-            'Dataset': models.Dataset,
-            'DatasetTable': models.DatasetTable,
-            'DatasetTableColumn': models.DatasetTableColumn,
-            'DatasetStorageLocation': models.DatasetStorageLocation,
-            'Dashboard': models.Dashboard,
-            'DataPipeline': models.DataPipeline,
-            'Worksheet': models.Worksheet,
-        }[source.targetType]
-        target = session.query(model).get(source.targetUri)
-    return target
+    model = {
+        'Dataset': models.Dataset,
+        'DatasetTable': models.DatasetTable,
+        'DatasetTableColumn': models.DatasetTableColumn,
+        'DatasetStorageLocation': models.DatasetStorageLocation,
+        'Dashboard': models.Dashboard,
+        'DataPipeline': models.DataPipeline,
+        'Worksheet': models.Worksheet,
+    }[source.targetType]
+    return context.loaders.get(model, source, 'targetUri')
 
 
 def get_feed(
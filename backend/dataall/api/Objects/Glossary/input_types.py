@@ -87,6 +87,7 @@ TermFilter = gql.InputType(
         gql.Argument(name='term', type=gql.String),
         gql.Argument(name='page', type=gql.Integer),
         gql.Argument(name='pageSize', type=gql.Integer),
+        gql.Argument(name='cursor', type=gql.String),
     ],
 )
 
@@ -56,6 +56,9 @@ def list_groups(context, source: models.Organization, filter=None):
     if not filter:
         filter = {'page': 1, 'pageSize': 5}
     with context.engine.scoped_session() as session:
+        context.loaders.preload_permissions(
+            session, context.groups, source, 'organizationUri'
+        )
         return Organization.paginated_organization_groups(
             session=session,
             username=context.username,
@@ -70,6 +73,9 @@ def list_organization_environments(context, source, filter=None):
     if not filter:
         filter = {'page': 1, 'pageSize': 5}
     with context.engine.scoped_session() as session:
+        context.loaders.preload_permissions(
+            session, context.groups, source, 'organizationUri'
+        )
         return Organization.paginated_organization_environments(
             session=session,
             username=context.username,
@@ -7,6 +7,7 @@ from .... import db
 from ...constants import RedshiftClusterRole
 from ..Stack import stack_helper
 from ....api.context import Context
+from ....aws.handlers.live_status import RedshiftClusters
 from ....aws.handlers.redshift import Redshift
 from ....aws.handlers.service_handlers import Worker
 from ....aws.handlers.sts import SessionHelper
@@ -153,23 +154,32 @@ def get_cluster_status(context: Context, source: models.RedshiftCluster):
         return None
     with context.engine.scoped_session() as session:
         try:
-            aws_cluster = Redshift.describe_clusters(
-                **{
-                    'accountid': source.AwsAccountId,
-                    'region': source.region,
-                    'cluster_id': source.name,
-                }
+            clusters = RedshiftClusters.get(
+                (source.AwsAccountId, source.region),
+                siblings={
+                    (c.AwsAccountId, c.region) for c in context.loaders.siblings(source)
+                },
             )
+            if clusters is not None:
+                aws_cluster = clusters.get(source.name)
+            else:
+                aws_cluster = Redshift.describe_clusters(
+                    **{
+                        'accountid': source.AwsAccountId,
+                        'region': source.region,
+                        'cluster_id': source.name,
+                    }
+                )
             if aws_cluster:
                 map_aws_details_to_model(aws_cluster, source)
             if not source.external_schema_created:
-                task_init_db = models.Task(
-                    targetUri=source.clusterUri,
+                task_init_db = db.api.TaskRefresh.request_refresh(
+                    session,
+                    target_uri=source.clusterUri,
                     action='redshift.cluster.init_database',
                 )
-                session.add(task_init_db)
-                session.commit()
-                Worker.queue(engine=context.engine, task_ids=[task_init_db.taskUri])
+                if task_init_db:
+                    Worker.queue(engine=context.engine, task_ids=[task_init_db.taskUri])
 
             return source.status
         except ClientError as e:
@@ -219,9 +229,7 @@ def map_aws_details_to_model(aws_cluster_details, cluster):
 def get_cluster_organization(context: Context, source: models.RedshiftCluster):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        org = session.query(models.Organization).get(source.organizationUri)
-    return org
+    return context.loaders.get(models.Organization, source, 'organizationUri')
 
 
 def get_cluster_environment(context: Context, source: models.RedshiftCluster):
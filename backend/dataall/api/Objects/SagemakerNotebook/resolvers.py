@@ -2,6 +2,7 @@ from .... import db
 from ..Stack import stack_helper
 from ....api.constants import SagemakerNotebookRole
 from ....api.context import Context
+from ....aws.handlers.live_status import NotebookStatuses
 from ....aws.handlers.sagemaker import Sagemaker
 from ....db import permissions, models
 from ....db.api import ResourcePolicy, Notebook, KeyValueTag, Stack
@@ -61,6 +62,12 @@ def get_notebook(context, source, notebookUri: str = None):
 def resolve_status(context, source: models.SagemakerNotebook, **kwargs):
     if not source:
         return None
+    statuses = NotebookStatuses.get(
+        (source.AWSAccountId, source.region),
+        siblings={(n.AWSAccountId, n.region) for n in context.loaders.siblings(source)},
+    )
+    if statuses is not None:
+        return statuses.get(source.NotebookInstanceName, 'NOT FOUND')
     return Sagemaker.get_notebook_instance_status(
         AwsAccountId=source.AWSAccountId,
         region=source.region,
@@ -184,8 +191,7 @@ def delete_notebook(
 def resolve_environment(context, source, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        return session.query(models.Environment).get(source.environmentUri)
+    return context.loaders.get(models.Environment, source, 'environmentUri')
 
 
 def resolve_organization(context, source, **kwargs):
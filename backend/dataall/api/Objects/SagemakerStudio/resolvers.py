@@ -4,6 +4,7 @@ from ..Stack import stack_helper
 from .... import db
 from ....api.constants import SagemakerStudioRole
 from ....api.context import Context
+from ....aws.handlers.live_status import UserProfileStatuses
 from ....aws.handlers.sagemaker_studio import (
     SagemakerStudio,
 )
@@ -116,17 +117,32 @@ def resolve_status(context, source: models.SagemakerStudioUserProfile, **kwargs)
     if not source:
         return None
     try:
-        user_profile_status = SagemakerStudio.get_user_profile_status(
-            AwsAccountId=source.AWSAccountId,
-            region=source.region,
-            sagemakerStudioDomainID=source.sagemakerStudioDomainID,
-            sagemakerStudioUserProfileNameSlugify=source.sagemakerStudioUserProfileNameSlugify,
-        )
-        with context.engine.scoped_session() as session:
-            sm_user_profile = session.query(models.SagemakerStudioUserProfile).get(
-                source.sagemakerStudioUserProfileUri
+        statuses = UserProfileStatuses.get(
+            (source.AWSAccountId, source.region, source.sagemakerStudioDomainID),
+            siblings={
+                (p.AWSAccountId, p.region, p.sagemakerStudioDomainID)
+                for p in context.loaders.siblings(source)
+            },
+        )
+        if statuses is not None:
+            user_profile_status = statuses.get(
+                source.sagemakerStudioUserProfileNameSlugify
+            )
+            if user_profile_status is None:
+                return 'NOT FOUND'
+        else:
+            user_profile_status = SagemakerStudio.get_user_profile_status(
+                AwsAccountId=source.AWSAccountId,
+                region=source.region,
+                sagemakerStudioDomainID=source.sagemakerStudioDomainID,
+                sagemakerStudioUserProfileNameSlugify=source.sagemakerStudioUserProfileNameSlugify,
             )
-            sm_user_profile.sagemakerStudioUserProfileStatus = user_profile_status
+        if source.sagemakerStudioUserProfileStatus != user_profile_status:
+            with context.engine.scoped_session() as session:
+                sm_user_profile = session.query(models.SagemakerStudioUserProfile).get(
+                    source.sagemakerStudioUserProfileUri
+                )
+                sm_user_profile.sagemakerStudioUserProfileStatus = user_profile_status
         return user_profile_status
     except Exception:
         return 'NOT FOUND'
@@ -223,8 +239,7 @@ def delete_sagemaker_studio_user_profile(
 def resolve_environment(context, source, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        return session.query(models.Environment).get(source.environmentUri)
+    return context.loaders.get(models.Environment, source, 'environmentUri')
 
 
 def resolve_organization(context, source, **kwargs):
@@ -72,5 +72,6 @@ ShareableObjectFilter = gql.InputType(
         gql.Argument(name='isRevokable', type=gql.Boolean),
         gql.Argument('page', gql.Integer),
         gql.Argument('pageSize', gql.Integer),
+        gql.Argument('cursor', gql.String),
     ],
 )
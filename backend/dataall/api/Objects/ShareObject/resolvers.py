@@ -181,6 +181,7 @@ def list_shared_items(
     if not filter:
         filter = {}
     with context.engine.scoped_session() as session:
+        context.loaders.preload_permissions(session, context.groups, source, 'shareUri')
         return db.api.ShareObject.list_shared_items(
             session=session,
             username=context.username,
@@ -195,6 +196,7 @@ def resolve_shared_item(context, source: models.ShareObjectItem, **kwargs):
     if not source:
         return None
     with context.engine.scoped_session() as session:
+        context.loaders.preload_permissions(session, context.groups, source, 'shareUri')
         return db.api.ShareObject.get_share_item(
             session=session,
             username=context.username,
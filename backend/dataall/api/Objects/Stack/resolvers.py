@@ -7,6 +7,7 @@ from ...context import Context
 from .... import db
 from ....aws.handlers.cloudformation import CloudFormation
 from ....aws.handlers.cloudwatch import CloudWatch
+from ....aws.handlers.service_handlers import Worker
 from ....db import exceptions
 from ....db import models
 from ....utils import Parameter
@@ -21,7 +22,9 @@ def get_stack(
         env: models.Environment = session.query(models.Environment).get(environmentUri)
         stack: models.Stack = session.query(models.Stack).get(stackUri)
         cfn_task = stack_helper.save_describe_stack_task(session, env, stack, None)
-        CloudFormation.describe_stack_resources(engine=context.engine, task=cfn_task)
+        if cfn_task:
+            CloudFormation.describe_stack_resources(engine=context.engine, task=cfn_task)
+            Worker.update_task(context.engine, cfn_task.taskUri, None, {}, 'completed')
         return db.api.Environment.get_stack(
             session=session,
             username=context.username,
@@ -30,13 +30,16 @@ def get_stack_with_cfn_resources(context: Context, targetUri: str, environmentUr
             return stack
 
         cfn_task = save_describe_stack_task(session, env, stack, targetUri)
+    if cfn_task:
         Worker.queue(engine=context.engine, task_ids=[cfn_task.taskUri])
     return stack
 
 
 def save_describe_stack_task(session, environment, stack, target_uri):
-    cfn_task = models.Task(
-        targetUri=stack.stackUri,
+    """Describe task of the stack, None when the stack resources are fresh"""
+    return db.api.TaskRefresh.request_refresh(
+        session,
+        target_uri=stack.stackUri,
         action='cloudformation.stack.describe_resources',
         payload={
             'accountid': environment.AwsAccountId,
@@ -46,10 +49,8 @@ def save_describe_stack_task(session, environment, stack, target_uri):
             'stackUri': stack.stackUri,
             'targetUri': target_uri,
         },
+        last_refreshed=stack.lastSeen,
     )
-    session.add(cfn_task)
-    session.commit()
-    return cfn_task
 
 
 def deploy_stack(context, targetUri):
@@ -66,7 +67,7 @@ def deploy_stack(context, targetUri):
             cluster_name = Parameter().get_parameter(
                 env=envname, path='ecs/cluster/name'
             )
-            if not Ecs.is_task_running(cluster_name, f'awsworker-{stack.stackUri}'):
+            if not Ecs.get_stack_task(cluster_name, stack):
                 stack.EcsTaskArn = Ecs.run_cdkproxy_task(stack.stackUri)
             else:
                 task: models.Task = models.Task(
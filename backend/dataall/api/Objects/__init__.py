@@ -1,3 +1,4 @@
+import os
 from argparse import Namespace
 
 from ariadne import (
@@ -11,7 +12,9 @@ from ariadne import (
 )
 
 from .. import gql
+from ..dataloader import RequestLoaders
 from ...api.constants import GraphQLEnumMapper
+from ...db.api import PermissionEvaluator
 from . import (
     Permission,
     DataPipeline,
@@ -77,33 +80,55 @@ def bootstrap():
     return schema
 
 
-def save():
+def save(path='schema.graphql', with_directives=True):
     schema = bootstrap()
-    with open('schema.graphql', 'w') as f:
-        f.write(schema.gql())
+    with open(path, 'w') as f:
+        f.write(schema.gql(with_directives=with_directives))
+
+
+def load_type_defs(path):
+    """SDL saved at packaging time with save(path, with_directives=False), if any"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read()
 
 
 def resolver_adapter(resolver):
     def adapted(obj, info, **kwargs):
-        response = resolver(
-            context=Namespace(
-                engine=info.context['engine'],
-                es=info.context['es'],
-                username=info.context['username'],
-                groups=info.context['groups'],
-                schema=info.context['schema'],
-                cdkproxyurl=info.context['cdkproxyurl'],
-            ),
-            source=obj or None,
-            **kwargs,
-        )
-        return response
+        loaders = info.context.get('loaders')
+        if loaders is None:
+            loaders = info.context['loaders'] = RequestLoaders(info.context['engine'])
+        evaluator = info.context.get('permissions')
+        if evaluator is None:
+            evaluator = info.context['permissions'] = PermissionEvaluator(
+                info.context['groups']
+            )
+        with evaluator.activate():
+            response = resolver(
+                context=Namespace(
+                    engine=info.context['engine'],
+                    es=info.context['es'],
+                    username=info.context['username'],
+                    groups=info.context['groups'],
+                    schema=info.context['schema'],
+                    cdkproxyurl=info.context['cdkproxyurl'],
+                    loaders=loaders,
+                ),
+                source=obj or None,
+                **kwargs,
+            )
+        return loaders.collect(response)
 
     return adapted
 
 
-def get_executable_schema():
-    schema = bootstrap()
+def get_executable_schema(schema=None, type_defs=None):
+    """
+    Binds the resolvers of the schema to its SDL. The SDL is rendered from the
+    schema unless pre-rendered type_defs (see load_type_defs) are given.
+    """
+    schema = schema or bootstrap()
     _types = []
     for _type in schema.types:
         if _type.name == 'Query':
@@ -137,6 +162,7 @@ def get_executable_schema():
     for union in schema.unions:
         _unions.append(UnionType(union.name, union.resolver))
 
-    type_defs = GQL(schema.gql(with_directives=False))
+    if type_defs is None:
+        type_defs = GQL(schema.gql(with_directives=False))
     executable_schema = make_executable_schema(type_defs, *(_types + _enums + _unions))
     return executable_schema
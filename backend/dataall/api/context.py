@@ -6,9 +6,11 @@ class Context:
         username=None,
         groups=None,
         cdkproxyurl=None,
+        loaders=None,
     ):
         self.engine = engine
         self.es = es
         self.username = username
         self.groups = groups
         self.cdkproxyurl = cdkproxyurl
+        self.loaders = loaders
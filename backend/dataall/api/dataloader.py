@@ -0,0 +1,124 @@
+"""
+Request scoped batching for nested field resolvers.
+
+graphql_sync resolves the fields of sibling objects one after the other, so a
+nested resolver (e.g. ``Dataset.environment``) cannot wait for its siblings to
+ask for their keys. Instead, every object returned by a resolver is registered
+in the request's ``RequestLoaders``; on the first cache miss a loader collects
+the keys of all registered siblings of the same type and resolves them with a
+single ``IN (...)`` query. Later siblings are then served from memory.
+Resource permissions are preloaded the same way, see ``preload_permissions``.
+"""
+import logging
+from collections import defaultdict
+
+from ..db import Base
+from ..db.api import ResourcePolicy
+
+log = logging.getLogger(__name__)
+
+
+class DataLoader:
+    def __init__(self, engine, batch_load_fn):
+        self.engine = engine
+        self.batch_load_fn = batch_load_fn
+        self._cache = {}
+
+    def load(self, key, sibling_keys=None):
+        if key is None:
+            return None
+        if key not in self._cache:
+            keys = {key}
+            for sibling_key in sibling_keys or []:
+                if sibling_key is not None and sibling_key not in self._cache:
+                    keys.add(sibling_key)
+            with self.engine.scoped_session() as session:
+                results = self.batch_load_fn(session, list(keys))
+            for k in keys:
+                self._cache[k] = results.get(k)
+        return self._cache[key]
+
+    def prime(self, key, value):
+        self._cache.setdefault(key, value)
+
+    def clear(self, key=None):
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+
+class RequestLoaders:
+    """Registry of the loaders and resolved objects of one GraphQL request"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._loaders = {}
+        self._sources = defaultdict(dict)
+
+    def collect(self, result):
+        if isinstance(result, dict):
+            nodes = result.get('nodes')
+            if isinstance(nodes, list):
+                for node in nodes:
+                    self._register(node)
+        elif isinstance(result, (list, tuple)):
+            for item in result:
+                self._register(item)
+        else:
+            self._register(result)
+        return result
+
+    def _register(self, obj):
+        if isinstance(obj, Base):
+            self._sources[type(obj)][id(obj)] = obj
+
+    def siblings(self, source):
+        registered = self._sources.get(type(source))
+        if not registered:
+            return [source]
+        return list(registered.values())
+
+    def loader(self, batch_load_fn) -> DataLoader:
+        if batch_load_fn not in self._loaders:
+            self._loaders[batch_load_fn] = DataLoader(self.engine, batch_load_fn)
+        return self._loaders[batch_load_fn]
+
+    def load(self, batch_load_fn, source, key):
+        """Loads batch_load_fn(session, keys)[key(source)] batching all siblings of source"""
+        get_key = key if callable(key) else (lambda obj: getattr(obj, key, None))
+        return self.loader(batch_load_fn).load(
+            get_key(source), [get_key(s) for s in self.siblings(source)]
+        )
+
+    def preload_permissions(self, session, groups, source, key):
+        """
+        Loads the resource permissions of the groups on the attribute `key` of
+        source and of all its siblings with one query, the checks of the
+        siblings are then answered from memory by the request evaluator
+        """
+        ResourcePolicy.preload_user_resource_permissions(
+            session, groups, [getattr(s, key, None) for s in self.siblings(source)]
+        )
+
+    def get(self, model, source, key):
+        """Loads the model row whose primary key is the attribute `key` of source"""
+        return self.load(_primary_key_loader(model), source, key)
+
+
+_PK_LOADERS = {}
+
+
+def _primary_key_loader(model):
+    if model not in _PK_LOADERS:
+        pk = model.__mapper__.primary_key[0]
+        attribute = model.__mapper__.get_property_by_column(pk).key
+
+        def batch_load(session, keys):
+            return {
+                getattr(obj, attribute): obj
+                for obj in session.query(model).filter(pk.in_(keys)).all()
+            }
+
+        _PK_LOADERS[model] = batch_load
+    return _PK_LOADERS[model]
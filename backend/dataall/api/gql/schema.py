@@ -4,15 +4,54 @@ from .graphql_type import ObjectType
 
 
 class Schema:
-    def __init__(self, types=None, inputs=None, enums=None, unions=[]):
-        self.types = types if types else []
-        self.inputs = inputs if inputs else []
-        self.enums = enums if enums else []
-        self.unions = unions if unions else []
+    """
+    Registry of the types of a GraphQL schema. Types, inputs, enums and unions
+    are indexed by name and iterated in insertion order. The rendered SDL is
+    memoized: the Schema methods invalidate it, code mutating a registered
+    type directly (e.g. ObjectType.add_field) must call invalidate().
+    """
+
+    def __init__(self, types=None, inputs=None, enums=None, unions=None):
+        self._types = self._index(types)
+        self._inputs = self._index(inputs)
+        self._enums = self._index(enums)
+        self._unions = self._index(unions)
+        self._gql = {}
         self.ensure_query()
         self.ensure_mutation()
         self.context = {}
 
+    @staticmethod
+    def _index(items) -> dict:
+        index = {}
+        for item in items or []:
+            index.setdefault(item.name, item)
+        return index
+
+    @property
+    def types(self) -> list:
+        return list(self._types.values())
+
+    @property
+    def inputs(self) -> list:
+        return list(self._inputs.values())
+
+    @property
+    def enums(self) -> list:
+        return list(self._enums.values())
+
+    @property
+    def unions(self) -> list:
+        return list(self._unions.values())
+
+    def named_types(self):
+        """Iterates over enums, inputs, unions and object types, in SDL order"""
+        for registry in (self._enums, self._inputs, self._unions, self._types):
+            yield from registry.values()
+
+    def invalidate(self):
+        self._gql = {}
+
     def update_context(self, key, value):
         self.context[key] = value
 
@@ -23,6 +62,7 @@ class Schema:
             )
         elif not len(self.type('Query').fields):
             self.type('Query').add_field(field=Field(name='test', type=String))
+            self.invalidate()
 
     def ensure_mutation(self):
         if not self.type('Mutation'):
@@ -31,42 +71,43 @@ class Schema:
             )
         elif not len(self.type('Mutation').fields):
             self.type('Mutation').add_field(field=Field(name='test', type=String))
+            self.invalidate()
 
     def enum(self, enum_name):
-        return next(filter(lambda t: t.name == enum_name, self.enums), None)
+        return self._enums.get(enum_name)
 
     def union(self, union_name):
-        return next(filter(lambda t: t.name == union_name, self.unions), None)
+        return self._unions.get(union_name)
 
     def type(self, type_name) -> ObjectType:
-        return next(filter(lambda t: t.name == type_name, self.types), None)
+        return self._types.get(type_name)
 
     def input_type(self, type_name):
-        return next(filter(lambda t: t.name == type_name, self.inputs), None)
+        return self._inputs.get(type_name)
 
     def add_type(self, type):
-        if not self.type(type.name):
-            self.types.append(type)
-        else:
+        if type.name in self._types:
             raise Exception('Type already exists')
+        self._types[type.name] = type
+        self.invalidate()
 
     def remove_type(self, type_name):
-        if self.type(type_name):
-            self.types = [t for t in self.types if t.name != type_name]
-        else:
+        if type_name not in self._types:
             raise Exception('Type not found')
+        del self._types[type_name]
+        self.invalidate()
 
     def add_input_type(self, input_type):
-        if not self.input_type(input_type.name):
-            self.inputs.append(input_type)
-        else:
+        if input_type.name in self._inputs:
             raise Exception('InputType already exists')
+        self._inputs[input_type.name] = input_type
+        self.invalidate()
 
     def remove_input_type(self, input_type_name):
-        if self.input_type(input_type_name):
-            self.inputs = [t for t in self.inputs if t.name != input_type_name]
-        else:
+        if input_type_name not in self._inputs:
             raise Exception('InputType not found')
+        del self._inputs[input_type_name]
+        self.invalidate()
 
     def get_types_by_directive_name(self, directive_name):
         if isinstance(directive_name, list):
@@ -76,25 +117,30 @@ class Schema:
                     if t.has_directive(directive):
                         if not types.get(t.name):
                             types[t.name] = []
-                        types[t].append(directive)
+                        types[t.name].append(directive)
             return types
         else:
             return [t for t in self.types if t.has_directive(directive_name)]
 
     def gql(self, with_directives=True):
+        if with_directives not in self._gql:
+            self._gql[with_directives] = self._render(with_directives)
+        return self._gql[with_directives]
+
+    def _render(self, with_directives):
         n = '\n'
         input_types = ''
         enums = ''
         unions = ''
-        if len(self.inputs):
-            input_types = f"""{n.join([i.gql() for i in self.inputs])}{n}"""
-        if len(self.enums):
-            enums = f"""{n.join([e.gql() for e in self.enums])}{n}"""
+        if len(self._inputs):
+            input_types = f"""{n.join([i.gql() for i in self._inputs.values()])}{n}"""
+        if len(self._enums):
+            enums = f"""{n.join([e.gql() for e in self._enums.values()])}{n}"""
 
-        if len(self.unions):
-            unions = f"""{n.join([u.gql() for u in self.unions])}{n}"""
+        if len(self._unions):
+            unions = f"""{n.join([u.gql() for u in self._unions.values()])}{n}"""
 
-        types = f"""{n} {n.join([n+t.gql(with_directives=with_directives)+n for t in self.types])}"""
+        types = f"""{n} {n.join([n+t.gql(with_directives=with_directives)+n for t in self._types.values()])}"""
         return f"""{enums}{input_types}{unions}{types}"""
 
     def visit(self, visitors=[]):
@@ -105,6 +151,7 @@ class Schema:
         for VisitorClass in visitor_list:
             v = VisitorClass.instanciate(schema=self)
             v.visit()
+        self.invalidate()
 
     def resolve(self, path, context, source, **kwargs):
         object_type_name, field_name = path.split('/')
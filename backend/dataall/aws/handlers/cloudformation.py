@@ -1,5 +1,6 @@
 import logging
 import uuid
+from datetime import datetime
 
 from botocore.exceptions import ClientError
 
@@ -17,8 +18,9 @@ class CloudFormation:
 
     @staticmethod
     def client(AwsAccountId, region, role=None):
-        session = SessionHelper.remote_session(accountid=AwsAccountId, role=role)
-        return session.client('cloudformation', region_name=region)
+        return SessionHelper.remote_client(
+            'cloudformation', AwsAccountId, region, role=role
+        )
 
     @staticmethod
     def check_existing_cdk_toolkit_stack(AwsAccountId, region):
@@ -63,8 +65,7 @@ class CloudFormation:
         stack_name = data['stack_name']
         cdk_role_arn = data['cdk_role_arn']
         try:
-            aws_session = SessionHelper.remote_session(accountid=accountid)
-            cfnclient = aws_session.client('cloudformation', region_name=region)
+            cfnclient = SessionHelper.remote_client('cloudformation', accountid, region)
             response = cfnclient.delete_stack(
                 StackName=stack_name,
                 RoleARN=cdk_role_arn,
@@ -95,8 +96,7 @@ class CloudFormation:
             accountid = data['accountid']
             region = data['region']
             stack_name = data['stack_name']
-            aws_session = SessionHelper.remote_session(accountid=accountid)
-            cfnclient = aws_session.client('cloudformation', region_name=region)
+            cfnclient = SessionHelper.remote_client('cloudformation', accountid, region)
             response = cfnclient.describe_stacks(StackName=stack_name)
             return response['Stacks'][0]
         except ClientError as e:
@@ -161,6 +161,7 @@ class CloudFormation:
                     )
                 stack.events = {'events': filtered_events}
                 stack.error = None
+                stack.lastSeen = datetime.now()
                 session.commit()
         except ClientError as e:
             with engine.scoped_session() as session:
@@ -178,8 +179,7 @@ class CloudFormation:
         accountid = data['accountid']
         region = data.get('region', 'eu-west-1')
         stack_name = data['stack_name']
-        aws_session = SessionHelper.remote_session(accountid=accountid)
-        client = aws_session.client('cloudformation', region_name=region)
+        client = SessionHelper.remote_client('cloudformation', accountid, region)
         try:
             stack_resources = client.describe_stack_resources(StackName=stack_name)
             log.info(f'Stack describe resources response : {stack_resources}')
@@ -192,8 +192,7 @@ class CloudFormation:
         accountid = data['accountid']
         region = data.get('region', 'eu-west-1')
         stack_name = data['stack_name']
-        aws_session = SessionHelper.remote_session(accountid=accountid)
-        client = aws_session.client('cloudformation', region_name=region)
+        client = SessionHelper.remote_client('cloudformation', accountid, region)
         try:
             stack_events = client.describe_stack_events(StackName=stack_name)
             log.info(f'Stack describe events response : {stack_events}')
@@ -207,8 +206,7 @@ def check_cdk_boostrap(engine: Engine, task: models.Task):
     with engine.scoped_session() as session:
         account = task.payload.get('account')
         region = task.payload.get('region')
-        aws = SessionHelper.remote_session(accountid=account)
-        cfn = aws.client('cloudformation', region_name=region)
+        cfn = SessionHelper.remote_client('cloudformation', account, region)
         response = cfn.describe_stacks(StackName='CDKToolkit')
         stacks = response['Stacks']
         if len(stacks):
@@ -9,8 +9,7 @@ class CodeCommit:
 
     @staticmethod
     def client(AwsAccountId, region):
-        session = SessionHelper.remote_session(AwsAccountId)
-        return session.client('codecommit', region_name=region)
+        return SessionHelper.remote_client('codecommit', AwsAccountId, region)
 
     @staticmethod
     def _unpack(session, task):
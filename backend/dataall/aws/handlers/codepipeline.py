@@ -28,8 +28,9 @@ def get_pipeline_execution(engine: Engine, task: models.Task):
         )
         outputs = stack.outputs
         codepipeline_name = outputs['PipelineNameOutput']
-        aws = SessionHelper.remote_session(Datapipeline.AwsAccountId)
-        codepipeline_client = aws.client('codepipeline', region_name=Datapipeline.region)
+        codepipeline_client = SessionHelper.remote_client(
+            'codepipeline', Datapipeline.AwsAccountId, Datapipeline.region
+        )
         executions = []
         try:
             response = codepipeline_client.list_pipeline_executions(
@@ -9,8 +9,7 @@ log = logging.getLogger(__name__)
 class EC2:
     @staticmethod
     def client(account_id: str, region: str, role=None):
-        session = SessionHelper.remote_session(accountid=account_id, role=role)
-        return session.client('ec2', region_name=region)
+        return SessionHelper.remote_client('ec2', account_id, region, role=role)
 
     @staticmethod
     def check_default_vpc_exists(AwsAccountId: str, region: str, role=None):
@@ -1,5 +1,6 @@
 import logging
 import os
+import threading
 import time
 
 import boto3
@@ -15,9 +16,21 @@ log = logging.getLogger('aws:ecs')
 
 
 class Ecs:
+    _client = None
+    _lock = threading.Lock()
+
     def __init__(self):
         pass
 
+    @classmethod
+    def client(cls):
+        """ECS client shared by the threads, creating clients concurrently is not thread safe"""
+        if cls._client is None:
+            with cls._lock:
+                if cls._client is None:
+                    cls._client = boto3.client('ecs')
+        return cls._client
+
     @staticmethod
     @Worker.handler(path='ecs.share.approve')
     def approve_share(engine, task: models.Task):
@@ -88,16 +101,27 @@ class Ecs:
                 env=envname, path='ecs/cluster/name'
             )
 
-            while Ecs.is_task_running(cluster_name=cluster_name, started_by=f'awsworker-{task.targetUri}'):
+            while Ecs.get_stack_task(cluster_name, stack):
                 log.info(
                     f'ECS task for stack stack-{task.targetUri} is running waiting for 30 seconds before retrying...'
                 )
                 time.sleep(30)
+                session.refresh(stack)
 
             stack.EcsTaskArn = Ecs.run_cdkproxy_task(stack_uri=task.targetUri)
 
     @staticmethod
-    def run_cdkproxy_task(stack_uri):
+    def run_cdkproxy_task(stack_uri=None, stack_uris=None):
+        """
+        Starts the cdkproxy task deploying the stack, or the batch of stacks
+        of the same account and region when stack_uris is set
+        """
+        if stack_uris:
+            stack_variable = {'name': 'stackUris', 'value': ','.join(stack_uris)}
+            started_by = f'awsworker-batch-{stack_uris[0]}'
+        else:
+            stack_variable = {'name': 'stackUri', 'value': stack_uri}
+            started_by = f'awsworker-{stack_uri}'
         envname = os.environ.get('envname', 'local')
         cdkproxy_task_definition = Parameter().get_parameter(
             env=envname, path='ecs/task_def_arn/cdkproxy'
@@ -118,14 +142,14 @@ class Ecs:
                 security_groups=security_groups,
                 subnets=subnets,
                 environment=[
-                    {'name': 'stackUri', 'value': stack_uri},
+                    stack_variable,
                     {'name': 'envname', 'value': envname},
                     {
                         'name': 'AWS_REGION',
                         'value': os.getenv('AWS_REGION', 'eu-west-1'),
                     },
                 ],
-                started_by=f'awsworker-{stack_uri}',
+                started_by=started_by,
             )
             log.info(f'ECS Task {task_arn} running')
             return task_arn
@@ -143,7 +167,7 @@ class Ecs:
         environment,
         started_by='awsworker',
     ):
-        response = boto3.client('ecs').run_task(
+        response = Ecs.client().run_task(
             cluster=cluster_name,
             taskDefinition=task_definition,
             count=1,
@@ -182,7 +206,7 @@ class Ecs:
     @staticmethod
     def is_task_running(cluster_name, started_by):
         try:
-            client = boto3.client('ecs')
+            client = Ecs.client()
             running_tasks = client.list_tasks(
                 cluster=cluster_name, startedBy=started_by, desiredStatus='RUNNING'
             )
@@ -192,3 +216,42 @@ class Ecs:
         except ClientError as e:
             log.error(e)
             raise e
+
+    @staticmethod
+    def get_stack_task(cluster_name, stack: models.Stack) -> str:
+        """
+        Arn of the cdkproxy task deploying the stack, None when the stack is
+        not being deployed. The tasks deploying a batch of stacks are recorded
+        in the EcsTaskArn of every stack of the batch.
+        """
+        running_tasks = Ecs.list_running_tasks(cluster_name, f'awsworker-{stack.stackUri}')
+        if running_tasks:
+            return running_tasks[0]
+        if stack.EcsTaskArn and Ecs.get_task_status(cluster_name, stack.EcsTaskArn) != 'STOPPED':
+            return stack.EcsTaskArn
+        return None
+
+    @staticmethod
+    def list_running_tasks(cluster_name, started_by) -> [str]:
+        try:
+            client = Ecs.client()
+            running_tasks = client.list_tasks(
+                cluster=cluster_name, startedBy=started_by, desiredStatus='RUNNING'
+            )
+            return running_tasks.get('taskArns', []) if running_tasks else []
+        except ClientError as e:
+            log.error(e)
+            raise e
+
+    @staticmethod
+    def get_task_status(cluster_name, task_arn) -> str:
+        """Last status of the task (PROVISIONING, RUNNING, STOPPED...)"""
+        try:
+            client = Ecs.client()
+            response = client.describe_tasks(cluster=cluster_name, tasks=[task_arn])
+            tasks = response.get('tasks', [])
+            # Stopped tasks are only described for a while, after that they are gone
+            return tasks[0]['lastStatus'] if tasks else 'STOPPED'
+        except ClientError as e:
+            log.error(e)
+            raise e
@@ -1,7 +1,9 @@
 import logging
+import uuid
 
 from botocore.exceptions import ClientError
 
+from .lakeformation import LakeFormation
 from .service_handlers import Worker
 from .sts import SessionHelper
 from ... import db
@@ -35,8 +37,7 @@ class Glue:
     @staticmethod
     def _create_glue_database(accountid, database, region, location):
         try:
-            aws_session = SessionHelper.remote_session(accountid=accountid)
-            glue = aws_session.client('glue', region_name=region)
+            glue = SessionHelper.remote_client('glue', accountid, region)
             db_input = {
                 'Name': database,
                 'Description': 'dataall database {} '.format(database),
@@ -88,16 +89,19 @@ class Glue:
             return tables
 
     @staticmethod
-    def list_glue_database_tables(accountid, database, region):
-        aws_session = SessionHelper.remote_session(accountid=accountid)
-        glue = aws_session.client('glue', region_name=region)
+    def list_glue_database_tables(accountid, database, region, client=None):
+        if client:
+            glue = client
+        else:
+            glue = SessionHelper.remote_client('glue', accountid, region)
         found_tables = []
         try:
             log.debug(f'Looking for {database} tables')
 
-            if not Glue.database_exists(
-                accountid=accountid, database=database, region=region
-            ):
+            try:
+                glue.get_database(CatalogId=accountid, Name=database)
+            except ClientError:
+                log.info(f'Database {database} does not exist on account {accountid}...')
                 return found_tables
 
             paginator = glue.get_paginator('get_tables')
@@ -126,8 +130,7 @@ class Glue:
         table_name = data.get('tablename', 'UndefinedTableName')
         try:
             table = (
-                SessionHelper.remote_session(accountid)
-                .client('glue', region_name=region)
+                SessionHelper.remote_client('glue', accountid, region)
                 .get_table(
                     CatalogId=data['accountid'], DatabaseName=database, Name=table_name
                 )
@@ -144,8 +147,7 @@ class Glue:
         region = data.get('region', 'eu-west-1')
         database = data.get('database', 'UnknownDatabaseName')
 
-        session = SessionHelper.remote_session(accountid=accountid)
-        glue = session.client('glue', region_name=region)
+        glue = SessionHelper.remote_client('glue', accountid, region)
         log.info(
             'Creating table {} in database {}'.format(
                 data['tablename'], data['database']
@@ -223,8 +225,7 @@ class Glue:
 
     @staticmethod
     def delete_table(accountid, region, database, tablename):
-        session = SessionHelper.remote_session(accountid=accountid)
-        client = session.client('glue', region_name=region)
+        client = SessionHelper.remote_client('glue', accountid, region)
         log.info(
             'Deleting table {} in database {}'.format(
                 tablename, database
@@ -249,8 +250,7 @@ class Glue:
             f'Creating ResourceLink {resource_link_name} in database {accountid}://{database}'
         )
         try:
-            session = SessionHelper.remote_session(accountid=accountid)
-            glue = session.client('glue', region_name=region)
+            glue = SessionHelper.remote_client('glue', accountid, region)
             resource_link = Glue.table_exists(
                 accountid=accountid,
                 region=region,
@@ -332,8 +332,7 @@ class Glue:
         database = data['database']
         log.info(f'Deleting database {accountid}://{database} ...')
         try:
-            session = SessionHelper.remote_session(accountid=accountid)
-            glue = session.client('glue', region_name=region)
+            glue = SessionHelper.remote_client('glue', accountid, region)
             if Glue.database_exists(
                 accountid=accountid,
                 region=region,
@@ -362,8 +361,7 @@ class Glue:
 
         log.info(f'Batch deleting tables: {tables}')
         try:
-            session = SessionHelper.remote_session(accountid=accountid)
-            glue = session.client('glue', region_name=region)
+            glue = SessionHelper.remote_client('glue', accountid, region)
             if Glue.database_exists(
                 accountid=accountid,
                 region=region,
@@ -407,8 +405,7 @@ class Glue:
         try:
             accountid = data['accountid']
             database = data.get('database')
-            session = SessionHelper.remote_session(accountid=accountid)
-            glue = session.client('glue', region_name=data.get('region', 'eu-west-1'))
+            glue = SessionHelper.remote_client('glue', accountid, data.get('region', 'eu-west-1'))
             crawler_name = data.get('crawler_name')
             targets = {'S3Targets': [{'Path': data.get('location')}]}
             crawler = Glue._get_crawler(glue, crawler_name)
@@ -435,8 +432,7 @@ class Glue:
     def get_glue_crawler(data):
         try:
             accountid = data['accountid']
-            session = SessionHelper.remote_session(accountid=accountid)
-            glue = session.client('glue', region_name=data.get('region', 'eu-west-1'))
+            glue = SessionHelper.remote_client('glue', accountid, data.get('region', 'eu-west-1'))
             crawler_name = data.get('crawler_name')
             crawler = Glue._get_crawler(glue, crawler_name)
             return crawler
@@ -469,8 +465,7 @@ class Glue:
             crawler_name = data['crawler_name']
             database = data['database']
             targets = {'S3Targets': [{'Path': data.get('location')}]}
-            session = SessionHelper.remote_session(accountid=accountid)
-            glue = session.client('glue', region_name=data.get('region', 'eu-west-1'))
+            glue = SessionHelper.remote_client('glue', accountid, data.get('region', 'eu-west-1'))
             if data.get('location'):
                 Glue._update_existing_crawler(
                     glue, accountid, crawler_name, targets, database
@@ -626,8 +621,9 @@ class Glue:
             dataset_table: models.DatasetTable = session.query(models.DatasetTable).get(
                 task.targetUri
             )
-            aws = SessionHelper.remote_session(dataset_table.AWSAccountId)
-            glue_client = aws.client('glue', region_name=dataset_table.region)
+            glue_client = SessionHelper.remote_client(
+                'glue', dataset_table.AWSAccountId, dataset_table.region
+            )
             glue_table = {}
             try:
                 glue_table = glue_client.get_table(
@@ -654,8 +650,9 @@ class Glue:
             Data_pipeline: models.DataPipeline = session.query(models.DataPipeline).get(
                 task.targetUri
             )
-            aws = SessionHelper.remote_session(Data_pipeline.AwsAccountId)
-            glue_client = aws.client('glue', region_name=Data_pipeline.region)
+            glue_client = SessionHelper.remote_client(
+                'glue', Data_pipeline.AwsAccountId, Data_pipeline.region
+            )
             try:
                 response = glue_client.get_job_runs(JobName=Data_pipeline.name)
             except ClientError as e:
@@ -699,8 +696,7 @@ class Glue:
         accountid = data['accountid']
         name = data['name']
         try:
-            session = SessionHelper.remote_session(accountid=accountid)
-            client = session.client('glue', region_name=data.get('region', 'eu-west-1'))
+            client = SessionHelper.remote_client('glue', accountid, data.get('region', 'eu-west-1'))
             response = client.start_job_run(
                 JobName=name, Arguments=data.get('arguments', {})
             )
@@ -739,14 +735,52 @@ class Glue:
         name = data['name']
         run_id = data['run_id']
         try:
-            session = SessionHelper.remote_session(accountid=accountid)
-            client = session.client('glue', region_name=data.get('region', 'eu-west-1'))
+            client = SessionHelper.remote_client('glue', accountid, data.get('region', 'eu-west-1'))
             response = client.get_job_run(JobName=name, RunId=run_id)
             return response
         except ClientError as e:
             log.error(f'Failed to get job run {run_id} due to: {e}')
             raise e
 
+    @staticmethod
+    def batch_grant_principals_all_tables_permissions(
+        accountid, database, tables: [str], principals: [str], client
+    ):
+        """
+        Update the permissions of tables managed by data.all on Lake Formation
+        with BatchGrantPermissions requests instead of one request per
+        table and principal
+        :param accountid:
+        :param database:
+        :param tables: Glue table names
+        :param principals:
+        :param client: Lake Formation client of the account
+        :return: list of the failed entries
+        """
+        entries = [
+            {
+                'Id': str(uuid.uuid4()),
+                'Principal': {'DataLakePrincipalIdentifier': principal},
+                'Resource': {
+                    'Table': {
+                        'CatalogId': accountid,
+                        'DatabaseName': database,
+                        'Name': table,
+                    }
+                },
+                'Permissions': ['ALL'],
+            }
+            for table in tables
+            for principal in principals
+        ]
+        failures = LakeFormation.batch_grant_permissions(client, accountid, entries)
+        log.info(
+            f'Granted principals {principals} all permissions on '
+            f'{len(entries) - len(failures)}/{len(entries)} table entries of '
+            f'aws://{accountid}/{database}'
+        )
+        return failures
+
     @staticmethod
     def grant_principals_all_table_permissions(
         table: models.DatasetTable, principals: [str], client=None
@@ -760,8 +794,8 @@ class Glue:
         :return:
         """
         if not client:
-            client = SessionHelper.remote_session(table.AWSAccountId).client(
-                'lakeformation', region_name=table.region
+            client = SessionHelper.remote_client(
+                'lakeformation', table.AWSAccountId, table.region
             )
         for principal in principals:
             try:
@@ -9,8 +9,7 @@ class KMS:
 
     @staticmethod
     def client(account_id: str, region: str):
-        session = SessionHelper.remote_session(accountid=account_id)
-        return session.client('kms', region_name=region)
+        return SessionHelper.remote_client('kms', account_id, region)
 
     @staticmethod
     def put_key_policy(
@@ -20,8 +20,7 @@ class LakeFormation:
         Returns False is already existing location else return the resource info
         """
         try:
-            session = SessionHelper.remote_session(accountid)
-            lf_client = session.client('lakeformation', region_name=region)
+            lf_client = SessionHelper.remote_client('lakeformation', accountid, region)
             response = lf_client.describe_resource(ResourceArn=resource_arn)
             registered_role_name = response['ResourceInfo']['RoleArn'].lstrip(f"arn:aws:iam::{accountid}:role/")
             log.info(f'LF data location already registered: {response}, registered with role {registered_role_name}')
@@ -37,9 +36,7 @@ class LakeFormation:
     @staticmethod
     def grant_pivot_role_all_database_permissions(accountid, region, database):
         LakeFormation.grant_permissions_to_database(
-            client=SessionHelper.remote_session(accountid=accountid).client(
-                'lakeformation', region_name=region
-            ),
+            client=SessionHelper.remote_client('lakeformation', accountid, region),
             principals=[SessionHelper.get_delegation_role_arn(accountid)],
             database_name=database,
             permissions=['ALL'],
@@ -197,6 +194,27 @@ class LakeFormation:
             log.warning(f'Batch Revoke ended with failures: {failures}')
             raise e
 
+    @staticmethod
+    def batch_grant_permissions(client, accountid, entries):
+        """
+        Batch grant permissions to entries, 20 entries per request
+        Failures are logged and returned, the remaining entries are granted
+        :param client:
+        :param accountid:
+        :param entries:
+        :return: list of the failed entries
+        """
+        log.info(f'Batch Granting {len(entries)} entries')
+        failures = []
+        for i in range(0, len(entries), 20):
+            response = client.batch_grant_permissions(
+                CatalogId=accountid, Entries=entries[i : i + 20]
+            )
+            failures.extend(response.get('Failures', []))
+        if failures:
+            log.warning(f'Batch Grant ended with failures: {failures}')
+        return failures
+
     @staticmethod
     def grant_resource_link_permission_on_target(client, source, target):
         for principal in target['principals']:
@@ -279,8 +297,9 @@ class LakeFormation:
         for target_principal in target_principals:
             try:
 
-                aws_session = SessionHelper.remote_session(target_accountid)
-                lakeformation = aws_session.client('lakeformation', region_name=region)
+                lakeformation = SessionHelper.remote_client(
+                    'lakeformation', target_accountid, region
+                )
 
                 logging.info('Revoking DESCRIBE permission...')
                 lakeformation.revoke_permissions(
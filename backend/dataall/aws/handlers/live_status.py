@@ -0,0 +1,127 @@
+"""
+Live status of AWS resources shown in list views (notebooks, Studio user
+profiles, Redshift clusters).
+
+Instead of one describe call per rendered row, the statuses of all the
+resources of an account and region are listed at once, the groups of a page
+are listed concurrently and the results are cached. Entries younger than
+LIVE_STATUS_TTL are served as is; older entries, up to LIVE_STATUS_STALE_TTL,
+are served immediately while they are refreshed in the background.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .redshift import Redshift
+from .sagemaker import Sagemaker
+from .sagemaker_studio import SagemakerStudio
+
+log = logging.getLogger(__name__)
+
+
+class LiveStatus:
+    _executor = ThreadPoolExecutor(
+        max_workers=int(os.getenv('LIVE_STATUS_MAX_WORKERS', '8')),
+        thread_name_prefix='live-status',
+    )
+
+    def __init__(self, name, list_statuses, ttl=None, stale_ttl=None):
+        """list_statuses(*group) returns the statuses of a group by resource name"""
+        self.name = name
+        self.list_statuses = list_statuses
+        self.ttl = float(ttl if ttl is not None else os.getenv('LIVE_STATUS_TTL', '30'))
+        self.stale_ttl = float(
+            stale_ttl
+            if stale_ttl is not None
+            else os.getenv('LIVE_STATUS_STALE_TTL', '300')
+        )
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._refreshing = set()
+
+    def get(self, group, siblings=None) -> dict:
+        """
+        Statuses of the group, None when they could not be listed. The missing
+        or expired groups among siblings are listed concurrently with it.
+        """
+        groups = {group, *(siblings or [])}
+        now = time.monotonic()
+        missing = []
+        with self._lock:
+            for g in groups:
+                entry = self._entries.get(g)
+                age = now - entry[0] if entry else None
+                if entry is None or age >= self.stale_ttl:
+                    missing.append(g)
+                elif age >= self.ttl and g not in self._refreshing:
+                    self._refreshing.add(g)
+                    self._executor.submit(self._refresh, g)
+        if missing:
+            for g, statuses in zip(missing, self._executor.map(self._load, missing)):
+                self._store(g, statuses)
+        with self._lock:
+            entry = self._entries.get(group)
+        return entry[1] if entry else None
+
+    def invalidate(self, group=None):
+        with self._lock:
+            if group is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(group, None)
+
+    def _load(self, group):
+        try:
+            return self.list_statuses(*group)
+        except Exception as e:
+            log.error(f'Could not list {self.name} statuses of {group} due to: {e}')
+            return None
+
+    def _refresh(self, group):
+        try:
+            self._store(group, self._load(group))
+        finally:
+            with self._lock:
+                self._refreshing.discard(group)
+
+    def _store(self, group, statuses):
+        with self._lock:
+            if statuses is None:
+                # Failed listings are not cached, callers fall back to describe
+                self._entries.pop(group, None)
+            else:
+                self._entries[group] = (time.monotonic(), statuses)
+
+
+def list_notebook_instance_statuses(AwsAccountId, region) -> dict:
+    client = Sagemaker.client(AwsAccountId, region)
+    statuses = {}
+    for page in client.get_paginator('list_notebook_instances').paginate():
+        for instance in page.get('NotebookInstances', []):
+            statuses[instance['NotebookInstanceName']] = instance[
+                'NotebookInstanceStatus'
+            ]
+    return statuses
+
+
+def list_user_profile_statuses(AwsAccountId, region, sagemakerStudioDomainID) -> dict:
+    client = SagemakerStudio.client(AwsAccountId, region)
+    statuses = {}
+    for page in client.get_paginator('list_user_profiles').paginate(
+        DomainIdEquals=sagemakerStudioDomainID
+    ):
+        for profile in page.get('UserProfiles', []):
+            statuses[profile['UserProfileName']] = profile['Status']
+    return statuses
+
+
+def list_redshift_clusters(AwsAccountId, region) -> dict:
+    clusters = Redshift.describe_clusters(accountid=AwsAccountId, region=region)
+    return {cluster['ClusterIdentifier']: cluster for cluster in clusters or []}
+
+
+NotebookStatuses = LiveStatus('notebook instance', list_notebook_instance_statuses)
+UserProfileStatuses = LiveStatus('studio user profile', list_user_profile_statuses)
+RedshiftClusters = LiveStatus('redshift cluster', list_redshift_clusters)
@@ -27,8 +27,7 @@ class Quicksight:
             region(str) : aws region
         Returns : boto3.client ("quicksight")
         """
-        session = SessionHelper.remote_session(accountid=AwsAccountId)
-        return session.client('quicksight', region_name=region)
+        return SessionHelper.remote_client('quicksight', AwsAccountId, region)
 
     @staticmethod
     def get_identity_region(AwsAccountId):
@@ -67,8 +66,7 @@ class Quicksight:
 
         """
         identity_region = Quicksight.get_identity_region(AwsAccountId)
-        session = SessionHelper.remote_session(accountid=AwsAccountId)
-        return session.client('quicksight', region_name=identity_region)
+        return SessionHelper.remote_client('quicksight', AwsAccountId, identity_region)
 
     @staticmethod
     def check_quicksight_enterprise_subscription(AwsAccountId, region=None):
@@ -7,6 +7,11 @@ from .sts import SessionHelper
 
 log = logging.getLogger('aws:ram')
 
+# Polling of accepted invitations: first delay, maximum delay and total wait in seconds
+INVITATION_POLL_DELAY = 0.5
+INVITATION_POLL_MAX_DELAY = 8
+INVITATION_POLL_TIMEOUT = 60
+
 
 class Ram:
     @staticmethod
@@ -61,75 +66,115 @@ class Ram:
                 raise e
 
     @staticmethod
-    def accept_ram_invitation(**data):
+    def accept_ram_invitations(source, target, tablenames) -> [str]:
         """
-        Accepts RAM invitations on the target account
+        Accepts the RAM invitations of the tables shared with the target
+        account, handling every resource share once for the whole batch.
+        Resource shares whose invitation expired or was rejected are deleted
+        to reset the invitation.
+        :return: names of the tables that must be shared again
         """
-        retry_share_table = False
-        failed_invitations = []
-        source = data['source']
-        target = data['target']
-
         if source['accountid'] == target['accountid']:
             log.debug('Skipping RAM invitation management for same account sharing.')
-            return True
-
-        source_session = SessionHelper.remote_session(accountid=source['accountid'])
-        source_ram = source_session.client('ram', region_name=source['region'])
+            return []
 
-        target_session = SessionHelper.remote_session(accountid=target['accountid'])
-        target_ram = target_session.client('ram', region_name=target['region'])
-
-        resource_arn = (
-            f'arn:aws:glue:{source["region"]}:{source["accountid"]}:'
-            f'table/{data["source"]["database"]}/{data["source"]["tablename"]}'
+        source_ram = SessionHelper.remote_client(
+            'ram', source['accountid'], source['region']
+        )
+        target_ram = SessionHelper.remote_client(
+            'ram', target['accountid'], target['region']
         )
-        associations = Ram.list_resource_share_associations(source_ram, resource_arn)
-        resource_share_arns = [a['resourceShareArn'] for a in associations]
+
+        tables_by_resource_share = {}
+        for tablename in tablenames:
+            resource_arn = (
+                f'arn:aws:glue:{source["region"]}:{source["accountid"]}:'
+                f'table/{source["database"]}/{tablename}'
+            )
+            for association in Ram.list_resource_share_associations(source_ram, resource_arn):
+                tables_by_resource_share.setdefault(
+                    association['resourceShareArn'], set()
+                ).add(tablename)
+        resource_share_arns = list(tables_by_resource_share)
+        if not resource_share_arns:
+            return []
 
         ram_invitations = Ram.get_resource_share_invitations(
             target_ram, resource_share_arns, source['accountid'], target['accountid']
         )
         log.info(
-            f'Found {len(ram_invitations)} RAM invitations for resourceShareArn: {resource_share_arns}'
+            f'Found {len(ram_invitations)} RAM invitations for resourceShareArns: {resource_share_arns}'
         )
+        accepted_invitations = []
+        deleted_resource_shares = set()
+        reshare_tables = set()
         for invitation in ram_invitations:
-            if 'LakeFormation' in invitation['resourceShareName']:
-                if invitation['status'] == 'PENDING':
-                    log.info(
-                        f'Invitation {invitation} is in PENDING status accepting it ...'
-                    )
+            if 'LakeFormation' not in invitation['resourceShareName']:
+                continue
+            resource_share_arn = invitation['resourceShareArn']
+            if invitation['status'] == 'PENDING':
+                if invitation['resourceShareInvitationArn'] not in accepted_invitations:
+                    log.info(f'Invitation {invitation} is in PENDING status accepting it ...')
                     Ram.accept_resource_share_invitation(
                         target_ram, invitation['resourceShareInvitationArn']
                     )
-                    # Ram invitation acceptance is slow
-                    time.sleep(5)
-                elif (
-                    invitation['status'] == 'EXPIRED'
-                    or invitation['status'] == 'REJECTED'
-                ):
+                    accepted_invitations.append(invitation['resourceShareInvitationArn'])
+            elif invitation['status'] in ['EXPIRED', 'REJECTED']:
+                reshare_tables.update(tables_by_resource_share.get(resource_share_arn, []))
+                if resource_share_arn not in deleted_resource_shares:
                     log.warning(
                         f'Invitation {invitation} has expired or was rejected. '
-                        'Table flagged for revoke re-share.'
                         'Deleting the resource share to reset the invitation... '
                     )
-                    failed_invitations.append(invitation)
-                    retry_share_table = True
-                    source_ram.delete_resource_share(
-                        resourceShareArn=invitation['resourceShareArn']
-                    )
+                    source_ram.delete_resource_share(resourceShareArn=resource_share_arn)
+                    deleted_resource_shares.add(resource_share_arn)
+            elif invitation['status'] == 'ACCEPTED':
+                log.info(f'Invitation {invitation} already accepted nothing to do ...')
+            else:
+                log.warning(
+                    f'Invitation {invitation} is in an unknown status {invitation["status"]}'
+                )
 
-                elif invitation['status'] == 'ACCEPTED':
-                    log.info(
-                        f'Invitation {invitation} already accepted nothing to do ...'
-                    )
-                else:
-                    log.warning(
-                        f'Invitation is in an unknown status adding {invitation["status"]}. '
-                        'Adding it to retry share list ...'
-                    )
+        if accepted_invitations:
+            # Ram invitation acceptance is slow
+            Ram.wait_for_accepted_invitations(
+                target_ram,
+                resource_share_arns,
+                accepted_invitations,
+                source['accountid'],
+                target['accountid'],
+            )
 
-        return retry_share_table, failed_invitations
+        return sorted(reshare_tables)
+
+    @staticmethod
+    def wait_for_accepted_invitations(
+        client, resource_share_arns, invitation_arns, sender_account, receiver_account
+    ):
+        """
+        Polls the invitations with an exponential backoff until they are
+        no longer PENDING, or gives up after INVITATION_POLL_TIMEOUT seconds
+        :return: True if all the invitations left the PENDING status
+        """
+        delay = INVITATION_POLL_DELAY
+        deadline = time.monotonic() + INVITATION_POLL_TIMEOUT
+        pending = set(invitation_arns)
+        while True:
+            time.sleep(delay)
+            pending = {
+                i['resourceShareInvitationArn']
+                for i in Ram.get_resource_share_invitations(
+                    client, resource_share_arns, sender_account, receiver_account
+                )
+                if i['resourceShareInvitationArn'] in pending
+                and i['status'] == 'PENDING'
+            }
+            if not pending:
+                return True
+            if time.monotonic() + delay > deadline:
+                log.warning(f'RAM invitations {pending} are still PENDING, giving up waiting')
+                return False
+            delay = min(delay * 2, INVITATION_POLL_MAX_DELAY)
 
     @staticmethod
     def list_resource_share_associations(client, resource_arn):
@@ -31,8 +31,7 @@ class Redshift:
     def describe_clusters(**data):
         accountid = data['accountid']
         region = data.get('region', 'eu-west-1')
-        session = SessionHelper.remote_session(accountid)
-        client_redshift = session.client('redshift', region_name=region)
+        client_redshift = SessionHelper.remote_client('redshift', accountid, region)
         if data.get('cluster_id'):
             try:
                 response = client_redshift.describe_clusters(
@@ -69,8 +68,7 @@ class Redshift:
     def pause_cluster(**data):
         accountid = data['accountid']
         region = data.get('region', 'eu-west-1')
-        session = SessionHelper.remote_session(accountid)
-        client_redshift = session.client('redshift', region_name=region)
+        client_redshift = SessionHelper.remote_client('redshift', accountid, region)
         try:
             response = client_redshift.pause_cluster(
                 ClusterIdentifier=data['cluster_id']
@@ -84,8 +82,7 @@ class Redshift:
     def reboot_cluster(**data):
         accountid = data['accountid']
         region = data.get('region', 'eu-west-1')
-        session = SessionHelper.remote_session(accountid)
-        client_redshift = session.client('redshift', region_name=region)
+        client_redshift = SessionHelper.remote_client('redshift', accountid, region)
         try:
             response = client_redshift.reboot_cluster(
                 ClusterIdentifier=data['cluster_id']
@@ -99,8 +96,7 @@ class Redshift:
     def resume_cluster(**data):
         accountid = data['accountid']
         region = data.get('region', 'eu-west-1')
-        session = SessionHelper.remote_session(accountid)
-        client_redshift = session.client('redshift', region_name=region)
+        client_redshift = SessionHelper.remote_client('redshift', accountid, region)
         try:
             response = client_redshift.resume_cluster(
                 ClusterIdentifier=data['cluster_id']
@@ -113,8 +109,8 @@ class Redshift:
     @staticmethod
     def get_cluster_credentials(**data):
         try:
-            secretsmanager = SessionHelper.remote_session(data['accountid']).client(
-                'secretsmanager', region_name=data['region']
+            secretsmanager = SessionHelper.remote_client(
+                'secretsmanager', data['accountid'], data['region']
             )
             dh_secret = secretsmanager.get_secret_value(SecretId=data['secret_name'])
             credentials = json.loads(dh_secret['SecretString'])
@@ -131,9 +127,10 @@ class Redshift:
 
         accountid = data['accountid']
         region = data.get('region', 'eu-west-1')
-        session = SessionHelper.remote_session(accountid)
-        client_redshift = session.client('redshift', region_name=region)
-        client_redshift_data = session.client('redshift-data', region_name=region)
+        client_redshift = SessionHelper.remote_client('redshift', accountid, region)
+        client_redshift_data = SessionHelper.remote_client(
+            'redshift-data', accountid, region
+        )
         try:
             response = client_redshift.describe_clusters(
                 ClusterIdentifier=data['cluster_id'], MaxRecords=100
@@ -165,8 +162,8 @@ class Redshift:
                     session=session, uri=task.targetUri
                 )
             )
-            secretsmanager = SessionHelper.remote_session(cluster.AwsAccountId).client(
-                'secretsmanager', region_name=cluster.region
+            secretsmanager = SessionHelper.remote_client(
+                'secretsmanager', cluster.AwsAccountId, cluster.region
             )
             dh_secret = Redshift.get_secret(cluster, secretsmanager)
             credentials = json.loads(dh_secret['SecretString'])
@@ -362,8 +359,8 @@ class Redshift:
             cluster_datasets = db.api.RedshiftCluster.list_all_cluster_datasets(
                 session, cluster.clusterUri
             )
-            secretsmanager = SessionHelper.remote_session(cluster.AwsAccountId).client(
-                'secretsmanager', region_name=cluster.region
+            secretsmanager = SessionHelper.remote_client(
+                'secretsmanager', cluster.AwsAccountId, cluster.region
             )
             Redshift.set_cluster_secrets(secretsmanager, cluster)
             catalog_databases = []
@@ -390,8 +387,9 @@ class Redshift:
             try:
                 accountid = cluster.AwsAccountId
                 region = cluster.region
-                session = SessionHelper.remote_session(accountid)
-                client_redshift = session.client('redshift', region_name=region)
+                client_redshift = SessionHelper.remote_client(
+                    'redshift', accountid, region
+                )
                 client_redshift.create_tags(
                     ResourceName=f'arn:aws:redshift:{region}:{accountid}:cluster:{cluster.name}',
                     Tags=[{'Key': 'dataall', 'Value': 'true'}],
@@ -417,8 +415,9 @@ class Redshift:
             try:
                 accountid = cluster.AwsAccountId
                 region = cluster.region
-                aws_session = SessionHelper.remote_session(accountid)
-                client_redshift = aws_session.client('redshift', region_name=region)
+                client_redshift = SessionHelper.remote_client(
+                    'redshift', accountid, region
+                )
                 client_redshift.modify_cluster_iam_roles(
                     ClusterIdentifier=cluster.name,
                     AddIamRoles=[
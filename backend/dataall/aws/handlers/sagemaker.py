@@ -9,8 +9,7 @@ logger = logging.getLogger(__name__)
 class Sagemaker:
     @staticmethod
     def client(AwsAccountId, region):
-        session = SessionHelper.remote_session(accountid=AwsAccountId)
-        return session.client('sagemaker', region_name=region)
+        return SessionHelper.remote_client('sagemaker', AwsAccountId, region)
 
     @staticmethod
     def get_notebook_instance_status(AwsAccountId, region, NotebookInstanceName):
@@ -73,8 +72,7 @@ class Sagemaker:
     @staticmethod
     def get_security_groups(AwsAccountId, region):
         try:
-            session = SessionHelper.remote_session(accountid=AwsAccountId)
-            client = session.client('ec2', region_name=region)
+            client = SessionHelper.remote_client('ec2', AwsAccountId, region)
             response = client.describe_security_groups()
             sgnames = [SG['GroupName'] for SG in response['SecurityGroups']]
             sgindex = [
@@ -8,8 +8,7 @@ from ...db.models import Environment
 class SagemakerStudio:
     @staticmethod
     def client(AwsAccountId, region, role=None):
-        session = SessionHelper.remote_session(accountid=AwsAccountId, role=role)
-        return session.client('sagemaker', region_name=region)
+        return SessionHelper.remote_client('sagemaker', AwsAccountId, region, role=role)
 
     @staticmethod
     def get_sagemaker_studio_domain(AwsAccountId, region, role=None):
@@ -17,8 +17,7 @@ class SecretsManager:
 
     @staticmethod
     def client(AwsAccountId, region):
-        session = SessionHelper.remote_session(AwsAccountId)
-        return session.client('secretsmanager', region_name=region)
+        return SessionHelper.remote_client('secretsmanager', AwsAccountId, region)
 
     @staticmethod
     def get_secret_value(AwsAccountId, region, secretId):
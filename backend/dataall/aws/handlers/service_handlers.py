@@ -5,6 +5,7 @@ from functools import wraps
 
 from ...db.models import Task
 from ...utils.json_utils import to_json
+from ...utils.ttl_cache import TTLCache
 
 log = logging.getLogger(__name__)
 ENVNAME = os.getenv('envname', 'local')
@@ -22,6 +23,10 @@ class WorkerHandler:
     def __init__(self):
         self.handlers = {}
         self.enabled = True
+        # Responses of the read-only actions run with WorkerHandler.run(cached=True)
+        self.responses = TTLCache(
+            ttl=int(os.getenv('WORKER_RUN_CACHE_TTL', '60')), maxsize=1024
+        )
 
     def queue(self, engine, task_ids: [str]):
         log.info(f'Queuing Task Ids: {task_ids}')
@@ -34,6 +39,7 @@ class WorkerHandler:
         return decorator
 
     def process(self, engine, task_ids: [str], save_response=True):
+        """Processes every task of the message and returns the status of each one"""
         tasks_responses = []
         if self.enabled:
             for taskid in task_ids:
@@ -57,13 +63,43 @@ class WorkerHandler:
                             'status': status,
                         }
                     )
-                    return tasks_responses
                 except Exception as e:
                     log.exception('Error in process')
                     log.error(f'Task processing failed {e} : {taskid}')
+                    tasks_responses.append(
+                        {
+                            'taskUri': taskid,
+                            'response': {},
+                            'error': {'message': str(e)},
+                            'status': 'failed',
+                        }
+                    )
+            return tasks_responses
         else:
             log.info(f'Worker disabled, tasks {task_ids} wont be processed')
 
+    def run(self, engine, action, target_uri, payload=None, cached=False):
+        """
+        Runs the handler of a synchronous read-only action in process, on a
+        task that is never saved. Cached responses are keyed by action, target
+        and payload. Handler errors are raised to the caller.
+        """
+        handler = self.handlers.get(action)
+        if not handler:
+            raise Exception(f'No handler defined for {action}')
+        payload = payload or {}
+
+        def load():
+            log.info(f'Running {action} for {target_uri}')
+            return handler(
+                engine, Task(action=action, targetUri=target_uri, payload=payload)
+            )
+
+        if not cached:
+            return load()
+        key = (action, target_uri, tuple(sorted(payload.items())))
+        return self.responses.get_or_load(key, load)
+
     def get_task_handler(self, engine, taskid):
         with engine.scoped_session() as session:
             task = session.query(Task).get(taskid)
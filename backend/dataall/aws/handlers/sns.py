@@ -23,10 +23,9 @@ class Sns:
             environment = db.api.Environment.get_environment_by_uri(
                 session, dataset.environmentUri
             )
-            aws_session = SessionHelper.remote_session(
-                accountid=environment.AwsAccountId
+            sns = SessionHelper.remote_client(
+                'sns', environment.AwsAccountId, environment.region
             )
-            sns = aws_session.client('sns', region_name=environment.region)
             message = {
                 'prefix': task.payload['s3Prefix'],
                 'accountid': environment.AwsAccountId,
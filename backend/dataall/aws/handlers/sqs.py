@@ -1,19 +1,28 @@
+import contextvars
 import json
 import logging
 import os
 import uuid
+from contextlib import contextmanager
 
 import boto3
 from botocore.exceptions import ClientError
 
+from ...db import models
 from ...utils import Parameter
 
 logger = logging.getLogger(__name__)
 
+# send_message_batch accepts at most 10 entries
+MAX_BATCH_SIZE = 10
+
+_buffer = contextvars.ContextVar('sqs_buffer', default=None)
+
 
 class SqsQueue:
     disabled = True
     queue_url = None
+    _client = None
 
     @classmethod
     def configure_(cls, queue_url):
@@ -38,28 +47,120 @@ class SqsQueue:
     @classmethod
     def get_sqs_client(cls):
         if not cls.disabled:
-            client = boto3.client(
-                'sqs', region_name=os.getenv('AWS_REGION', 'eu-west-1')
-            )
-            return client
+            if cls._client is None:
+                cls._client = boto3.client(
+                    'sqs', region_name=os.getenv('AWS_REGION', 'eu-west-1')
+                )
+            return cls._client
 
     @classmethod
     def send(cls, engine, task_ids: [str]):
+        """
+        Sends the task ids as one message, or holds it until the end of the
+        enclosing SqsQueue.buffer() block when there is one
+        """
+        buffer = _buffer.get()
+        if buffer is not None:
+            logger.debug(f'Buffering task {task_ids}')
+            buffer.append((engine, list(task_ids)))
+            return None
+        return cls.send_batch([task_ids])
+
+    @classmethod
+    @contextmanager
+    def buffer(cls):
+        """
+        Collects the messages sent in the block and sends them in batches on
+        exit. The work of the block is already committed by then, so a message
+        that cannot be sent does not raise, its tasks are marked as failed.
+        """
+        buffer = []
+        token = _buffer.set(buffer)
+        try:
+            yield buffer
+        finally:
+            _buffer.reset(token)
+            if buffer:
+                cls.flush(buffer)
+
+    @classmethod
+    def flush(cls, buffer: [tuple]):
+        try:
+            _, failed = cls._send_batch([task_ids for _, task_ids in buffer])
+        except Exception as e:
+            logger.error(f'Failed to send buffered tasks through SQS due to: {e}')
+            failed = {index: str(e) for index in range(len(buffer))}
+        for index, error in failed.items():
+            engine, task_ids = buffer[index]
+            logger.error(f'Failed to send tasks {task_ids} through SQS: {error}')
+            if engine:
+                cls.fail_tasks(engine, task_ids, error)
+
+    @staticmethod
+    def fail_tasks(engine, task_ids: [str], error: str):
+        try:
+            with engine.scoped_session() as session:
+                session.query(models.Task).filter(
+                    models.Task.taskUri.in_(task_ids)
+                ).update(
+                    {
+                        models.Task.status: 'failed',
+                        models.Task.error: {'message': f'Failed to queue task: {error}'},
+                    },
+                    synchronize_session=False,
+                )
+                session.commit()
+        except Exception as e:
+            logger.error(f'Failed to mark tasks {task_ids} as failed due to: {e}')
+
+    @classmethod
+    def send_batch(cls, messages: [[str]]):
+        """Sends each list of task ids as a message, MAX_BATCH_SIZE messages per request"""
+        responses, failed = cls._send_batch(messages)
+        if failed:
+            raise Exception(f'Failed to send tasks {[messages[i] for i in failed]}')
+        return responses
+
+    @classmethod
+    def _send_batch(cls, messages: [[str]]) -> ([dict], dict):
+        """
+        Sends the messages batch after batch, a request that fails does not
+        stop the next ones. Returns the responses and the error of each
+        message that was not sent, by index
+        """
         cls.configure_(
             Parameter().get_parameter(env=cls.get_envname(), path='sqs/queue_url')
         )
         client = cls.get_sqs_client()
-        logger.debug(f'Sending task {task_ids} through SQS {cls.queue_url}')
-        try:
-            return client.send_message(
-                QueueUrl=cls.queue_url,
-                MessageBody=json.dumps(task_ids),
-                MessageGroupId=cls._get_random_message_id(),
-                MessageDeduplicationId=cls._get_random_message_id(),
+        logger.debug(f'Sending tasks {messages} through SQS {cls.queue_url}')
+        responses = []
+        failed = {}
+        for i in range(0, len(messages), MAX_BATCH_SIZE):
+            entries = [
+                {
+                    'Id': str(index),
+                    'MessageBody': json.dumps(task_ids),
+                    'MessageGroupId': cls._get_random_message_id(),
+                    'MessageDeduplicationId': cls._get_random_message_id(),
+                }
+                for index, task_ids in enumerate(messages[i: i + MAX_BATCH_SIZE])
+            ]
+            try:
+                response = client.send_message_batch(
+                    QueueUrl=cls.queue_url, Entries=entries
+                )
+            except ClientError as e:
+                logger.error(e)
+                failed.update({i + index: str(e) for index in range(len(entries))})
+                continue
+            responses.append(response)
+            for f in response.get('Failed', []):
+                failed[i + int(f['Id'])] = f.get('Message') or f.get('Code')
+        if failed:
+            logger.error(
+                f'Failed to send tasks {[messages[i] for i in failed]} through SQS {cls.queue_url}'
             )
-        except ClientError as e:
-            logger.error(e)
-            raise e
+        return responses, failed
 
     @classmethod
     def _get_random_message_id(cls):
@@ -7,8 +7,7 @@ def run_pipeline(state_machine_name, env: models.Environment, stage='Test'):
         raise Exception(
             'An error occurred (StackNotFound) when calling the RUN PIPELINE operation'
         )
-    aws = SessionHelper.remote_session(env.AwsAccountId)
-    client = aws.client('stepfunctions', region_name=env.region)
+    client = SessionHelper.remote_client('stepfunctions', env.AwsAccountId, env.region)
     arn = f'arn:aws:states:{env.region}:{env.AwsAccountId}:stateMachine:{state_machine_name}'
     try:
         client.describe_state_machine(stateMachineArn=arn)
@@ -27,8 +26,7 @@ def list_executions(state_machine_name, env: models.Environment, stage='Test'):
         raise Exception(
             'An error occurred (StackNotFound) when calling the RUN PIPELINE operation'
         )
-    aws = SessionHelper.remote_session(env.AwsAccountId)
-    client = aws.client('stepfunctions', region_name=env.region)
+    client = SessionHelper.remote_client('stepfunctions', env.AwsAccountId, env.region)
     arn = f'arn:aws:states:{env.region}:{env.AwsAccountId}:stateMachine:{state_machine_name}'
     try:
         client.describe_state_machine(stateMachineArn=arn)
@@ -1,12 +1,16 @@
 import json
 import logging
 import os
+import threading
 import urllib
 
 import boto3
+import botocore.session
 from botocore.client import Config
+from botocore.credentials import RefreshableCredentials
 from botocore.exceptions import ClientError
 
+from dataall.utils.ttl_cache import TTLCache
 from dataall.version import __version__, __pkg_name__
 
 try:
@@ -19,6 +23,16 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Assumed role credentials are shared by all the sessions and clients of a role
+# in the process and refreshed by botocore ahead of their expiration
+_ROLE_CREDENTIALS = {}
+# Clients are thread safe, unlike sessions, and cached per
+# (account, role, region, service) as long as the role credentials are
+_CLIENTS = {}
+_LOCK = threading.Lock()
+_ROLE_LOCKS = {}
+_SECRETS = TTLCache(ttl=int(os.getenv('SECRETS_CACHE_TTL', '300')))
+
 
 class SessionHelper:
     """SessionHelpers is a class simplifying common aws boto3 session tasks and helpers"""
@@ -39,35 +53,103 @@ class SessionHelper:
                     If role_arn is provided, base_session should be a boto3 session on the aws accountid is defined
         """
         if role_arn:
-            external_id_secret = cls.get_external_id_secret()
-            if external_id_secret:
-                assume_role_dict = dict(
-                    RoleArn=role_arn,
-                    RoleSessionName=role_arn.split('/')[1],
-                    ExternalId=external_id_secret,
-                )
-            else:
-                assume_role_dict = dict(
-                    RoleArn=role_arn,
-                    RoleSessionName=role_arn.split('/')[1],
+            credentials = cls._get_role_credentials(role_arn, base_session)
+            session = botocore.session.get_session()
+            session._credentials = credentials
+            return boto3.Session(botocore_session=session)
+        else:
+            return boto3.Session()
+
+    @classmethod
+    def _get_role_credentials(cls, role_arn, base_session=None) -> RefreshableCredentials:
+        """Returns the cached credentials of the role, assuming it on the first call"""
+        credentials = _ROLE_CREDENTIALS.get(role_arn)
+        if credentials:
+            return credentials
+        with _LOCK:
+            role_lock = _ROLE_LOCKS.setdefault(role_arn, threading.Lock())
+        with role_lock:
+            credentials = _ROLE_CREDENTIALS.get(role_arn)
+            if not credentials:
+                refresh = cls._assume_role_refresher(role_arn, base_session)
+                credentials = RefreshableCredentials.create_from_metadata(
+                    metadata=refresh(),
+                    refresh_using=refresh,
+                    method='sts-assume-role',
                 )
+                _ROLE_CREDENTIALS[role_arn] = credentials
+        return credentials
+
+    @classmethod
+    def _assume_role_refresher(cls, role_arn, base_session=None):
+        sts = (base_session or boto3.Session()).client(
+            'sts',
+            config=Config(user_agent_extra=f'{__pkg_name__}/{__version__}'),
+        )
+
+        def assume_role(external_id_secret):
+            assume_role_dict = dict(
+                RoleArn=role_arn,
+                RoleSessionName=role_arn.split('/')[1],
+            )
+            if external_id_secret:
+                assume_role_dict['ExternalId'] = external_id_secret
+            return sts.assume_role(**assume_role_dict)['Credentials']
+
+        def refresh():
+            # The external id is read on every refresh, it can be rotated
+            # during the life of the process
             try:
-                sts = base_session.client(
-                    'sts',
-                    config=Config(user_agent_extra=f'{__pkg_name__}/{__version__}'),
-                )
-                response = sts.assume_role(**assume_role_dict)
-                return boto3.Session(
-                    aws_access_key_id=response['Credentials']['AccessKeyId'],
-                    aws_secret_access_key=response['Credentials']['SecretAccessKey'],
-                    aws_session_token=response['Credentials']['SessionToken'],
-                )
+                log.info(f'Assuming role {role_arn}')
+                try:
+                    credentials = assume_role(cls.get_external_id_secret())
+                except ClientError as e:
+                    if e.response.get('Error', {}).get('Code') != 'AccessDenied':
+                        raise e
+                    log.info(f'Access denied assuming role {role_arn}, retrying with a fresh external id')
+                    credentials = assume_role(cls.get_external_id_secret(refresh=True))
             except ClientError as e:
                 log.error(f'Failed to assume role {role_arn} due to: {e} ')
                 raise e
+            return {
+                'access_key': credentials['AccessKeyId'],
+                'secret_key': credentials['SecretAccessKey'],
+                'token': credentials['SessionToken'],
+                'expiry_time': credentials['Expiration'].isoformat(),
+            }
 
-        else:
-            return boto3.Session()
+        return refresh
+
+    @classmethod
+    def remote_client(cls, service, accountid, region=None, role=None):
+        """Returns a cached boto3 client of the service on the remote AWS account
+        Args:
+            service(string) : aws service name
+            accountid(string) : aws account id
+            region(string, optional) : aws region of the client
+            role(string, optional) : arn of the IAM role to assume, defaults to the pivot role
+        Returns :
+            botocore.client.BaseClient: client of the service, shared by all the threads of the process
+        """
+        session = cls.remote_session(accountid=accountid, role=role)
+        credentials = session.get_credentials()
+        key = (accountid, role, region, service)
+        cached = _CLIENTS.get(key)
+        if credentials is not None and cached and cached[0] is credentials:
+            return cached[1]
+        with _LOCK:
+            client = session.client(service, region_name=region)
+        if credentials is not None:
+            _CLIENTS[key] = (credentials, client)
+        return client
+
+    @classmethod
+    def clear_cache(cls):
+        """Forgets the cached credentials, clients and secrets"""
+        with _LOCK:
+            _ROLE_CREDENTIALS.clear()
+            _CLIENTS.clear()
+        _SECRETS.invalidate()
 
     @classmethod
     def get_secret(cls, secret_name):
@@ -76,26 +158,34 @@ class SessionHelper:
         :return:
         :rtype:
         """
-        secret_string = None
+        secret_string = _SECRETS.get(secret_name)
+        if secret_string is not None:
+            return secret_string
         region = os.getenv('AWS_REGION', 'eu-west-1')
         try:
             session = SessionHelper.get_session()
             client = session.client('secretsmanager', region_name=region)
             secret_string = client.get_secret_value(SecretId=secret_name).get('SecretString')
             log.debug(f'Found Secret {secret_name}|{secret_string}')
+            if secret_string is not None:
+                _SECRETS.put(secret_name, secret_string)
         except ClientError as e:
             log.warning(f'Secret {secret_name} not found: {e}')
         return secret_string
 
     @classmethod
-    def get_external_id_secret(cls):
+    def get_external_id_secret(cls, refresh=False):
         """
         External Id used to secure dataall pivot role
         sts:AssumeRole operation on onboarded environments
+        :param refresh: reads the secret again instead of the cached value
         :return:
         :rtype:
         """
-        return SessionHelper.get_secret(secret_name=f'dataall-externalId-{os.getenv("envname", "local")}')
+        secret_name = f'dataall-externalId-{os.getenv("envname", "local")}'
+        if refresh:
+            _SECRETS.invalidate(secret_name)
+        return SessionHelper.get_secret(secret_name=secret_name)
 
     @classmethod
     def get_delegation_role_name(cls):
@@ -190,14 +280,13 @@ class SessionHelper:
         Returns :
             boto3.session.Session: boto3 Session, on the target aws accountid, assuming the delegation role or a provided role
         """
-        base_session = cls.get_session()
         if role:
             log.info(f"Remote boto3 session using role={role} for account={accountid}")
             role_arn = role
         else:
             log.info(f"Remote boto3 session using pivot role for account= {accountid}")
             role_arn = cls.get_delegation_role_arn(accountid=accountid)
-        session = SessionHelper.get_session(base_session=base_session, role_arn=role_arn)
+        session = SessionHelper.get_session(role_arn=role_arn)
         return session
 
     @classmethod
@@ -50,6 +50,12 @@ class CdkRunner:
             data = {}
             # logger.info(f"  Kwargs: None provided")
 
+        # 1.7 Reading the batch of stacks from context, set when several
+        # stacks of the same account and region are synthesized at once
+        _stacks = app.node.try_get_context('stacks')
+        stacks = json.loads(_stacks) if _stacks else []
+        table.append(['batch size', len(stacks)])
+
         # Creating CDK target environment
         env = Environment(account=account, region=region)
 
@@ -57,7 +63,17 @@ class CdkRunner:
         tbl = tabulate(table, headers=['Setting', 'Value'])  # , tablefmt="fancy_grid")
         logger.info(tbl)
 
-        instanciate_stack(stack_name, app, appid, env=env, target_uri=target_uri)
+        if stacks:
+            for batch_stack in stacks:
+                instanciate_stack(
+                    batch_stack['stack'],
+                    app,
+                    batch_stack['appid'],
+                    env=env,
+                    target_uri=batch_stack['target_uri'],
+                )
+        else:
+            instanciate_stack(stack_name, app, appid, env=env, target_uri=target_uri)
         app.synth()
 
 
@@ -3,10 +3,13 @@
 # Additionally, it uses the cdk plugin cdk-assume-role-credential-plugin to run cdk commands on target accounts
 # see : https://github.com/aws-samples/cdk-assume-role-credential-plugin
 
+import json
 import logging
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 import ast
 
 import boto3
@@ -18,6 +21,7 @@ from ..db import models
 from ..db.api import Pipeline, Environment, Stack
 from ..utils.alarm_service import AlarmService
 from dataall.cdkproxy.cdkpipeline.cdk_pipeline import CDKPipelineStack
+from .deployment_planner import DeploymentPlanner, DEPLOYED_STATUSES
 
 logger = logging.getLogger('cdksass')
 
@@ -53,8 +57,8 @@ def update_stack_output(session, stack):
         stack.outputs = outputs
 
 
-def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: str = None):
-    logger.warning(f'Starting new stack from  stackid {stackid}')
+def cdk_environment() -> dict:
+    """Environment of the cdk cli processes"""
     sts = boto3.client('sts')
     idnty = sts.get_caller_identity()
     this_aws_account = idnty['Account']
@@ -62,10 +66,40 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
     if ENVNAME not in ['local', 'dkrcompose']:
         creds = aws_configure()
 
+    python_path = '/:'.join(sys.path)[1:] + ':/code'
+    logger.info(f'python path = {python_path}')
+
+    env = {
+        'AWS_REGION': os.getenv('AWS_REGION', 'eu-west-1'),
+        'AWS_DEFAULT_REGION': os.getenv('AWS_REGION', 'eu-west-1'),
+        'PYTHONPATH': python_path,
+        'CURRENT_AWS_ACCOUNT': this_aws_account,
+        'envname': os.environ.get('envname', 'local'),
+    }
+    if creds:
+        env.update(
+            {
+                'AWS_ACCESS_KEY_ID': creds.get('AccessKeyId'),
+                'AWS_SECRET_ACCESS_KEY': creds.get('SecretAccessKey'),
+                'AWS_SESSION_TOKEN': creds.get('Token'),
+            }
+        )
+    return env
+
+
+def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: str = None, previous_status: str = None):
+    """
+    Deploys the stack, previous_status is the status of the stack before the
+    caller marked it as running, if it did
+    """
+    logger.warning(f'Starting new stack from  stackid {stackid}')
+    env = cdk_environment()
+
     with engine.scoped_session() as session:
         try:
             stack: models.Stack = session.query(models.Stack).get(stackid)
             logger.warning(f'stackuri = {stack.stackUri}, stackId = {stack.stackid}')
+            deployed = (previous_status or stack.status) in DEPLOYED_STATUSES
             stack.status = 'PENDING'
             session.commit()
 
@@ -88,34 +122,11 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
                 if path
                 else os.path.dirname(os.path.abspath(__file__))
             )
-            python_path = '/:'.join(sys.path)[1:] + ':/code'
-            logger.info(f'python path = {python_path}')
-
-            env = {
-                'AWS_REGION': os.getenv('AWS_REGION', 'eu-west-1'),
-                'AWS_DEFAULT_REGION': os.getenv('AWS_REGION', 'eu-west-1'),
-                'PYTHONPATH': python_path,
-                'CURRENT_AWS_ACCOUNT': this_aws_account,
-                'envname': os.environ.get('envname', 'local'),
-            }
-            if creds:
-                env.update(
-                    {
-                        'AWS_ACCESS_KEY_ID': creds.get('AccessKeyId'),
-                        'AWS_SECRET_ACCESS_KEY': creds.get('SecretAccessKey'),
-                        'AWS_SESSION_TOKEN': creds.get('Token'),
-                    }
-                )
 
             app_path = app_path or './app.py'
 
             logger.info(f'app_path: {app_path}')
-            cmd = [
-                '' '. ~/.nvm/nvm.sh &&',
-                'cdk',
-                'deploy --all',
-                '--require-approval',
-                ' never',
+            context = [
                 '-c',
                 f"appid='{stack.name}'",
                 # the target accountid
@@ -132,11 +143,8 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
                 f"target_uri='{stack.targetUri}'",
                 '-c',
                 "data='{}'",
-                # skips synth step when no changes apply
-                '--app',
-                f'"{sys.executable} {app_path}"',
-                '--verbose',
             ]
+            app = f'"{sys.executable} {app_path}"'
 
             if stack.stack == 'cdkpipeline':
                 aws = SessionHelper.remote_session(stack.accountid)
@@ -152,25 +160,44 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
                         'AWS_SESSION_TOKEN': creds.token,
                     }
                 )
-
-            logger.info(f"Running command : \n {' '.join(cmd)}")
-
-            process = subprocess.run(
-                ' '.join(cmd),
-                text=True,
-                shell=True,  # nosec
-                encoding='utf-8',
-                env=env,
-                cwd=cwd,
-            )
-            if stack.stack == 'cdkpipeline':
+                process = run_cdk(
+                    ['deploy --all', '--require-approval', ' never', *context, '--app', app, '--verbose'],
+                    env=env,
+                    cwd=cwd,
+                )
                 CDKPipelineStack.clean_up_repo(path=f'./{pipeline.repo}')
+            else:
+                # Synthesizes first and deploys the cloud assembly only when
+                # its templates differ from the deployed ones
+                fingerprint = DeploymentPlanner.fingerprint(session, stack)
+                cloud_assembly = tempfile.mkdtemp(prefix=f'cdk.out.{stack.stackUri}.')
+                try:
+                    process = run_cdk(
+                        ['synth', '--quiet', *context, '--app', app, '--output', cloud_assembly],
+                        env=env,
+                        cwd=cwd,
+                    )
+                    if process.returncode == 0:
+                        template_hash = DeploymentPlanner.template_hash(cloud_assembly)
+                        if deployed and template_hash == stack.templateHash:
+                            logger.info(f'Templates of stack {stack.name} are unchanged, skipping deployment')
+                        else:
+                            process = run_cdk(
+                                ['deploy --all', '--require-approval', ' never', '--app', cloud_assembly, '--verbose'],
+                                env=env,
+                                cwd=cwd,
+                            )
+                finally:
+                    shutil.rmtree(cloud_assembly, ignore_errors=True)
 
             if process.returncode == 0:
                 meta = describe_stack(stack)
                 stack.stackid = meta['StackId']
                 stack.status = meta['StackStatus']
                 update_stack_output(session, stack)
+                if stack.stack != 'cdkpipeline':
+                    stack.fingerprint = fingerprint
+                    stack.templateHash = template_hash
             else:
                 stack.status = 'CREATE_FAILED'
                 logger.error(f'Failed to deploy stack {stackid} due to {str(process.stderr)}')
@@ -182,6 +209,170 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
             raise e
 
 
+def deploy_cdk_stacks(engine: Engine, stackids: [str], app_path: str = None, previous_statuses: dict = None):
+    """
+    Deploys a batch of stacks. The stacks of the same account and region are
+    synthesized by a single cdk app process and deployed concurrently, the
+    cdk pipeline stacks are deployed one by one. previous_statuses are the
+    statuses of the stacks before the caller marked them as running, if it did.
+    """
+    previous_statuses = previous_statuses or {}
+    with engine.scoped_session() as session:
+        stacks = (
+            session.query(models.Stack)
+            .filter(models.Stack.stackUri.in_(stackids))
+            .all()
+        )
+        pipelines = [s.stackUri for s in stacks if s.stack == 'cdkpipeline']
+        groups = {}
+        for stack in stacks:
+            if stack.stack != 'cdkpipeline':
+                groups.setdefault((stack.accountid, stack.region), []).append(
+                    stack.stackUri
+                )
+
+    for stackid in pipelines:
+        deploy_cdk_stack(
+            engine, stackid, app_path=app_path, previous_status=previous_statuses.get(stackid)
+        )
+    if groups:
+        env = cdk_environment()
+        for (account, region), group in groups.items():
+            deploy_cdk_stack_group(
+                engine, env, account, region, group, app_path, previous_statuses
+            )
+
+
+def deploy_cdk_stack_group(
+    engine: Engine,
+    env: dict,
+    account: str,
+    region: str,
+    stackids: [str],
+    app_path: str = None,
+    previous_statuses: dict = None,
+):
+    previous_statuses = previous_statuses or {}
+    logger.warning(f'Starting batch of {len(stackids)} stacks on {account}/{region}')
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    app_path = app_path or './app.py'
+    with engine.scoped_session() as session:
+        stacks: [models.Stack] = (
+            session.query(models.Stack)
+            .filter(models.Stack.stackUri.in_(stackids))
+            .all()
+        )
+        try:
+            deployed = {
+                s.stackUri
+                for s in stacks
+                if previous_statuses.get(s.stackUri, s.status) in DEPLOYED_STATUSES
+            }
+            fingerprints = {
+                s.stackUri: DeploymentPlanner.fingerprint(session, s) for s in stacks
+            }
+            for stack in stacks:
+                stack.status = 'PENDING'
+            session.commit()
+
+            batch = [
+                {'appid': s.name, 'stack': s.stack, 'target_uri': s.targetUri}
+                for s in stacks
+            ]
+            template_hashes = {}
+            changed = []
+            cloud_assembly = tempfile.mkdtemp(prefix='cdk.out.batch.')
+            try:
+                process = run_cdk(
+                    [
+                        'synth',
+                        '--quiet',
+                        '-c',
+                        f"account='{account}'",
+                        '-c',
+                        f"region='{region}'",
+                        # the stacks of the batch, synthesized in the same app
+                        '-c',
+                        f"stacks='{json.dumps(batch)}'",
+                        '--app',
+                        f'"{sys.executable} {app_path}"',
+                        '--output',
+                        cloud_assembly,
+                    ],
+                    env=env,
+                    cwd=cwd,
+                )
+                if process.returncode == 0:
+                    for stack in stacks:
+                        template_hashes[stack.stackUri] = DeploymentPlanner.template_hash(
+                            cloud_assembly, artifact=stack.name
+                        )
+                        if stack.stackUri in deployed and template_hashes[stack.stackUri] == stack.templateHash:
+                            logger.info(f'Templates of stack {stack.name} are unchanged, skipping deployment')
+                        else:
+                            changed.append(stack)
+                    if changed:
+                        process = run_cdk(
+                            [
+                                'deploy',
+                                *[s.name for s in changed],
+                                '--require-approval',
+                                ' never',
+                                '--concurrency',
+                                os.getenv('CDK_DEPLOY_CONCURRENCY', '4'),
+                                '--app',
+                                cloud_assembly,
+                                '--verbose',
+                            ],
+                            env=env,
+                            cwd=cwd,
+                        )
+            finally:
+                shutil.rmtree(cloud_assembly, ignore_errors=True)
+
+            for stack in stacks:
+                # When the batch failed the stacks that were not updated can
+                # still report a complete status, their hashes are not stored
+                # so that the next deployment retries them
+                succeeded = process.returncode == 0 or (
+                    bool(template_hashes) and stack not in changed
+                )
+                try:
+                    meta = describe_stack(stack)
+                    stack.stackid = meta['StackId']
+                    stack.status = meta['StackStatus']
+                    update_stack_output(session, stack)
+                except ClientError as e:
+                    logger.warning(f'Failed to describe stack {stack.name} due to: {e}')
+                    succeeded = False
+                if succeeded:
+                    stack.fingerprint = fingerprints[stack.stackUri]
+                    stack.templateHash = template_hashes[stack.stackUri]
+                elif stack.status not in DEPLOYED_STATUSES:
+                    stack.status = 'CREATE_FAILED'
+                    logger.error(f'Failed to deploy stack {stack.stackUri} of batch')
+                    AlarmService().trigger_stack_deployment_failure_alarm(stack=stack)
+
+        except Exception as e:
+            logger.error(f'Failed to deploy batch of stacks {stackids} due to {e}')
+            for stack in stacks:
+                AlarmService().trigger_stack_deployment_failure_alarm(stack=stack)
+            raise e
+
+
+def run_cdk(args, env, cwd):
+    cmd = ['' '. ~/.nvm/nvm.sh &&', 'cdk', *args]
+    logger.info(f"Running command : \n {' '.join(cmd)}")
+    return subprocess.run(
+        ' '.join(cmd),
+        text=True,
+        shell=True,  # nosec
+        encoding='utf-8',
+        env=env,
+        cwd=cwd,
+    )
+
+
 def describe_stack(stack, engine: Engine = None, stackid: str = None):
     if not stack:
         with engine.scoped_session() as session:
@@ -0,0 +1,124 @@
+"""
+Change detection for stack deployments.
+
+The inputs of a stack are the row of its target, the data.all version and
+the source of the stacks (cdkproxy/stacks and the assets they package).
+Their fingerprint is stored on the stack once deployed, together with the
+hash of the synthesized templates, so that:
+- the stacks updater skips the stacks whose inputs did not change,
+- a deployment whose synthesized templates did not change skips cdk deploy.
+"""
+import glob
+import hashlib
+import json
+import logging
+import os
+
+from .. import version
+from ..db import models
+
+log = logging.getLogger(__name__)
+
+CDKPROXY_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIRS = ['stacks', 'assets']
+
+TARGET_MODELS = {
+    'environment': models.Environment,
+    'dataset': models.Dataset,
+    'notebook': models.SagemakerNotebook,
+    'sagemakerstudiouserprofile': models.SagemakerStudioUserProfile,
+    'redshift': models.RedshiftCluster,
+    'pipeline': models.DataPipeline,
+    'cdkpipeline': models.DataPipeline,
+}
+
+# Columns touched on every write, they do not change the deployed resources
+VOLATILE_COLUMNS = {'updated'}
+
+DEPLOYED_STATUSES = {'CREATE_COMPLETE', 'UPDATE_COMPLETE'}
+
+
+class DeploymentPlanner:
+    _sources_hash = None
+
+    @classmethod
+    def sources_hash(cls) -> str:
+        """Hash of the stacks source, computed once per process"""
+        if cls._sources_hash is None:
+            digest = hashlib.sha256()
+            for source_dir in SOURCE_DIRS:
+                for root, dirs, files in os.walk(os.path.join(CDKPROXY_DIR, source_dir)):
+                    dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+                    for name in sorted(files):
+                        path = os.path.join(root, name)
+                        digest.update(os.path.relpath(path, CDKPROXY_DIR).encode())
+                        with open(path, 'rb') as f:
+                            digest.update(f.read())
+            cls._sources_hash = digest.hexdigest()
+        return cls._sources_hash
+
+    @staticmethod
+    def target_row(session, stack: models.Stack) -> dict:
+        model = TARGET_MODELS.get(stack.stack)
+        target = session.query(model).get(stack.targetUri) if model else None
+        if not target:
+            return None
+        return {
+            column.key: getattr(target, column.key)
+            for column in model.__table__.columns
+            if column.key not in VOLATILE_COLUMNS
+        }
+
+    @staticmethod
+    def fingerprint(session, stack: models.Stack) -> str:
+        return hashlib.sha256(
+            json.dumps(
+                {
+                    'version': version.__version__,
+                    'sources': DeploymentPlanner.sources_hash(),
+                    'stack': stack.stack,
+                    'name': stack.name,
+                    'account': stack.accountid,
+                    'region': stack.region,
+                    'payload': stack.payload,
+                    'target': DeploymentPlanner.target_row(session, stack),
+                },
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def is_up_to_date(session, stack: models.Stack) -> bool:
+        """True when the stack is deployed and its inputs did not change since"""
+        return (
+            stack.status in DEPLOYED_STATUSES
+            and stack.fingerprint is not None
+            and stack.fingerprint == DeploymentPlanner.fingerprint(session, stack)
+        )
+
+    @staticmethod
+    def template_hash(cloud_assembly: str, artifact: str = None) -> str:
+        """
+        Hash of the templates and asset manifests of a synthesized cloud
+        assembly, or of one of its stacks when artifact is set
+        """
+        digest = hashlib.sha256()
+        if artifact:
+            patterns = [
+                f'{artifact}.template.json',
+                f'{artifact}.assets.json',
+                f'{artifact}*.nested.template.json',
+            ]
+        else:
+            patterns = ['*.template.json', '*.assets.json']
+        paths = {
+            path
+            for pattern in patterns
+            for path in glob.glob(os.path.join(cloud_assembly, pattern))
+        }
+        for path in sorted(paths):
+            digest.update(os.path.basename(path).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
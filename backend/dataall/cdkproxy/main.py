@@ -1,7 +1,8 @@
 # This  module is a very simple REST API that uses FastAPI and uvicorn
-# it exposes 4 APIs at following paths:
+# it exposes 5 APIs at following paths:
 # GET / : returns 200 to notify the server is up
 # POST /stack/{stackid} : deploys or updates the stack as found in the dataall database in the stack table
+# POST /stacks : deploys or updates a batch of stacks, body {"stackids": [...]}
 # GET /stack/{stackid} : returns metadata for the stack
 # DELETE /Stack/{stackid} : deletes the stack
 # To run the server locally, simply run
@@ -12,10 +13,11 @@ import logging
 import os
 import sys
 from datetime import datetime
+from typing import List
 
 import boto3
 from botocore.exceptions import ClientError
-from fastapi import FastAPI, BackgroundTasks, status, Response
+from fastapi import FastAPI, BackgroundTasks, Body, status, Response
 
 import cdk_cli_wrapper as wrapper
 from stacks import StackManager
@@ -144,15 +146,65 @@ async def create_stack(
                 'error': 'ObjectNotFound',
                 'message': f'Stack {stackid} not found',
             }  # yaml.safe_load(response.stdout)
+        previous_status = stack.status
         stack.status = 'RUNNING'
     logger.info('Adding bg task')
-    background_tasks.add_task(wrapper.deploy_cdk_stack, engine, stackid)
+    background_tasks.add_task(
+        wrapper.deploy_cdk_stack, engine, stackid, previous_status=previous_status
+    )
     return {
         '_ts': datetime.now().isoformat(),
         'message': f'Starting creation of StackId {stack.stackUri} on Account {stack.accountid} / Region {stack.region}',
     }
 
 
+@app.post('/stacks', status_code=status.HTTP_202_ACCEPTED)
+async def create_stacks(
+    background_tasks: BackgroundTasks,
+    response: Response,
+    stackids: List[str] = Body(..., embed=True),
+):
+    """Deploys or updates a batch of stacks, synthesized together per account and region"""
+    logger.info(f'POST /stacks {stackids}')
+    try:
+        engine = connect()
+    except Exception as e:
+        logger.exception('DBCONNECTION')
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        return {
+            '_ts': datetime.now().isoformat(),
+            'error': str(e),
+            'message': f'Failed to connect to database for environment `{ENVNAME}`',
+        }
+
+    with engine.scoped_session() as session:
+        stacks: [models.Stack] = (
+            session.query(models.Stack)
+            .filter(models.Stack.stackUri.in_(stackids))
+            .all()
+        )
+        missing = set(stackids) - {stack.stackUri for stack in stacks}
+        if missing:
+            logger.warning(f'Could not find stacks with stackUri `{missing}`')
+            response.status_code = status.HTTP_404_NOT_FOUND
+            return {
+                '_ts': datetime.now().isoformat(),
+                'error': 'ObjectNotFound',
+                'message': f'Stacks {sorted(missing)} not found',
+            }
+        previous_statuses = {stack.stackUri: stack.status for stack in stacks}
+        for stack in stacks:
+            stack.status = 'RUNNING'
+    logger.info('Adding bg task')
+    background_tasks.add_task(
+        wrapper.deploy_cdk_stacks, engine, stackids, previous_statuses=previous_statuses
+    )
+    return {
+        '_ts': datetime.now().isoformat(),
+        'message': f'Starting creation of {len(stackids)} stacks',
+    }
+
+
 @app.delete('/stack/{stackid}', status_code=status.HTTP_202_ACCEPTED)
 async def delete_stack(
     stackid: str, background_tasks: BackgroundTasks, response: Response
@@ -4,6 +4,7 @@ from . import exceptions
 from . import permissions
 from .connection import (
     Engine,
+    PoolConfig,
     get_engine,
     create_schema_if_not_exists,
     create_schema_and_tables,
@@ -13,5 +14,6 @@ from .connection import (
     init_permissions,
 )
 from .dbconfig import DbConfig
-from .paginator import paginate
+from .paginator import paginate, paginate_by_cursor
+from .search import search_filter, contains
 from . import api
@@ -1,11 +1,13 @@
 from .permission import Permission
 from .tenant import Tenant
 from .tenant_policy import TenantPolicy
+from .permission_evaluator import PermissionEvaluator
 from .resource_policy import ResourcePolicy
 from .permission_checker import has_tenant_perm, has_resource_perm
 from .target_type import TargetType
 from .keyvaluetag import KeyValueTag
 from .stack import Stack
+from .task_refresh import TaskRefresh
 from .organization import Organization
 from .environment import Environment
 from .glossary import Glossary
@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func
 from sqlalchemy.orm import Query
 
 from . import (
@@ -14,7 +14,7 @@ from . import (
     Stack
 )
 from . import Organization
-from .. import models, api, exceptions, permissions, paginate
+from .. import models, api, exceptions, permissions, paginate, search_filter
 from ..models.Enums import Language, ConfidentialityClassification
 from ...utils.naming_convention import (
     NamingConventionService,
@@ -245,9 +245,10 @@ class Dataset:
         )
         if filter and filter.get('term'):
             query = query.filter(
-                or_(
-                    models.Dataset.description.ilike(filter.get('term') + '%%'),
-                    models.Dataset.label.ilike(filter.get('term') + '%%'),
+                search_filter(
+                    filter.get('term'),
+                    models.Dataset.description,
+                    models.Dataset.label,
                 )
             )
         return query
@@ -679,3 +680,26 @@ class Dataset:
             .filter(models.DatasetStorageLocation.datasetUri == dataset_uri)
             .count()
         )
+
+    @staticmethod
+    def count_tables_by_datasets(session, dataset_uris: [str]) -> dict:
+        return dict(
+            session.query(
+                models.DatasetTable.datasetUri, func.count(models.DatasetTable.tableUri)
+            )
+            .filter(models.DatasetTable.datasetUri.in_(dataset_uris))
+            .group_by(models.DatasetTable.datasetUri)
+            .all()
+        )
+
+    @staticmethod
+    def count_locations_by_datasets(session, dataset_uris: [str]) -> dict:
+        return dict(
+            session.query(
+                models.DatasetStorageLocation.datasetUri,
+                func.count(models.DatasetStorageLocation.locationUri),
+            )
+            .filter(models.DatasetStorageLocation.datasetUri.in_(dataset_uris))
+            .group_by(models.DatasetStorageLocation.datasetUri)
+            .all()
+        )
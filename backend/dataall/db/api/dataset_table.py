@@ -1,3 +1,5 @@
+import hashlib
+import json
 import logging
 from typing import List
 
@@ -223,76 +225,108 @@ class DatasetTable:
             raise exceptions.ObjectNotFound('DatasetTable', table_uri)
         return table
 
+    @staticmethod
+    def glue_table_hash(glue_table: dict) -> str:
+        """Fingerprint of the Glue table attributes copied by the sync"""
+        storage_descriptor = glue_table.get('StorageDescriptor', {})
+        return hashlib.sha256(
+            json.dumps(
+                {
+                    'Location': storage_descriptor.get('Location'),
+                    'Columns': storage_descriptor.get('Columns', []),
+                    'PartitionKeys': glue_table.get('PartitionKeys', []),
+                    'Parameters': glue_table.get('Parameters', {}),
+                },
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+
     @staticmethod
     def sync(session, datasetUri, glue_tables=None):
 
         dataset: Dataset = session.query(Dataset).get(datasetUri)
         if dataset:
-            existing_tables = (
-                session.query(models.DatasetTable)
-                .filter(models.DatasetTable.datasetUri == datasetUri)
-                .all()
-            )
-            existing_table_names = [e.GlueTableName for e in existing_tables]
-            existing_dataset_tables_map = {t.GlueTableName: t for t in existing_tables}
+            glue_tables_map = {t['Name']: t for t in glue_tables or []}
+            existing_dataset_tables_map = {
+                t.GlueTableName: t
+                for t in session.query(models.DatasetTable).filter(
+                    models.DatasetTable.datasetUri == datasetUri
+                )
+            }
 
-            DatasetTable.update_existing_tables_status(existing_tables, glue_tables)
-            logger.info(
-                f'existing_tables={glue_tables}'
+            DatasetTable.update_existing_tables_status(
+                existing_dataset_tables_map.values(), glue_tables_map.values()
             )
-            for table in glue_tables:
-                if table['Name'] not in existing_table_names:
-                    logger.info(
-                        f'Storing new table: {table} for dataset db {dataset.GlueDatabaseName}'
-                    )
+
+            new_tables = []
+            changed_tables = []
+            for name, table in glue_tables_map.items():
+                table_hash = DatasetTable.glue_table_hash(table)
+                updated_table: models.DatasetTable = existing_dataset_tables_map.get(
+                    name
+                )
+                if not updated_table:
                     updated_table = models.DatasetTable(
                         datasetUri=dataset.datasetUri,
-                        label=table['Name'],
-                        name=table['Name'],
+                        label=name,
+                        name=name,
                         region=dataset.region,
                         owner=dataset.owner,
                         GlueDatabaseName=dataset.GlueDatabaseName,
                         AWSAccountId=dataset.AwsAccountId,
                         S3BucketName=dataset.S3BucketName,
                         S3Prefix=table.get('StorageDescriptor', {}).get('Location'),
-                        GlueTableName=table['Name'],
+                        GlueTableName=name,
                         LastGlueTableStatus='InSync',
-                        GlueTableProperties=json_utils.to_json(
-                            table.get('Parameters', {})
-                        ),
-                    )
-                    session.add(updated_table)
-                    session.commit()
-                    # ADD DATASET TABLE PERMISSIONS
-                    env = Environment.get_environment_by_uri(session, dataset.environmentUri)
-                    permission_group = set([dataset.SamlAdminGroupName, env.SamlGroupName, dataset.stewards if dataset.stewards is not None else dataset.SamlAdminGroupName])
-                    for group in permission_group:
-                        ResourcePolicy.attach_resource_policy(
-                            session=session,
-                            group=group,
-                            permissions=permissions.DATASET_TABLE_READ,
-                            resource_uri=updated_table.tableUri,
-                            resource_type=models.DatasetTable.__name__,
-                        )
-                else:
-                    logger.info(
-                        f'Updating table: {table} for dataset db {dataset.GlueDatabaseName}'
-                    )
-                    updated_table: models.DatasetTable = (
-                        existing_dataset_tables_map.get(table['Name'])
-                    )
-                    updated_table.GlueTableProperties = json_utils.to_json(
-                        table.get('Parameters', {})
                     )
+                    new_tables.append(updated_table)
+                elif (
+                    updated_table.GlueTableHash == table_hash
+                    and updated_table.LastGlueTableStatus != 'Deleted'
+                ):
+                    continue
+                updated_table.GlueTableProperties = json_utils.to_json(
+                    table.get('Parameters', {})
+                )
+                updated_table.LastGlueTableStatus = 'InSync'
+                updated_table.GlueTableHash = table_hash
+                changed_tables.append((updated_table, table))
 
-                DatasetTable.sync_table_columns(session, updated_table, table)
+            logger.info(
+                f'Glue database {dataset.GlueDatabaseName} has {len(glue_tables_map)} tables: '
+                f'{len(new_tables)} new, '
+                f'{len(changed_tables) - len(new_tables)} changed, '
+                f'{len(glue_tables_map) - len(changed_tables)} unchanged'
+            )
+
+            session.add_all(new_tables)
+            session.flush()
+            if new_tables:
+                # ADD DATASET TABLE PERMISSIONS
+                env = Environment.get_environment_by_uri(session, dataset.environmentUri)
+                permission_group = set([dataset.SamlAdminGroupName, env.SamlGroupName, dataset.stewards if dataset.stewards is not None else dataset.SamlAdminGroupName])
+                ResourcePolicy.attach_new_resources_policies(
+                    session=session,
+                    groups=list(permission_group),
+                    permissions=permissions.DATASET_TABLE_READ,
+                    resource_uris=[t.tableUri for t in new_tables],
+                    resource_type=models.DatasetTable.__name__,
+                )
+
+            DatasetTable.upsert_tables_columns(session, changed_tables)
+            session.commit()
 
         return True
 
     @staticmethod
     def update_existing_tables_status(existing_tables, glue_tables):
+        glue_table_names = {t['Name'] for t in glue_tables}
         for existing_table in existing_tables:
-            if existing_table.GlueTableName not in [t['Name'] for t in glue_tables]:
+            if (
+                existing_table.GlueTableName not in glue_table_names
+                and existing_table.LastGlueTableStatus != 'Deleted'
+            ):
                 existing_table.LastGlueTableStatus = 'Deleted'
                 logger.info(
                     f'Table {existing_table.GlueTableName} status set to Deleted from Glue.'
@@ -300,37 +334,96 @@ class DatasetTable:
 
     @staticmethod
     def sync_table_columns(session, dataset_table, glue_table):
+        DatasetTable.upsert_tables_columns(session, [(dataset_table, glue_table)])
+        session.commit()
 
-        DatasetTable.delete_all_table_columns(session, dataset_table)
-
-        columns = [
-            {**item, **{'columnType': 'column'}}
-            for item in glue_table.get('StorageDescriptor', {}).get('Columns', [])
-        ]
-        partitions = [
-            {**item, **{'columnType': f'partition_{index}'}}
-            for index, item in enumerate(glue_table.get('PartitionKeys', []))
-        ]
-
-        logger.debug(f'Found columns {columns} for table {dataset_table}')
-        logger.debug(f'Found partitions {partitions} for table {dataset_table}')
-
-        for col in columns + partitions:
-            table_col = models.DatasetTableColumn(
-                name=col['Name'],
-                description=col.get('Comment', 'No description provided'),
-                label=col['Name'],
-                owner=dataset_table.owner,
-                datasetUri=dataset_table.datasetUri,
-                tableUri=dataset_table.tableUri,
-                AWSAccountId=dataset_table.AWSAccountId,
-                GlueDatabaseName=dataset_table.GlueDatabaseName,
-                GlueTableName=dataset_table.GlueTableName,
-                region=dataset_table.region,
-                typeName=col['Type'],
-                columnType=col['columnType'],
+    @staticmethod
+    def upsert_tables_columns(session, tables: [tuple]):
+        """
+        Aligns the columns of (dataset_table, glue_table) pairs with Glue:
+        new columns are inserted, changed ones updated in place and stale
+        ones deleted, with one bulk statement of each kind for all the tables.
+        """
+        if not tables:
+            return
+
+        existing_columns = {}
+        for column in session.query(
+            models.DatasetTableColumn.columnUri,
+            models.DatasetTableColumn.tableUri,
+            models.DatasetTableColumn.name,
+            models.DatasetTableColumn.columnType,
+            models.DatasetTableColumn.typeName,
+            models.DatasetTableColumn.description,
+        ).filter(
+            models.DatasetTableColumn.tableUri.in_(
+                [dataset_table.tableUri for dataset_table, _ in tables]
             )
-            session.add(table_col)
+        ):
+            existing_columns.setdefault(column.tableUri, {})[
+                (column.name, column.columnType)
+            ] = column
+
+        inserts, updates, deletes = [], [], []
+        for dataset_table, glue_table in tables:
+            columns = [
+                {**item, **{'columnType': 'column'}}
+                for item in glue_table.get('StorageDescriptor', {}).get('Columns', [])
+            ]
+            partitions = [
+                {**item, **{'columnType': f'partition_{index}'}}
+                for index, item in enumerate(glue_table.get('PartitionKeys', []))
+            ]
+
+            logger.debug(f'Found columns {columns} for table {dataset_table}')
+            logger.debug(f'Found partitions {partitions} for table {dataset_table}')
+
+            table_columns = existing_columns.get(dataset_table.tableUri, {})
+            for col in columns + partitions:
+                description = col.get('Comment', 'No description provided')
+                existing = table_columns.pop((col['Name'], col['columnType']), None)
+                if not existing:
+                    inserts.append(
+                        dict(
+                            name=col['Name'],
+                            description=description,
+                            label=col['Name'],
+                            owner=dataset_table.owner,
+                            datasetUri=dataset_table.datasetUri,
+                            tableUri=dataset_table.tableUri,
+                            AWSAccountId=dataset_table.AWSAccountId,
+                            GlueDatabaseName=dataset_table.GlueDatabaseName,
+                            GlueTableName=dataset_table.GlueTableName,
+                            region=dataset_table.region,
+                            typeName=col['Type'],
+                            columnType=col['columnType'],
+                        )
+                    )
+                elif (existing.typeName, existing.description) != (
+                    col['Type'],
+                    description,
+                ):
+                    updates.append(
+                        dict(
+                            columnUri=existing.columnUri,
+                            typeName=col['Type'],
+                            description=description,
+                        )
+                    )
+            deletes.extend(column.columnUri for column in table_columns.values())
+
+        if deletes:
+            session.query(models.DatasetTableColumn).filter(
+                models.DatasetTableColumn.columnUri.in_(deletes)
+            ).delete(synchronize_session=False)
+        if updates:
+            session.bulk_update_mappings(models.DatasetTableColumn, updates)
+        if inserts:
+            session.bulk_insert_mappings(models.DatasetTableColumn, inserts)
+        logger.info(
+            f'Synchronized columns of {len(tables)} tables: {len(inserts)} inserted, '
+            f'{len(updates)} updated, {len(deletes)} deleted'
+        )
 
     @staticmethod
     def delete_all_table_columns(session, dataset_table):
@@ -23,7 +23,8 @@ from ..models.Enums import (
 
 )
 from ..models.Permission import PermissionType
-from ..paginator import Page, paginate
+from ..paginator import Page, paginate, paginate_by_cursor
+from ..search import contains
 from ...utils.naming_convention import (
     NamingConventionService,
     NamingConventionPattern,
@@ -900,6 +901,7 @@ class Environment:
         q = (
             session.query(
                 models.ShareObjectItem.shareUri.label('shareUri'),
+                models.ShareObjectItem.shareItemUri.label('shareItemUri'),
                 models.Dataset.datasetUri.label('datasetUri'),
                 models.Dataset.name.label('datasetName'),
                 models.Dataset.description.label('datasetDescription'),
@@ -984,7 +986,19 @@ class Environment:
 
         if data.get('term'):
             term = data.get('term')
-            q = q.filter(models.ShareObjectItem.itemName.ilike('%' + term + '%'))
+            q = q.filter(contains(models.ShareObjectItem.itemName, term))
+
+        if data.get('cursor') is not None:
+            keys = [models.ShareObject.shareUri]
+            if not data.get('uniqueShares', False):
+                keys.append(models.ShareObjectItem.shareItemUri)
+            return paginate_by_cursor(
+                query=q,
+                keys=keys,
+                page_size=data.get('pageSize', 10),
+                cursor=data.get('cursor'),
+                page=data.get('page', 1),
+            ).to_dict()
 
         return paginate(
             query=q, page=data.get('page', 1), page_size=data.get('pageSize', 10)
@@ -1077,7 +1091,7 @@ class Environment:
             )
         if data.get('term'):
             term = data.get('term')
-            q = q.filter(models.ShareObjectItem.itemName.ilike('%' + term + '%'))
+            q = q.filter(contains(models.ShareObjectItem.itemName, term))
 
         return paginate(
             query=q, page=data.get('page', 1), page_size=data.get('pageSize', 10)
@@ -1197,7 +1211,7 @@ class Environment:
             )
         if data.get('term'):
             term = data.get('term')
-            q = q.filter(models.ShareObjectItem.itemName.ilike('%' + term + '%'))
+            q = q.filter(contains(models.ShareObjectItem.itemName, term))
 
         return paginate(
             query=q, page=data.get('page', 1), page_size=data.get('pageSize', 10)
@@ -4,7 +4,7 @@ from datetime import datetime
 from sqlalchemy import asc, or_, and_, literal, case
 from sqlalchemy.orm import with_expression, aliased
 
-from .. import models, exceptions, permissions, paginate
+from .. import models, exceptions, permissions, paginate, paginate_by_cursor, search_filter
 from .permission_checker import (
     has_tenant_perm,
 )
@@ -163,9 +163,8 @@ class Glossary:
         term = data.get('term')
         if term:
             q = q.filter(
-                or_(
-                    models.GlossaryNode.label.ilike('%' + term + '%'),
-                    models.GlossaryNode.readme.ilike('%' + term + '%'),
+                search_filter(
+                    term, models.GlossaryNode.label, models.GlossaryNode.readme
                 )
             )
         return paginate(
@@ -224,9 +223,8 @@ class Glossary:
         term = data.get('term', None)
         if term:
             q = q.filter(
-                or_(
-                    models.GlossaryNode.label.ilike('%' + term.upper() + '%'),
-                    models.GlossaryNode.readme.ilike('%' + term.upper() + '%'),
+                search_filter(
+                    term, models.GlossaryNode.label, models.GlossaryNode.readme
                 )
             )
         matches = q.subquery('matches')
@@ -236,12 +234,7 @@ class Glossary:
         if term:
             parent_expr = case(
                 [
-                    (
-                        or_(
-                            parents.label.ilike(f'%{term}%'),
-                            parents.readme.ilike(f'%{term}%'),
-                        )
-                    )
+                    (search_filter(term, parents.label, parents.readme))
                 ],
                 else_=literal(False),
             )
@@ -252,12 +245,11 @@ class Glossary:
             session.query(parents)
             .options(with_expression(parents.isMatch, parent_expr))
             .join(
+                matches,
                 and_(
-                    matches,
                     matches.c.path.startswith(parents.path),
-                    matches,
                     matches.c.deleted.is_(None),
-                )
+                ),
             )
         )
 
@@ -265,10 +257,7 @@ class Glossary:
             child_expr = case(
                 [
                     (
-                        or_(
-                            children.label.ilike(f'%{term}%'),
-                            children.readme.ilike(f'%{term}%'),
-                        ),
+                        search_filter(term, children.label, children.readme),
                         and_(children.deleted.is_(None)),
                     )
                 ],
@@ -289,6 +278,15 @@ class Glossary:
         all = ascendants.union(descendants)
         q = all.order_by(models.GlossaryNode.path)
 
+        if data.get('cursor') is not None:
+            return paginate_by_cursor(
+                q,
+                keys=[models.GlossaryNode.path, models.GlossaryNode.nodeUri],
+                page_size=data.get('pageSize', 100),
+                cursor=data.get('cursor'),
+                page=data.get('page', 1),
+            ).to_dict()
+
         return paginate(
             q, page=data.get('page', 1), page_size=data.get('pageSize', 100)
         ).to_dict()
@@ -346,46 +344,56 @@ class Glossary:
     ):
         source = data['source']
         filter = data['filter']
-        datasets = session.query(
-            models.Dataset.datasetUri.label('targetUri'),
-            literal('dataset').label('targetType'),
-            models.Dataset.label.label('label'),
-            models.Dataset.name.label('name'),
-            models.Dataset.description.label('description'),
-        )
-        tables = session.query(
-            models.DatasetTable.tableUri.label('targetUri'),
-            literal('table').label('targetType'),
-            models.DatasetTable.label.label('label'),
-            models.DatasetTable.name.label('name'),
-            models.DatasetTable.description.label('description'),
-        )
-        columns = session.query(
-            models.DatasetTableColumn.columnUri.label('targetUri'),
-            literal('column').label('targetType'),
-            models.DatasetTableColumn.label.label('label'),
-            models.DatasetTableColumn.name.label('name'),
-            models.DatasetTableColumn.description.label('description'),
-        )
-        folders = session.query(
-            models.DatasetStorageLocation.locationUri.label('targetUri'),
-            literal('folder').label('targetType'),
-            models.DatasetStorageLocation.label.label('label'),
-            models.DatasetStorageLocation.name.label('name'),
-            models.DatasetStorageLocation.description.label('description'),
-        )
-
-        dashboards = session.query(
-            models.Dashboard.dashboardUri.label('targetUri'),
-            literal('dashboard').label('targetType'),
-            models.Dashboard.label.label('label'),
-            models.Dashboard.name.label('name'),
-            models.Dashboard.description.label('description'),
-        )
+        term = filter.get('term')
+        targets = [
+            (
+                'dataset',
+                models.Dataset,
+                models.Dataset.datasetUri,
+            ),
+            (
+                'table',
+                models.DatasetTable,
+                models.DatasetTable.tableUri,
+            ),
+            (
+                'column',
+                models.DatasetTableColumn,
+                models.DatasetTableColumn.columnUri,
+            ),
+            (
+                'folder',
+                models.DatasetStorageLocation,
+                models.DatasetStorageLocation.locationUri,
+            ),
+            (
+                'dashboard',
+                models.Dashboard,
+                models.Dashboard.dashboardUri,
+            ),
+        ]
+        queries = []
+        for target_type, model, target_uri in targets:
+            target_query = session.query(
+                target_uri.label('targetUri'),
+                literal(target_type).label('targetType'),
+                model.label.label('label'),
+                model.name.label('name'),
+                model.description.label('description'),
+            )
+            # Filtering each target before the union lets the term use
+            # the search indexes of the underlying tables. A term naming a
+            # target type exactly also matches all the objects of that type.
+            if term:
+                target_query = target_query.filter(
+                    or_(
+                        search_filter(term, model.label, model.description),
+                        literal(target_type) == term.lower(),
+                    )
+                )
+            queries.append(target_query)
 
-        linked_objects = datasets.union(tables, columns, folders, dashboards).subquery(
-            'linked_objects'
-        )
+        linked_objects = queries[0].union(*queries[1:]).subquery('linked_objects')
 
         path = models.GlossaryNode.path
         q = (
@@ -406,15 +414,6 @@ class Glossary:
         else:
             raise Exception(f'InvalidNodeType ({source.nodeUri}/{source.nodeType})')
 
-        term = filter.get('term')
-        if term:
-            q = q.filter(
-                or_(
-                    linked_objects.c.label.ilike('%' + term + '%'),
-                    linked_objects.c.description.ilike(f'%{term}'),
-                    linked_objects.c.targetType.ilike(f'%{term}'),
-                )
-            )
         q = q.order_by(asc(path))
 
         return paginate(
@@ -1,8 +1,7 @@
 import logging
 
-from sqlalchemy import or_
-
 from ..paginator import paginate
+from ..search import search_filter
 from .. import models, exceptions, permissions
 from ..models.Permission import PermissionType
 
@@ -109,9 +108,10 @@ class Permission:
             if data.get('term'):
                 term = data['term']
                 query = query.filter(
-                    or_(
-                        models.Permission.name.ilike('%' + term + '%'),
-                        models.Permission.description.ilike('%' + term + '%'),
+                    search_filter(
+                        term,
+                        models.Permission.name,
+                        models.Permission.description,
                     )
                 )
         return paginate(
@@ -120,6 +120,14 @@ class Permission:
             page_size=data.get('pageSize', 10),
         ).to_dict()
 
+    @staticmethod
+    def permissions_initialized(session) -> bool:
+        """True when every resource and tenant permission is already saved"""
+        saved = {name for (name,) in session.query(models.Permission.name)}
+        return saved.issuperset(permissions.RESOURCES_ALL_WITH_DESC) and saved.issuperset(
+            permissions.TENANT_ALL_WITH_DESC
+        )
+
     @staticmethod
     def init_permissions(session):
         perms = []
@@ -0,0 +1,156 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy.sql import and_
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+_current_evaluator = contextvars.ContextVar('permission_evaluator', default=None)
+
+
+class PermissionCache:
+    """
+    Process level cache of resource permissions, shared by the requests served
+    by a warm Lambda container. Disabled unless PERMISSION_CACHE_TTL (seconds)
+    is set, as other containers do not see the local invalidations.
+    """
+
+    def __init__(self, ttl: int = 0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def get(self, groups: frozenset, resource_uri: str):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(resource_uri, {}).get(groups)
+            if not entry:
+                return None
+            expires, policies = entry
+            if expires < time.monotonic():
+                del self._entries[resource_uri][groups]
+                return None
+            return policies
+
+    def put(self, groups: frozenset, resource_uri: str, policies: dict):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries.setdefault(resource_uri, {})[groups] = (
+                time.monotonic() + self.ttl,
+                policies,
+            )
+
+    def invalidate(self, resource_uri: str = None):
+        with self._lock:
+            if resource_uri is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(resource_uri, None)
+
+
+PERMISSION_CACHE = PermissionCache(ttl=int(os.getenv('PERMISSION_CACHE_TTL', '0')))
+
+
+class PermissionEvaluator:
+    """
+    Answers the resource permission checks of one request from memory.
+    All the policy -> permission rows of the request groups on a resource are
+    loaded with a single query the first time the resource is checked (or in
+    bulk with preload), later checks on that resource do not hit the database.
+    """
+
+    def __init__(self, groups: [str], cache: PermissionCache = PERMISSION_CACHE):
+        self.groups = frozenset(groups or [])
+        self.cache = cache
+        self._policies = {}
+
+    @staticmethod
+    def current():
+        return _current_evaluator.get()
+
+    @staticmethod
+    def for_groups(groups: [str]):
+        evaluator = PermissionEvaluator.current()
+        if evaluator is None or evaluator.groups != frozenset(groups or []):
+            return PermissionEvaluator(groups)
+        return evaluator
+
+    @contextmanager
+    def activate(self):
+        token = _current_evaluator.set(self)
+        try:
+            yield self
+        finally:
+            _current_evaluator.reset(token)
+
+    def preload(self, session, resource_uris: [str]):
+        missing = set()
+        for resource_uri in resource_uris:
+            if not resource_uri or resource_uri in self._policies:
+                continue
+            cached = self.cache.get(self.groups, resource_uri)
+            if cached is not None:
+                self._policies[resource_uri] = cached
+            else:
+                missing.add(resource_uri)
+
+        if not missing:
+            return
+
+        loaded = {resource_uri: {} for resource_uri in missing}
+        if self.groups:
+            rows = (
+                session.query(models.ResourcePolicy, models.Permission.name)
+                .join(
+                    models.ResourcePolicyPermission,
+                    models.ResourcePolicy.sid == models.ResourcePolicyPermission.sid,
+                )
+                .join(
+                    models.Permission,
+                    models.Permission.permissionUri
+                    == models.ResourcePolicyPermission.permissionUri,
+                )
+                .filter(
+                    and_(
+                        models.ResourcePolicy.principalId.in_(self.groups),
+                        models.ResourcePolicy.principalType == 'GROUP',
+                        models.ResourcePolicy.resourceUri.in_(missing),
+                    )
+                )
+                .all()
+            )
+            for policy, permission_name in rows:
+                loaded[policy.resourceUri].setdefault(permission_name, policy)
+
+        for resource_uri, policies in loaded.items():
+            self._policies[resource_uri] = policies
+            self.cache.put(self.groups, resource_uri, policies)
+
+    def get_policy(self, session, resource_uri: str, permission_name: str):
+        self.preload(session, [resource_uri])
+        return self._policies[resource_uri].get(permission_name)
+
+    def invalidate(self, resource_uri: str = None):
+        if resource_uri is None:
+            self._policies.clear()
+        else:
+            self._policies.pop(resource_uri, None)
+
+    @staticmethod
+    def invalidate_resource(resource_uri: str):
+        evaluator = PermissionEvaluator.current()
+        if evaluator:
+            evaluator.invalidate(resource_uri)
+        PERMISSION_CACHE.invalidate(resource_uri)
@@ -6,6 +6,7 @@ from sqlalchemy.sql import and_
 from .. import exceptions
 from .. import models
 from . import Permission
+from .permission_evaluator import PermissionEvaluator
 from ..models.Permission import PermissionType
 
 logger = logging.getLogger(__name__)
@@ -40,32 +41,17 @@ class ResourcePolicy:
         if not username or not permission_name or not resource_uri:
             return None
 
-        policy: models.ResourcePolicy = (
-            session.query(models.ResourcePolicy)
-            .join(
-                models.ResourcePolicyPermission,
-                models.ResourcePolicy.sid == models.ResourcePolicyPermission.sid,
-            )
-            .join(
-                models.Permission,
-                models.Permission.permissionUri
-                == models.ResourcePolicyPermission.permissionUri,
-            )
-            .filter(
-                and_(
-                    models.ResourcePolicy.principalId.in_(groups),
-                    models.ResourcePolicy.principalType == 'GROUP',
-                    models.Permission.name == permission_name,
-                    models.ResourcePolicy.resourceUri == resource_uri,
-                )
-            )
-            .first()
+        return PermissionEvaluator.for_groups(groups).get_policy(
+            session, resource_uri, permission_name
         )
 
-        if not policy:
-            return None
-        else:
-            return policy
+    @staticmethod
+    def preload_user_resource_permissions(
+        session, groups: [str], resource_uris: [str]
+    ) -> PermissionEvaluator:
+        evaluator = PermissionEvaluator.for_groups(groups)
+        evaluator.preload(session, resource_uris)
+        return evaluator
 
     @staticmethod
     def has_group_resource_permission(
@@ -142,9 +128,68 @@ class ResourcePolicy:
         ResourcePolicy.add_permission_to_resource_policy(
             session, group, permissions, resource_uri, policy
         )
+        PermissionEvaluator.invalidate_resource(resource_uri)
 
         return policy
 
+    @staticmethod
+    def attach_new_resources_policies(
+        session,
+        groups: [str],
+        permissions: [str],
+        resource_uris: [str],
+        resource_type: str,
+    ) -> [models.ResourcePolicy]:
+        """
+        Grants permissions to groups on resources that have no policies yet,
+        with one insert per table instead of one round trip per permission.
+        The caller is responsible for committing the session.
+        """
+        if not groups:
+            raise exceptions.RequiredParameter(param_name='groups')
+        if not permissions:
+            raise exceptions.RequiredParameter(param_name='permissions')
+        if not resource_type:
+            raise exceptions.RequiredParameter(param_name='resource_type')
+        if not resource_uris:
+            return []
+
+        resource_permissions = (
+            session.query(models.Permission)
+            .filter(
+                models.Permission.name.in_(permissions),
+                models.Permission.type == PermissionType.RESOURCE.name,
+            )
+            .all()
+        )
+        unknown = set(permissions) - {p.name for p in resource_permissions}
+        if unknown:
+            raise exceptions.ObjectNotFound('Permission', ', '.join(sorted(unknown)))
+
+        policies = [
+            models.ResourcePolicy(
+                principalId=group,
+                principalType='GROUP',
+                resourceUri=resource_uri,
+                resourceType=resource_type,
+            )
+            for resource_uri in resource_uris
+            for group in sorted(set(groups))
+        ]
+        session.add_all(policies)
+        session.flush()
+        session.bulk_insert_mappings(
+            models.ResourcePolicyPermission,
+            [
+                {'sid': policy.sid, 'permissionUri': permission.permissionUri}
+                for policy in policies
+                for permission in resource_permissions
+            ],
+        )
+        for resource_uri in resource_uris:
+            PermissionEvaluator.invalidate_resource(resource_uri)
+        return policies
+
     @staticmethod
     def delete_resource_policy(
         session,
@@ -162,6 +207,7 @@ class ResourcePolicy:
                 session.delete(permission)
             session.delete(policy)
             session.commit()
+        PermissionEvaluator.invalidate_resource(resource_uri)
 
         return True
 
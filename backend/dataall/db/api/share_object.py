@@ -8,7 +8,7 @@ from . import (
     Environment,
 )
 from .. import api, utils
-from .. import models, exceptions, permissions, paginate
+from .. import models, exceptions, permissions, paginate, paginate_by_cursor
 from ..models.Enums import ShareObjectStatus, ShareItemStatus, ShareObjectActions, ShareItemActions, ShareableType, PrincipalType
 
 logger = logging.getLogger(__name__)
@@ -1012,6 +1012,15 @@ class ShareObject:
                 isShared = data.get('isShared')
                 query = query.filter(shareable_objects.c.isShared == isShared)
 
+            if data.get('cursor') is not None:
+                return paginate_by_cursor(
+                    query,
+                    keys=[shareable_objects.c.itemName, shareable_objects.c.itemUri],
+                    page_size=data.get('pageSize', 10),
+                    cursor=data.get('cursor'),
+                    page=data.get('page', 1),
+                ).to_dict()
+
         return paginate(query, data.get('page', 1), data.get('pageSize', 10)).to_dict()
 
     @staticmethod
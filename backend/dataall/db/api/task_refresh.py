@@ -0,0 +1,68 @@
+import logging
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_
+
+from .. import models
+
+log = logging.getLogger(__name__)
+
+# Pending tasks older than this are considered lost and no longer coalesce
+PENDING_TIMEOUT = timedelta(minutes=10)
+
+
+class TaskRefresh:
+    """
+    Refresh tasks requested by read-only fields (stack resources, profiling
+    run status...). A target is refreshed at most once per staleness window
+    and while a refresh is pending no other one is created for it.
+    """
+
+    @staticmethod
+    def staleness_window() -> timedelta:
+        return timedelta(seconds=int(os.getenv('REFRESH_STALENESS_SECONDS', '60')))
+
+    @staticmethod
+    def request_refresh(
+        session, target_uri, action, payload=None, last_refreshed=None
+    ) -> models.Task:
+        """
+        Creates the refresh task of the target, unless the target was refreshed
+        within the staleness window or a refresh is already pending.
+        Returns the task to queue or None.
+        """
+        now = datetime.now()
+        window = TaskRefresh.staleness_window()
+        if last_refreshed and now - last_refreshed < window:
+            return None
+
+        # Serializes the requests of the same target across concurrent callers
+        session.execute(
+            func.pg_advisory_xact_lock(func.hashtext(f'{action}/{target_uri}'))
+        )
+        recent = (
+            session.query(models.Task.taskUri)
+            .filter(
+                models.Task.targetUri == target_uri,
+                models.Task.action == action,
+                or_(
+                    models.Task.created >= now - window,
+                    and_(
+                        models.Task.status.in_(['pending', 'started']),
+                        models.Task.created >= now - PENDING_TIMEOUT,
+                    ),
+                ),
+            )
+            .first()
+        )
+        if recent:
+            log.debug(f'Refresh {action} of {target_uri} coalesced with {recent[0]}')
+            return None
+
+        task = models.Task(
+            targetUri=target_uri, action=action, payload=payload, created=now
+        )
+        session.add(task)
+        session.commit()
+        return task
@@ -1,4 +1,5 @@
 import logging
+import os
 
 from sqlalchemy.sql import and_
 
@@ -7,11 +8,14 @@ from .. import models
 from ..api.permission import Permission
 from ..api.tenant import Tenant
 from ..models.Permission import PermissionType
+from ...utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 TENANT_NAME = 'dataall'
 
+PROVISIONED_GROUPS = TTLCache(ttl=int(os.getenv('GROUP_PROVISIONING_CACHE_TTL', '300')))
+
 
 class TenantPolicy:
     @staticmethod
@@ -161,6 +165,107 @@ class TenantPolicy:
 
         return policy
 
+    @staticmethod
+    def find_tenant_policy_principals(session, groups: [str], tenant_name: str) -> set:
+        if not groups:
+            return set()
+        return {
+            principal_id
+            for (principal_id,) in session.query(models.TenantPolicy.principalId)
+            .join(
+                models.Tenant, models.Tenant.tenantUri == models.TenantPolicy.tenantUri
+            )
+            .filter(
+                and_(
+                    models.TenantPolicy.principalId.in_(groups),
+                    models.Tenant.name == tenant_name,
+                )
+            )
+            .distinct()
+        }
+
+    @staticmethod
+    def attach_groups_tenant_policy(
+        session,
+        groups: [str],
+        permissions: [str],
+        tenant_name: str,
+    ) -> [models.TenantPolicy]:
+        """Creates the tenant policies of groups that have none, in bulk"""
+        if not groups:
+            raise exceptions.RequiredParameter(param_name='groups')
+        if not permissions:
+            raise exceptions.RequiredParameter(param_name='permissions')
+        if not tenant_name:
+            raise exceptions.RequiredParameter(param_name='tenant_name')
+
+        existing = TenantPolicy.find_tenant_policy_principals(session, groups, tenant_name)
+        missing = sorted({group for group in groups if group} - existing)
+        if not missing:
+            return []
+
+        tenant_permissions = (
+            session.query(models.Permission)
+            .filter(
+                models.Permission.name.in_(permissions),
+                models.Permission.type == PermissionType.TENANT.name,
+            )
+            .all()
+        )
+        unknown = set(permissions) - {p.name for p in tenant_permissions}
+        if unknown:
+            raise exceptions.ObjectNotFound('Permission', ', '.join(sorted(unknown)))
+
+        tenant = Tenant.get_tenant_by_name(session, tenant_name)
+        policies = [
+            models.TenantPolicy(
+                principalId=group,
+                principalType='GROUP',
+                tenantUri=tenant.tenantUri,
+            )
+            for group in missing
+        ]
+        session.add_all(policies)
+        session.flush()
+        session.add_all(
+            [
+                models.TenantPolicyPermission(
+                    sid=policy.sid, permissionUri=permission.permissionUri
+                )
+                for policy in policies
+                for permission in tenant_permissions
+            ]
+        )
+        session.commit()
+        return policies
+
+    @staticmethod
+    def provision_groups(
+        session,
+        groups: [str],
+        permissions: [str],
+        tenant_name: str,
+    ) -> [str]:
+        """
+        Makes sure every group has a tenant policy, granting the given permissions
+        to the ones that do not. Groups already provisioned are remembered in the
+        warm container for GROUP_PROVISIONING_CACHE_TTL seconds, so that steady
+        state requests do not run any tenant policy query.
+        """
+        pending = [
+            group
+            for group in set(groups or [])
+            if group and (tenant_name, group) not in PROVISIONED_GROUPS
+        ]
+        if not pending:
+            return []
+        policies = TenantPolicy.attach_groups_tenant_policy(
+            session, pending, permissions, tenant_name
+        )
+        for group in pending:
+            PROVISIONED_GROUPS.put((tenant_name, group), True)
+        return [policy.principalId for policy in policies]
+
     @staticmethod
     def validate_attach_tenant_policy(group, permissions, tenant_name):
         if not group:
@@ -271,6 +376,7 @@ class TenantPolicy:
                 session.delete(permission)
             session.delete(policy)
             session.commit()
+        PROVISIONED_GROUPS.invalidate((tenant_name, group))
 
         return True
 
@@ -1,6 +1,8 @@
 import logging
 from datetime import datetime
 
+from sqlalchemy import func
+
 from .. import exceptions
 from .. import models
 
@@ -65,6 +67,19 @@ class Vote:
             .count()
         )
 
+    @staticmethod
+    def count_upvotes_by_targets(session, target_uris: [str], target_type: str) -> dict:
+        return dict(
+            session.query(models.Vote.targetUri, func.count(models.Vote.voteUri))
+            .filter(
+                models.Vote.targetUri.in_(target_uris),
+                models.Vote.targetType == target_type,
+                models.Vote.upvote == True,
+            )
+            .group_by(models.Vote.targetUri)
+            .all()
+        )
+
     @staticmethod
     def get_vote(session, username, groups, uri, data=None, check_perm=None) -> dict:
         return Vote.find_vote(session, uri, data['targetType'])
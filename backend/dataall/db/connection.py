@@ -1,12 +1,15 @@
 import json
 import logging
 import os
+import threading
 from contextlib import contextmanager
+from contextvars import ContextVar
 
 import boto3
 import sqlalchemy
 from sqlalchemy.engine import reflection
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 
 from .. import db
 from ..db import Base
@@ -22,39 +25,92 @@ log = logging.getLogger(__name__)
 ENVNAME = os.getenv('envname', 'local')
 
 
+class PoolConfig:
+    """
+    Connection pool settings, read from the environment by default.
+    In proxy mode (RDS Proxy or pgbouncer in front of the database) the
+    process keeps no idle connections of its own and sets no startup
+    parameters, the schema is applied to the ORM statements instead (raw SQL
+    text is not translated, run migrations without proxy mode).
+    """
+
+    def __init__(
+        self,
+        size=5,
+        max_overflow=10,
+        timeout=30,
+        recycle=1800,
+        pre_ping=False,
+        proxy_mode=False,
+    ):
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.proxy_mode = proxy_mode
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            size=int(os.getenv('DB_POOL_SIZE', '5')),
+            max_overflow=int(os.getenv('DB_POOL_MAX_OVERFLOW', '10')),
+            timeout=int(os.getenv('DB_POOL_TIMEOUT', '30')),
+            recycle=int(os.getenv('DB_POOL_RECYCLE', '1800')),
+            pre_ping=os.getenv('DB_POOL_PRE_PING', 'false').lower() == 'true',
+            proxy_mode=os.getenv('DB_PROXY_MODE', 'false').lower() == 'true',
+        )
+
+
 class Engine:
-    def __init__(self, dbconfig: DbConfig):
+    def __init__(self, dbconfig: DbConfig, pool_config: PoolConfig = None):
         self.dbconfig = dbconfig
-        self.engine = sqlalchemy.create_engine(
-            dbconfig.url,
-            echo=False,
-            pool_size=1,
-            connect_args={'options': f"-csearch_path={dbconfig.params['schema']}"},
-        )
+        self.pool_config = pool_config or PoolConfig.from_env()
+        schema = dbconfig.params['schema']
+        if self.pool_config.proxy_mode:
+            self.engine = sqlalchemy.create_engine(
+                dbconfig.url,
+                echo=False,
+                poolclass=NullPool,
+                execution_options={'schema_translate_map': {None: schema}},
+            )
+        else:
+            self.engine = sqlalchemy.create_engine(
+                dbconfig.url,
+                echo=False,
+                pool_size=self.pool_config.size,
+                max_overflow=self.pool_config.max_overflow,
+                pool_timeout=self.pool_config.timeout,
+                pool_recycle=self.pool_config.recycle,
+                pool_pre_ping=self.pool_config.pre_ping,
+                connect_args={'options': f'-csearch_path={schema}'},
+            )
         try:
-            if not self.engine.dialect.has_schema(
-                self.engine, dbconfig.params['schema']
-            ):
-                log.info(
-                    f"Schema not found - init the schema {dbconfig.params['schema']}"
-                )
-                self.engine.execute(
-                    sqlalchemy.schema.CreateSchema(dbconfig.params['schema'])
-                )
-            log.info('-- Using schema: %s --', dbconfig.params['schema'])
+            if not self.engine.dialect.has_schema(self.engine, schema):
+                log.info(f'Schema not found - init the schema {schema}')
+                self.engine.execute(sqlalchemy.schema.CreateSchema(schema))
+            log.info('-- Using schema: %s --', schema)
         except Exception as e:
             log.error(f'Could not create schema: {e}')
 
-        self.sessions = {}
-        self._session = None
+        self._sessionmaker = sessionmaker(
+            bind=self.engine, autoflush=True, expire_on_commit=False
+        )
+        # Session of the current thread or asyncio task
+        self._session = ContextVar(f'dataall_session_{id(self)}', default=None)
 
     def session(self):
-        if self._session is None:
-            self._session = sessionmaker(
-                bind=self.engine, autoflush=True, expire_on_commit=False
-            )()
-
-        return self._session
+        """
+        Session of the current thread or asyncio task, created on first use.
+        Contexts copied into another thread (run_in_executor, starlette
+        threadpools) get a session of their own.
+        """
+        current = self._session.get()
+        thread_id = threading.get_ident()
+        if current is None or current[0] != thread_id:
+            current = (thread_id, self._sessionmaker())
+            self._session.set(current)
+        return current[1]
 
     @contextmanager
     def scoped_session(self):
@@ -68,7 +124,20 @@ class Engine:
         finally:
             s.close()
 
+    def pool_metrics(self) -> dict:
+        """Current usage of the connection pool"""
+        pool = self.engine.pool
+        if isinstance(pool, QueuePool):
+            return {
+                'size': pool.size(),
+                'checkedIn': pool.checkedin(),
+                'checkedOut': pool.checkedout(),
+                'overflow': pool.overflow(),
+            }
+        return {'status': pool.status()}
+
     def dispose(self):
+        log.info(f'Disposing connection pool: {self.pool_metrics()}')
         self.engine.dispose()
 
 
@@ -97,6 +166,11 @@ def create_schema_and_tables(engine, envname):
 
 def init_permissions(engine, envname=None):
     with engine.scoped_session() as session:
+        if db.api.Tenant.find_tenant_by_name(
+            session, 'dataall'
+        ) and db.api.Permission.permissions_initialized(session):
+            log.info('Permissions already initialized')
+            return
         log.info('Initiating permissions')
         db.api.Tenant.save_tenant(session, name='dataall', description='Tenant dataall')
         db.api.Permission.init_permissions(session)
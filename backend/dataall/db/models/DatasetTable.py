@@ -8,7 +8,7 @@ from .. import Resource, utils
 
 class DatasetTable(Resource, Base):
     __tablename__ = 'dataset_table'
-    datasetUri = Column(String, nullable=False)
+    datasetUri = Column(String, nullable=False, index=True)
     tableUri = Column(String, primary_key=True, default=utils.uuid('table'))
     AWSAccountId = Column(String, nullable=False)
     S3BucketName = Column(String, nullable=False)
@@ -17,6 +17,7 @@ class DatasetTable(Resource, Base):
     GlueTableName = Column(String, nullable=False)
     GlueTableConfig = Column(Text)
     GlueTableProperties = Column(postgresql.JSON, default={})
+    GlueTableHash = Column(String, nullable=True)
     LastGlueTableStatus = Column(String, default='InSync')
     region = Column(String, default='eu-west-1')
     # LastGeneratedPreviewDate= Column(DateTime, default=None)
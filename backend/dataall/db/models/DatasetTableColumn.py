@@ -7,7 +7,7 @@ from .. import Resource, utils
 class DatasetTableColumn(Resource, Base):
     __tablename__ = 'dataset_table_column'
     datasetUri = Column(String, nullable=False)
-    tableUri = Column(String, nullable=False)
+    tableUri = Column(String, nullable=False, index=True)
     columnUri = Column(String, primary_key=True, default=utils.uuid('col'))
     AWSAccountId = Column(String, nullable=False)
     region = Column(String, nullable=False)
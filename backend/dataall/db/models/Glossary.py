@@ -53,8 +53,8 @@ class GlossarySchemaMap:
 class TermLink(Base):
     __tablename__ = 'term_link'
     linkUri = Column(String, primary_key=True, default=utils.uuid('term_link'))
-    nodeUri = Column(String, nullable=False)
-    targetUri = Column(String, nullable=False)
+    nodeUri = Column(String, nullable=False, index=True)
+    targetUri = Column(String, nullable=False, index=True)
     targetType = Column(String, nullable=False)
     approvedBySteward = Column(Boolean, default=False)
     approvedByOwner = Column(Boolean, default=False)
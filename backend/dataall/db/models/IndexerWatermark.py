@@ -0,0 +1,13 @@
+import datetime
+
+from sqlalchemy import Column, DateTime, String
+
+from .. import Base
+
+
+class IndexerWatermark(Base):
+    __tablename__ = 'indexer_watermark'
+    indexName = Column(String, primary_key=True)
+    watermark = Column(DateTime, nullable=False)
+    lastFullRebuild = Column(DateTime, nullable=True)
+    updated = Column(DateTime, onupdate=datetime.datetime.now)
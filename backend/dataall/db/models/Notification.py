@@ -23,7 +23,7 @@ class Notification(Base):
     )
     type = Column(Enum(NotificationType), nullable=True)
     message = Column(String, nullable=False)
-    username = Column(String, nullable=False)
+    username = Column(String, nullable=False, index=True)
     is_read = Column(Boolean, nullable=False, default=False)
     target_uri = Column(String)
     created = Column(DateTime, default=datetime.now)
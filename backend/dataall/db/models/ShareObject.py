@@ -21,11 +21,11 @@ class ShareObject(Base):
     shareUri = Column(
         String, nullable=False, primary_key=True, default=utils.uuid('share')
     )
-    datasetUri = Column(String, nullable=False)
-    environmentUri = Column(String)
+    datasetUri = Column(String, nullable=False, index=True)
+    environmentUri = Column(String, index=True)
     groupUri = Column(String)
     principalIAMRoleName = Column(String, nullable=True)
-    principalId = Column(String, nullable=True)
+    principalId = Column(String, nullable=True, index=True)
     principalType = Column(String, nullable=True, default='Group')
     status = Column(String, nullable=False, default=ShareObjectStatus.Draft.value)
     owner = Column(String, nullable=False)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Index, String
 
 from .Enums import ShareItemStatus
 from .. import Base, utils
@@ -8,12 +8,15 @@ from .. import Base, utils
 
 class ShareObjectItem(Base):
     __tablename__ = 'share_object_item'
+    __table_args__ = (
+        Index('ix_share_object_item_shareUri_status', 'shareUri', 'status'),
+    )
     shareUri = Column(String, nullable=False)
     shareItemUri = Column(
         String, default=utils.uuid('shareitem'), nullable=False, primary_key=True
     )
     itemType = Column(String, nullable=False)
-    itemUri = Column(String, nullable=False)
+    itemUri = Column(String, nullable=False, index=True)
     itemName = Column(String, nullable=False)
     permission = Column(String, nullable=True)
     created = Column(DateTime, nullable=False, default=datetime.now)
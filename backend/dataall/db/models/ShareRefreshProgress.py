@@ -0,0 +1,17 @@
+import datetime
+
+from sqlalchemy import Column, DateTime, String
+
+from .. import Base
+
+
+class ShareRefreshProgress(Base):
+    __tablename__ = 'share_refresh_progress'
+    runUri = Column(String, primary_key=True)
+    shareUri = Column(String, primary_key=True)
+    sourceAccountId = Column(String, nullable=False)
+    targetAccountId = Column(String, nullable=False)
+    status = Column(String, nullable=False, default='Pending')
+    error = Column(String, nullable=True)
+    created = Column(DateTime, default=datetime.datetime.now)
+    updated = Column(DateTime, onupdate=datetime.datetime.now)
@@ -31,3 +31,5 @@ class Stack(Base):
         DateTime, default=lambda: datetime.datetime(year=1900, month=1, day=1)
     )
     EcsTaskArn = Column(String, nullable=True)
+    fingerprint = Column(String, nullable=True)
+    templateHash = Column(String, nullable=True)
@@ -12,7 +12,7 @@ class Task(Base):
     taskUri = Column(
         String, nullable=False, default=utils.uuid('Task'), primary_key=True
     )
-    targetUri = Column(String, nullable=False)
+    targetUri = Column(String, nullable=False, index=True)
     cronexpr = Column(String, nullable=True)
     status = Column(String, nullable=False, default='pending')
     action = Column(String, nullable=False)
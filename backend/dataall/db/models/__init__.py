@@ -14,6 +14,7 @@ from .DatasetTableProfilingJob import DatasetTableProfilingJob
 from .Environment import Environment
 from .EnvironmentGroup import EnvironmentGroup
 from .FeedMessage import FeedMessage
+from .IndexerWatermark import IndexerWatermark
 from .Glossary import GlossaryNode, TermLink
 from .Group import Group
 from .ConsumptionRole import ConsumptionRole
@@ -31,6 +32,7 @@ from .SagemakerNotebook import SagemakerNotebook
 from .SagemakerStudio import SagemakerStudio, SagemakerStudioUserProfile
 from .ShareObject import ShareObject
 from .ShareObjectItem import ShareObjectItem
+from .ShareRefreshProgress import ShareRefreshProgress
 from .DataPipeline import DataPipeline
 from .DataPipelineEnvironment import DataPipelineEnvironment
 from .Stack import Stack
@@ -1,24 +1,44 @@
+import base64
+import json
+import logging
 import math
+import os
+
+from sqlalchemy import tuple_
+
+from ..utils.ttl_cache import TTLCache
 
 __version__ = '0.0.2'
 
+log = logging.getLogger(__name__)
+
+# Totals of cursor paginated queries, per query and parameters
+_counts = TTLCache(ttl=int(os.getenv('PAGINATION_COUNT_CACHE_TTL', '60')), maxsize=1024)
+
 
 class Page(object):
-    def __init__(self, items, page, page_size, total):
+    def __init__(
+        self, items, page, page_size, total, has_next=None, next_cursor=None
+    ):
         self.page_size = page_size
         self.page = page
         self.items = items
         self.previous_page = None
         self.next_page = None
+        self.next_cursor = next_cursor
         self.has_previous = page > 1
         if self.has_previous:
             self.previous_page = page - 1
-        previous_items = (page - 1) * page_size
-        self.has_next = previous_items + len(items) < total
+        if has_next is None:
+            previous_items = (page - 1) * page_size
+            has_next = previous_items + len(items) < total
+        self.has_next = has_next
         if self.has_next:
             self.next_page = page + 1
         self.total = total
-        self.pages = int(math.ceil(total / float(page_size)))
+        self.pages = (
+            int(math.ceil(total / float(page_size))) if total is not None else None
+        )
 
     def to_dict(self):
         return {
@@ -31,6 +51,7 @@ class Page(object):
             'hasPrevious': self.has_previous,
             'nextPage': self.next_page,
             'previousPage': self.previous_page,
+            'nextCursor': self.next_cursor,
         }
 
 
@@ -42,3 +63,84 @@ def paginate(query, page, page_size):
     items = query.limit(page_size).offset((page - 1) * page_size).all()
     total = query.order_by(None).count()
     return Page(items, page, page_size, total)
+
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(
+        json.dumps(values, default=str).encode('utf-8')
+    ).decode('ascii')
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise AttributeError('cursor is invalid')
+    if not isinstance(values, list) or len(values) != size:
+        raise AttributeError('cursor is invalid')
+    return values
+
+
+def paginate_by_cursor(query, keys, page_size, cursor=None, page=1, count='cached'):
+    """
+    Keyset pagination: orders the query by keys, columns forming a unique
+    sort key of the rows, and returns the page of rows following the cursor.
+    Deep pages cost the same as the first one, unlike paginate OFFSET.
+    :param query: query selecting the key columns under their own name
+    :param keys: list of non nullable columns
+    :param page_size: number of rows per page
+    :param cursor: nextCursor of the previous page, None or '' for the first page
+    :param page: page number reported back to the client
+    :param count: 'cached' counts once per query and parameters and caches the total,
+    'estimate' returns the planner row estimate, None skips the total
+    """
+    if page_size <= 0:
+        raise AttributeError('page_size needs to be >= 1')
+    total = None
+    if count == 'cached':
+        total = count_cached(query)
+    elif count == 'estimate':
+        total = count_estimate(query)
+
+    q = query.order_by(None).order_by(*keys)
+    if cursor:
+        q = q.filter(tuple_(*keys) > tuple_(*decode_cursor(cursor, len(keys))))
+    items = q.limit(page_size + 1).all()
+    has_next = len(items) > page_size
+    items = items[:page_size]
+    next_cursor = (
+        encode_cursor([getattr(items[-1], key.key) for key in keys])
+        if has_next
+        else None
+    )
+    return Page(
+        items, page, page_size, total, has_next=has_next, next_cursor=next_cursor
+    )
+
+
+def _query_key(query):
+    compiled = query.statement.compile()
+    return str(compiled), repr(sorted(compiled.params.items()))
+
+
+def count_cached(query) -> int:
+    return _counts.get_or_load(_query_key(query), lambda: query.order_by(None).count())
+
+
+def count_estimate(query) -> int:
+    """Number of rows the Postgres planner expects the query to return"""
+    try:
+        compiled = query.order_by(None).statement.compile(
+            dialect=query.session.bind.dialect
+        )
+        plan = (
+            query.session.connection()
+            .execute(f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params)
+            .scalar()
+        )
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    except Exception as e:
+        log.warning(f'Could not estimate the query count, counting it: {e}')
+        return count_cached(query)
@@ -0,0 +1,40 @@
+"""
+Free-text filters for the list APIs.
+
+Substring filters compile to ``column ILIKE '%term%'``. On the deployed
+Aurora clusters the searched columns carry ``pg_trgm`` GIN indexes (see the
+``trigram_search_indexes`` migration), which Postgres uses for leading
+wildcard ILIKE instead of a sequential scan. The local/pytest engines build
+their tables with ``create_all`` and have no trigram indexes: the same
+expression then runs as a plain scan (or ``lower(..) LIKE lower(..)`` on
+dialects without ILIKE), so results are identical everywhere. The trigram
+indexes are not declared on the models for that reason, migrations/env.py
+excludes them from autogenerate.
+"""
+from sqlalchemy import or_
+
+ESCAPE_CHAR = '\\'
+
+
+def escape_like(term: str) -> str:
+    """Escapes LIKE wildcards so user input is matched literally"""
+    return (
+        term.replace(ESCAPE_CHAR, ESCAPE_CHAR * 2)
+        .replace('%', ESCAPE_CHAR + '%')
+        .replace('_', ESCAPE_CHAR + '_')
+    )
+
+
+def contains(column, term: str):
+    """Case-insensitive substring match of term in column"""
+    return column.ilike(f'%{escape_like(term)}%', escape=ESCAPE_CHAR)
+
+
+def startswith(column, term: str):
+    """Case-insensitive prefix match of term in column"""
+    return column.ilike(f'{escape_like(term)}%', escape=ESCAPE_CHAR)
+
+
+def search_filter(term: str, *columns):
+    """Matches rows where any of the columns contains term"""
+    return or_(*[contains(column, term) for column in columns])
@@ -0,0 +1,180 @@
+import logging
+from datetime import datetime
+
+from opensearchpy import helpers
+
+from . import documents
+from .. import db
+from ..db import models
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class BulkIndexer:
+    """
+    Builds catalog documents with a few set based queries and sends them to
+    OpenSearch through the _bulk API, batch_size actions per request.
+    Each dataset document is built once, no matter how many of its tables
+    or folders are indexed.
+    """
+
+    def __init__(self, session, es, index='dataall-index', batch_size=DEFAULT_BATCH_SIZE):
+        self.session = session
+        self.es = es
+        self.index = index
+        self.batch_size = max(int(batch_size), 1)
+        self.indexed = 0
+        self.deleted = 0
+        self.errors = []
+        self._actions = []
+
+    def upsert(self, doc_id, doc):
+        doc['_indexed'] = datetime.now()
+        self._add({'_op_type': 'index', '_index': self.index, '_id': doc_id, '_source': doc})
+
+    def delete(self, doc_id):
+        self._add({'_op_type': 'delete', '_index': self.index, '_id': doc_id})
+
+    def _add(self, action):
+        self._actions.append(action)
+        if len(self._actions) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        actions, self._actions = self._actions, []
+        if not actions:
+            return
+        if not self.es:
+            log.error(f'ES config is missing, {len(actions)} documents were not indexed')
+            return
+        success, errors = helpers.bulk(
+            self.es,
+            actions,
+            chunk_size=self.batch_size,
+            raise_on_error=False,
+            ignore_status=[404],
+        )
+        for error in errors:
+            log.error(f'Failed to index document: {error}')
+        self.errors.extend(errors)
+        upserts = len([a for a in actions if a['_op_type'] == 'index'])
+        self.indexed += upserts
+        self.deleted += len(actions) - upserts
+        log.info(f'Bulk request indexed {success} documents with {len(errors)} errors')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+
+    def _chunks(self, rows):
+        for i in range(0, len(rows), self.batch_size):
+            yield rows[i: i + self.batch_size]
+
+    @staticmethod
+    def _filter_datasets(query, dataset_uris):
+        if dataset_uris is None:
+            return query.filter(models.Dataset.deleted.is_(None))
+        return query.filter(models.Dataset.datasetUri.in_(dataset_uris))
+
+    def index_datasets(self, dataset_uris: [str] = None, criteria=None) -> [str]:
+        query = self._filter_datasets(documents.dataset_query(self.session), dataset_uris)
+        rows = query.filter(*(criteria or [])).all()
+        for chunk in self._chunks(rows):
+            uris = [row.datasetUri for row in chunk]
+            glossary = documents.get_targets_glossary_terms(self.session, uris)
+            count_tables = db.api.Dataset.count_tables_by_datasets(self.session, uris)
+            count_folders = db.api.Dataset.count_locations_by_datasets(self.session, uris)
+            count_upvotes = db.api.Vote.count_upvotes_by_targets(self.session, uris, 'dataset')
+            for row in chunk:
+                self.upsert(
+                    row.datasetUri,
+                    documents.dataset_doc(
+                        row,
+                        glossary.get(row.datasetUri, []),
+                        count_tables.get(row.datasetUri, 0),
+                        count_folders.get(row.datasetUri, 0),
+                        count_upvotes.get(row.datasetUri, 0),
+                    ),
+                )
+        return [row.datasetUri for row in rows]
+
+    def index_tables(self, dataset_uris: [str] = None, criteria=None) -> [str]:
+        query = documents.table_query(self.session).filter(
+            models.DatasetTable.LastGlueTableStatus != 'Deleted'
+        )
+        query = self._filter_datasets(query, dataset_uris)
+        rows = query.filter(*(criteria or [])).all()
+        for chunk in self._chunks(rows):
+            glossary = documents.get_targets_glossary_terms(
+                self.session, [row.uri for row in chunk]
+            )
+            for row in chunk:
+                self.upsert(row.uri, documents.table_doc(row, glossary.get(row.uri, [])))
+        return [row.uri for row in rows]
+
+    def index_folders(self, dataset_uris: [str] = None, criteria=None) -> [str]:
+        query = self._filter_datasets(documents.folder_query(self.session), dataset_uris)
+        rows = query.filter(*(criteria or [])).all()
+        for chunk in self._chunks(rows):
+            glossary = documents.get_targets_glossary_terms(
+                self.session, [row.uri for row in chunk]
+            )
+            for row in chunk:
+                self.upsert(row.uri, documents.folder_doc(row, glossary.get(row.uri, [])))
+        return [row.uri for row in rows]
+
+    def index_dashboards(self, dashboard_uris: [str] = None, criteria=None) -> [str]:
+        query = documents.dashboard_query(self.session)
+        if dashboard_uris is not None:
+            query = query.filter(models.Dashboard.dashboardUri.in_(dashboard_uris))
+        rows = query.filter(*(criteria or [])).all()
+        for chunk in self._chunks(rows):
+            uris = [row.uri for row in chunk]
+            glossary = documents.get_targets_glossary_terms(self.session, uris)
+            count_upvotes = db.api.Vote.count_upvotes_by_targets(
+                self.session, uris, 'dashboard'
+            )
+            for row in chunk:
+                self.upsert(
+                    row.uri,
+                    documents.dashboard_doc(
+                        row, glossary.get(row.uri, []), count_upvotes.get(row.uri, 0)
+                    ),
+                )
+        return [row.uri for row in rows]
+
+    def indexed_ids(self) -> [str]:
+        """Ids of the documents of the index, scrolled without their source"""
+        if not self.es:
+            return []
+        return [
+            hit['_id']
+            for hit in helpers.scan(
+                self.es,
+                index=self.index,
+                query={'query': {'match_all': {}}, '_source': False},
+                size=self.batch_size,
+                ignore_unavailable=True,
+            )
+        ]
+
+    def delete_docs(self, doc_ids: [str]) -> [str]:
+        for doc_id in doc_ids:
+            self.delete(doc_id)
+        return list(doc_ids)
+
+    def remove_deleted_tables(self, dataset_uris: [str] = None) -> [str]:
+        query = self.session.query(models.DatasetTable.tableUri).filter(
+            models.DatasetTable.LastGlueTableStatus == 'Deleted'
+        )
+        if dataset_uris is not None:
+            query = query.filter(models.DatasetTable.datasetUri.in_(dataset_uris))
+        uris = [uri for (uri,) in query]
+        for uri in uris:
+            self.delete(uri)
+        return uris
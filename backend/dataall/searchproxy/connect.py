@@ -1,4 +1,5 @@
 import os
+import threading
 from urllib.parse import urlparse
 
 import boto3
@@ -84,6 +85,28 @@ def connect(envname='local'):
         return es
 
 
+class LazyConnection:
+    """OpenSearch client connecting on first use instead of at import time"""
+
+    def __init__(self, envname='local'):
+        self.envname = envname
+        self._es = None
+        self._lock = threading.Lock()
+
+    def connection(self):
+        if self._es is None:
+            with self._lock:
+                if self._es is None:
+                    self._es = connect(envname=self.envname)
+        return self._es
+
+    def __getattr__(self, name):
+        return getattr(self.connection(), name)
+
+    def __repr__(self):
+        return f'LazyConnection({self.envname}, connected={self._es is not None})'
+
+
 def connect_dev_environment(envname):
     hostname = 'elasticsearch' if envname == 'dkrcompose' else 'localhost'
     try:
@@ -0,0 +1,280 @@
+"""
+Queries and document builders shared by the single object indexers and the
+bulk indexing pipeline.
+"""
+from sqlalchemy import and_
+from sqlalchemy.orm import with_expression
+
+from ..db import models
+
+
+def glossary_terms_query(session, target_uris: [str]):
+    return (
+        session.query(models.TermLink)
+        .options(
+            with_expression(models.TermLink.path, models.GlossaryNode.path),
+            with_expression(models.TermLink.label, models.GlossaryNode.label),
+            with_expression(models.TermLink.readme, models.GlossaryNode.readme),
+        )
+        .join(
+            models.GlossaryNode, models.GlossaryNode.nodeUri == models.TermLink.nodeUri
+        )
+        .filter(
+            and_(
+                models.TermLink.targetUri.in_(target_uris),
+                models.TermLink.approvedBySteward.is_(True),
+            )
+        )
+    )
+
+
+def get_targets_glossary_terms(session, target_uris: [str]) -> dict:
+    terms = {}
+    if not target_uris:
+        return terms
+    for link in glossary_terms_query(session, target_uris):
+        terms.setdefault(link.targetUri, []).append(link.path)
+    return terms
+
+
+def dataset_query(session):
+    return (
+        session.query(
+            models.Dataset.datasetUri.label('datasetUri'),
+            models.Dataset.name.label('name'),
+            models.Dataset.owner.label('owner'),
+            models.Dataset.label.label('label'),
+            models.Dataset.description.label('description'),
+            models.Dataset.confidentiality.label('classification'),
+            models.Dataset.tags.label('tags'),
+            models.Dataset.topics.label('topics'),
+            models.Dataset.region.label('region'),
+            models.Organization.organizationUri.label('orgUri'),
+            models.Organization.name.label('orgName'),
+            models.Environment.environmentUri.label('envUri'),
+            models.Environment.name.label('envName'),
+            models.Dataset.SamlAdminGroupName.label('admins'),
+            models.Dataset.GlueDatabaseName.label('database'),
+            models.Dataset.S3BucketName.label('source'),
+            models.Dataset.created,
+            models.Dataset.updated,
+            models.Dataset.deleted,
+        )
+        .join(
+            models.Organization,
+            models.Dataset.organizationUri == models.Organization.organizationUri,
+        )
+        .join(
+            models.Environment,
+            models.Dataset.environmentUri == models.Environment.environmentUri,
+        )
+    )
+
+
+def dataset_doc(dataset, glossary, count_tables, count_folders, count_upvotes) -> dict:
+    return {
+        'name': dataset.name,
+        'owner': dataset.owner,
+        'label': dataset.label,
+        'admins': dataset.admins,
+        'database': dataset.database,
+        'source': dataset.source,
+        'resourceKind': 'dataset',
+        'description': dataset.description,
+        'classification': dataset.classification,
+        'tags': [t.replace('-', '') for t in dataset.tags or []],
+        'topics': dataset.topics,
+        'region': dataset.region.replace('-', ''),
+        'environmentUri': dataset.envUri,
+        'environmentName': dataset.envName,
+        'organizationUri': dataset.orgUri,
+        'organizationName': dataset.orgName,
+        'created': dataset.created,
+        'updated': dataset.updated,
+        'deleted': dataset.deleted,
+        'glossary': glossary,
+        'tables': count_tables,
+        'folders': count_folders,
+        'upvotes': count_upvotes,
+    }
+
+
+def table_query(session):
+    return (
+        session.query(
+            models.DatasetTable.datasetUri.label('datasetUri'),
+            models.DatasetTable.tableUri.label('uri'),
+            models.DatasetTable.name.label('name'),
+            models.DatasetTable.owner.label('owner'),
+            models.DatasetTable.label.label('label'),
+            models.DatasetTable.description.label('description'),
+            models.Dataset.confidentiality.label('classification'),
+            models.DatasetTable.tags.label('tags'),
+            models.Dataset.topics.label('topics'),
+            models.Dataset.region.label('region'),
+            models.Organization.organizationUri.label('orgUri'),
+            models.Organization.name.label('orgName'),
+            models.Environment.environmentUri.label('envUri'),
+            models.Environment.name.label('envName'),
+            models.Dataset.SamlAdminGroupName.label('admins'),
+            models.Dataset.GlueDatabaseName.label('database'),
+            models.Dataset.S3BucketName.label('source'),
+            models.DatasetTable.created,
+            models.DatasetTable.updated,
+            models.DatasetTable.deleted,
+        )
+        .join(
+            models.Dataset,
+            models.Dataset.datasetUri == models.DatasetTable.datasetUri,
+        )
+        .join(
+            models.Organization,
+            models.Dataset.organizationUri == models.Organization.organizationUri,
+        )
+        .join(
+            models.Environment,
+            models.Dataset.environmentUri == models.Environment.environmentUri,
+        )
+    )
+
+
+def table_doc(table, glossary) -> dict:
+    return {
+        'name': table.name,
+        'admins': table.admins,
+        'owner': table.owner,
+        'label': table.label,
+        'resourceKind': 'table',
+        'description': table.description,
+        'database': table.database,
+        'source': table.source,
+        'classification': table.classification,
+        'tags': [t.replace('-', '') for t in table.tags or []],
+        'topics': table.topics,
+        'region': table.region.replace('-', ''),
+        'datasetUri': table.datasetUri,
+        'environmentUri': table.envUri,
+        'environmentName': table.envName,
+        'organizationUri': table.orgUri,
+        'organizationName': table.orgName,
+        'created': table.created,
+        'updated': table.updated,
+        'deleted': table.deleted,
+        'glossary': glossary,
+    }
+
+
+def folder_query(session):
+    return (
+        session.query(
+            models.DatasetStorageLocation.datasetUri.label('datasetUri'),
+            models.DatasetStorageLocation.locationUri.label('uri'),
+            models.DatasetStorageLocation.name.label('name'),
+            models.DatasetStorageLocation.owner.label('owner'),
+            models.DatasetStorageLocation.label.label('label'),
+            models.DatasetStorageLocation.description.label('description'),
+            models.DatasetStorageLocation.tags.label('tags'),
+            models.DatasetStorageLocation.region.label('region'),
+            models.Organization.organizationUri.label('orgUri'),
+            models.Organization.name.label('orgName'),
+            models.Environment.environmentUri.label('envUri'),
+            models.Environment.name.label('envName'),
+            models.Dataset.SamlAdminGroupName.label('admins'),
+            models.Dataset.S3BucketName.label('source'),
+            models.Dataset.topics.label('topics'),
+            models.Dataset.confidentiality.label('classification'),
+            models.DatasetStorageLocation.created,
+            models.DatasetStorageLocation.updated,
+            models.DatasetStorageLocation.deleted,
+        )
+        .join(
+            models.Dataset,
+            models.Dataset.datasetUri == models.DatasetStorageLocation.datasetUri,
+        )
+        .join(
+            models.Organization,
+            models.Dataset.organizationUri == models.Organization.organizationUri,
+        )
+        .join(
+            models.Environment,
+            models.Dataset.environmentUri == models.Environment.environmentUri,
+        )
+    )
+
+
+def folder_doc(folder, glossary) -> dict:
+    return {
+        'name': folder.name,
+        'admins': folder.admins,
+        'owner': folder.owner,
+        'label': folder.label,
+        'resourceKind': 'folder',
+        'description': folder.description,
+        'source': folder.source,
+        'classification': folder.classification,
+        'tags': [f.replace('-', '') for f in folder.tags or []],
+        'topics': folder.topics,
+        'region': folder.region.replace('-', ''),
+        'datasetUri': folder.datasetUri,
+        'environmentUri': folder.envUri,
+        'environmentName': folder.envName,
+        'organizationUri': folder.orgUri,
+        'organizationName': folder.orgName,
+        'created': folder.created,
+        'updated': folder.updated,
+        'deleted': folder.deleted,
+        'glossary': glossary,
+    }
+
+
+def dashboard_query(session):
+    return (
+        session.query(
+            models.Dashboard.dashboardUri.label('uri'),
+            models.Dashboard.name.label('name'),
+            models.Dashboard.owner.label('owner'),
+            models.Dashboard.label.label('label'),
+            models.Dashboard.description.label('description'),
+            models.Dashboard.tags.label('tags'),
+            models.Dashboard.region.label('region'),
+            models.Organization.organizationUri.label('orgUri'),
+            models.Organization.name.label('orgName'),
+            models.Environment.environmentUri.label('envUri'),
+            models.Environment.name.label('envName'),
+            models.Dashboard.SamlGroupName.label('admins'),
+            models.Dashboard.created,
+            models.Dashboard.updated,
+            models.Dashboard.deleted,
+        )
+        .join(
+            models.Organization,
+            models.Dashboard.organizationUri == models.Organization.organizationUri,
+        )
+        .join(
+            models.Environment,
+            models.Dashboard.environmentUri == models.Environment.environmentUri,
+        )
+    )
+
+
+def dashboard_doc(dashboard, glossary, count_upvotes) -> dict:
+    return {
+        'name': dashboard.name,
+        'admins': dashboard.admins,
+        'owner': dashboard.owner,
+        'label': dashboard.label,
+        'resourceKind': 'dashboard',
+        'description': dashboard.description,
+        'tags': [f.replace('-', '') for f in dashboard.tags or []],
+        'topics': [],
+        'region': dashboard.region.replace('-', ''),
+        'environmentUri': dashboard.envUri,
+        'environmentName': dashboard.envName,
+        'organizationUri': dashboard.orgUri,
+        'organizationName': dashboard.orgName,
+        'created': dashboard.created,
+        'updated': dashboard.updated,
+        'deleted': dashboard.deleted,
+        'glossary': glossary,
+        'upvotes': count_upvotes,
+    }
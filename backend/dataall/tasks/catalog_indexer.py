@@ -1,11 +1,13 @@
 import logging
 import os
 import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_
 
-from .. import db
 from ..db import get_engine, exceptions
 from ..db import models
-from ..searchproxy import indexers
+from ..searchproxy.bulk_indexer import BulkIndexer, DEFAULT_BATCH_SIZE
 from ..searchproxy.connect import (
     connect,
 )
@@ -17,37 +19,51 @@ if not root.hasHandlers():
     root.addHandler(logging.StreamHandler(sys.stdout))
 log = logging.getLogger(__name__)
 
+INDEX_NAME = 'dataall-index'
+# Rows committed by transactions still open when a run starts carry timestamps
+# older than its watermark, the next run re-reads this window to catch them
+WATERMARK_OVERLAP = timedelta(seconds=int(os.getenv('CATALOG_INDEXER_OVERLAP', '60')))
+# Hard deleted rows (e.g. term links) and organization/environment renames are
+# only picked up by full rebuilds, which rebuild every document and delete the
+# documents of rows that no longer exist. Incremental runs fall back to a full
+# rebuild when the last one is too old
+FULL_REBUILD_INTERVAL = timedelta(
+    hours=int(os.getenv('CATALOG_INDEXER_FULL_REBUILD_HOURS', '24'))
+)
+
 
-def index_objects(engine, es):
+def index_objects(engine, es, full=True):
     try:
         if not es:
             raise exceptions.AWSResourceNotFound(
                 action='CATALOG_INDEXER_TASK', message='ES configuration not found'
             )
-        indexed_objects_counter = 0
         with engine.scoped_session() as session:
+            started = datetime.now()
+            watermark = get_watermark(session)
+            if not full and (
+                not watermark
+                or not watermark.lastFullRebuild
+                or watermark.lastFullRebuild + FULL_REBUILD_INTERVAL < started
+            ):
+                log.info('No recent full rebuild of the catalog, running a full rebuild')
+                full = True
 
-            all_datasets: [models.Dataset] = db.api.Dataset.list_all_active_datasets(
-                session
-            )
-            log.info(f'Found {len(all_datasets)} datasets')
-            dataset: models.Dataset
-            for dataset in all_datasets:
-                tables = indexers.upsert_dataset_tables(session, es, dataset.datasetUri)
-                folders = indexers.upsert_dataset_folders(
-                    session, es, dataset.datasetUri
-                )
-                indexed_objects_counter = (
-                    indexed_objects_counter + len(tables) + len(folders) + 1
-                )
-
-            all_dashboards: [models.Dashboard] = session.query(models.Dashboard).all()
-            log.info(f'Found {len(all_dashboards)} dashboards')
-            dashboard: models.Dashboard
-            for dashboard in all_dashboards:
-                indexers.upsert_dashboard(session, es, dashboard.dashboardUri)
-                indexed_objects_counter = indexed_objects_counter + 1
+            with BulkIndexer(
+                session, es, batch_size=os.getenv('CATALOG_INDEXER_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+            ) as indexer:
+                if full:
+                    indexed_objects_counter = _index_all(indexer)
+                else:
+                    indexed_objects_counter = _index_changes(
+                        session, indexer, watermark.watermark - WATERMARK_OVERLAP
+                    )
 
+            if indexer.errors:
+                raise Exception(
+                    f'Failed to index {len(indexer.errors)} of {indexed_objects_counter} objects'
+                )
+            save_watermark(session, started, full)
             log.info(f'Successfully indexed {indexed_objects_counter} objects')
             return indexed_objects_counter
     except Exception as e:
@@ -55,8 +71,162 @@ def index_objects(engine, es):
         raise e
 
 
+def _index_all(indexer: BulkIndexer):
+    datasets = indexer.index_datasets()
+    log.info(f'Found {len(datasets)} datasets')
+    tables = indexer.index_tables()
+    folders = indexer.index_folders()
+    log.info(f'Found {len(tables)} tables and {len(folders)} folders')
+    dashboards = indexer.index_dashboards()
+    log.info(f'Found {len(dashboards)} dashboards')
+    indexed = set(datasets) | set(tables) | set(folders) | set(dashboards)
+    removed = indexer.delete_docs(
+        sorted(doc_id for doc_id in indexer.indexed_ids() if doc_id not in indexed)
+    )
+    log.info(f'Found {len(removed)} documents of deleted objects')
+    return len(datasets) + len(tables) + len(folders) + len(dashboards) + len(removed)
+
+
+def _changed_since(model, since):
+    return or_(model.created >= since, model.updated >= since, model.deleted >= since)
+
+
+def _changed_targets(session, since, target_type):
+    votes = session.query(models.Vote.targetUri).filter(
+        models.Vote.targetType == target_type,
+        or_(models.Vote.created >= since, models.Vote.updated >= since),
+    )
+    term_links = session.query(models.TermLink.targetUri).filter(
+        or_(models.TermLink.created >= since, models.TermLink.updated >= since)
+    )
+    return {uri for (uri,) in votes.union(term_links)}
+
+
+def _index_changes(session, indexer: BulkIndexer, since):
+    log.info(f'Indexing catalog objects changed since {since}')
+    tables_changed = session.query(
+        models.DatasetTable.tableUri, models.DatasetTable.datasetUri
+    ).filter(_changed_since(models.DatasetTable, since))
+    folders_changed = session.query(
+        models.DatasetStorageLocation.locationUri,
+        models.DatasetStorageLocation.datasetUri,
+    ).filter(_changed_since(models.DatasetStorageLocation, since))
+    targets_changed = _changed_targets(session, since, 'dataset')
+
+    tables = indexer.index_tables(
+        criteria=[
+            or_(
+                _changed_since(models.DatasetTable, since),
+                models.DatasetTable.tableUri.in_(targets_changed),
+            ),
+            models.DatasetTable.deleted.is_(None),
+        ]
+    )
+    folders = indexer.index_folders(
+        criteria=[
+            or_(
+                _changed_since(models.DatasetStorageLocation, since),
+                models.DatasetStorageLocation.locationUri.in_(targets_changed),
+            ),
+            models.DatasetStorageLocation.deleted.is_(None),
+        ]
+    )
+    parent_datasets = {uri for _, uri in tables_changed} | {uri for _, uri in folders_changed}
+    datasets = indexer.index_datasets(
+        criteria=[
+            or_(
+                _changed_since(models.Dataset, since),
+                models.Dataset.datasetUri.in_(parent_datasets | targets_changed),
+            )
+        ]
+    )
+    dashboards = indexer.index_dashboards(
+        criteria=[
+            or_(
+                _changed_since(models.Dashboard, since),
+                models.Dashboard.dashboardUri.in_(
+                    _changed_targets(session, since, 'dashboard')
+                ),
+            ),
+            models.Dashboard.deleted.is_(None),
+        ]
+    )
+
+    removed = indexer.delete_docs(
+        [
+            uri
+            for (uri,) in session.query(models.DatasetTable.tableUri)
+            .join(
+                models.Dataset,
+                models.Dataset.datasetUri == models.DatasetTable.datasetUri,
+            )
+            .filter(
+                _changed_since(models.DatasetTable, since),
+                or_(
+                    models.DatasetTable.LastGlueTableStatus == 'Deleted',
+                    models.DatasetTable.deleted.isnot(None),
+                    models.Dataset.deleted.isnot(None),
+                ),
+            )
+        ]
+        + [
+            uri
+            for (uri,) in session.query(models.DatasetStorageLocation.locationUri)
+            .join(
+                models.Dataset,
+                models.Dataset.datasetUri == models.DatasetStorageLocation.datasetUri,
+            )
+            .filter(
+                _changed_since(models.DatasetStorageLocation, since),
+                or_(
+                    models.DatasetStorageLocation.deleted.isnot(None),
+                    models.Dataset.deleted.isnot(None),
+                ),
+            )
+        ]
+        + [
+            uri
+            for (uri,) in session.query(models.Dataset.datasetUri).filter(
+                and_(models.Dataset.deleted.isnot(None), models.Dataset.deleted >= since)
+            )
+        ]
+        + [
+            uri
+            for (uri,) in session.query(models.Dashboard.dashboardUri).filter(
+                and_(models.Dashboard.deleted.isnot(None), models.Dashboard.deleted >= since)
+            )
+        ]
+    )
+    log.info(
+        f'Found {len(datasets)} datasets, {len(tables)} tables, {len(folders)} folders '
+        f'and {len(dashboards)} dashboards to index, {len(removed)} documents to delete'
+    )
+    return len(datasets) + len(tables) + len(folders) + len(dashboards) + len(removed)
+
+
+def get_watermark(session, index=INDEX_NAME) -> models.IndexerWatermark:
+    return session.query(models.IndexerWatermark).get(index)
+
+
+def save_watermark(session, watermark: datetime, full: bool, index=INDEX_NAME):
+    record = get_watermark(session, index)
+    if not record:
+        record = models.IndexerWatermark(indexName=index, watermark=watermark)
+        session.add(record)
+    record.watermark = watermark
+    if full:
+        record.lastFullRebuild = watermark
+    session.commit()
+    return record
+
+
 if __name__ == '__main__':
     ENVNAME = os.environ.get('envname', 'local')
     ENGINE = get_engine(envname=ENVNAME)
     ES = connect(envname=ENVNAME)
-    index_objects(engine=ENGINE, es=ES)
+    index_objects(
+        engine=ENGINE,
+        es=ES,
+        full='--full' in sys.argv
+        or os.environ.get('CATALOG_INDEXER_FULL_REBUILD', 'false').lower() == 'true',
+    )
@@ -2,7 +2,7 @@ import logging
 import os
 import sys
 
-from ..cdkproxy.cdk_cli_wrapper import deploy_cdk_stack
+from ..cdkproxy.cdk_cli_wrapper import deploy_cdk_stack, deploy_cdk_stacks
 from ..db import get_engine
 
 root = logging.getLogger()
@@ -15,9 +15,13 @@ if __name__ == '__main__':
     envname = os.environ.get('envname', 'local')
     engine = get_engine(envname=envname)
 
-    stack_uri = os.getenv('stackUri')
-    logger.info(f'Starting deployment task for stack : {stack_uri}')
-
-    deploy_cdk_stack(engine=engine, stackid=stack_uri, app_path='../cdkproxy/app.py')
+    stack_uris = os.getenv('stackUris')
+    if stack_uris:
+        logger.info(f'Starting deployment task for stacks : {stack_uris}')
+        deploy_cdk_stacks(engine=engine, stackids=stack_uris.split(','), app_path='../cdkproxy/app.py')
+    else:
+        stack_uri = os.getenv('stackUri')
+        logger.info(f'Starting deployment task for stack : {stack_uri}')
+        deploy_cdk_stack(engine=engine, stackid=stack_uri, app_path='../cdkproxy/app.py')
 
     logger.info('Deployment task finished successfully')
@@ -4,6 +4,7 @@ import os
 from .share_processors.lf_process_cross_account_share import ProcessLFCrossAccountShare
 from .share_processors.lf_process_same_account_share import ProcessLFSameAccountShare
 from .share_processors.s3_process_share import ProcessS3Share
+from .share_refresh_scheduler import ShareRefreshScheduler
 
 from ...aws.handlers.ram import Ram
 from ...aws.handlers.sts import SessionHelper
@@ -234,11 +235,20 @@ class DataSharingService:
         None
         """
         return Ram.delete_lakeformation_v1_resource_shares(
-            SessionHelper.remote_session(accountid=environment.AwsAccountId).client(
-                'ram', region_name=environment.region
+            SessionHelper.remote_client(
+                'ram', environment.AwsAccountId, environment.region
             )
         )
 
+    @classmethod
+    def refresh_share(cls, engine: Engine, share_uri: str, status: str) -> bool:
+        """
+        Triggers the approve or revoke processing of a share depending on its status
+        """
+        if status in [models.ShareObjectStatus.Approved.value]:
+            return cls.approve_share(engine, share_uri)
+        return cls.revoke_share(engine, share_uri)
+
     @classmethod
     def refresh_shares(cls, engine: Engine) -> bool:
         """
@@ -246,6 +256,8 @@ class DataSharingService:
         If a share is in 'Approve' state it triggers an approve ECS sharing task
         If a share is in 'Revoked' state it triggers a revoke ECS sharing task
         Also cleans up LFV1 ram resource shares if enabled on SSM
+        Shares of different source/target account pairs are refreshed concurrently
+        and a run that did not complete is resumed, see ShareRefreshScheduler
         Parameters
         ----------
         engine : db.engine
@@ -254,14 +266,7 @@ class DataSharingService:
         -------
         true if refresh succeeds
         """
-        share_object_refreshable_states = api.ShareObjectSM.get_share_object_refreshable_states()
-        with engine.scoped_session() as session:
-            environments = session.query(models.Environment).all()
-            shares = (
-                session.query(models.ShareObject)
-                .filter(models.ShareObject.status.in_(share_object_refreshable_states))
-                .all()
-            )
+        scheduler = ShareRefreshScheduler(engine)
 
         # Feature toggle: default value is False
         if (
@@ -271,29 +276,11 @@ class DataSharingService:
             == 'True'
         ):
             log.info('LFV1 Cleanup toggle is enabled')
-            for e in environments:
-                log.info(
-                    f'Cleaning LFV1 ram resource for environment: {e.AwsAccountId}/{e.region}...'
-                )
-                cls.clean_lfv1_ram_resources(e)
+            with engine.scoped_session() as session:
+                environments = session.query(models.Environment).all()
+            scheduler.run_environments(environments, cls.clean_lfv1_ram_resources)
 
-        if not shares:
+        summary = scheduler.run(cls.refresh_share)
+        if not summary:
             log.info('No Approved nor Revoked shares found. Nothing to do...')
-            return True
-
-        for share in shares:
-            try:
-                log.info(
-                    f'Refreshing share {share.shareUri} with {share.status} status...'
-                )
-                if share.status in [models.ShareObjectStatus.Approved.value]:
-                    cls.approve_share(engine, share.shareUri)
-                else:
-                    cls.revoke_share(engine, share.shareUri)
-
-            except Exception as e:
-                log.error(
-                    f'Failed refreshing share {share.shareUri} with {share.status}. '
-                    f'due to: {e}'
-                )
         return True
@@ -1,7 +1,9 @@
 import abc
 import logging
+import os
 import uuid
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from botocore.exceptions import ClientError
 
@@ -15,6 +17,8 @@ from ....utils.alarm_service import AlarmService
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_WORKERS = 8
+
 
 class LFShareManager:
     def __init__(
@@ -38,6 +42,7 @@ class LFShareManager:
         self.target_environment = target_environment
         self.shared_db_name = self.build_shared_db_name()
         self.principals = self.get_share_principals()
+        self.max_workers = int(os.getenv('LF_SHARE_MAX_WORKERS', DEFAULT_MAX_WORKERS))
 
     @abc.abstractmethod
     def process_approved_shares(self) -> [str]:
@@ -110,6 +115,107 @@ class LFShareManager:
         }
         return data
 
+    def start_share_items(self, tables: [models.DatasetTable], status: str) -> [dict]:
+        """
+        Moves the share items of the tables to their in progress state
+        and prepares the jobs processed by run_share_items
+        Parameters
+        ----------
+        tables : dataset tables
+        status : current status of the share items
+
+        Returns
+        -------
+        List of jobs with the table, share item, state machine and share data
+        """
+        jobs = []
+        for table in tables:
+            share_item = api.ShareObject.find_share_item_by_table(
+                self.session, self.share, table
+            )
+            if not share_item:
+                logger.info(
+                    f'Share Item not found for {self.share.shareUri} '
+                    f'and Dataset Table {table.GlueTableName} continuing loop...'
+                )
+                continue
+            item_SM = api.ShareItemSM(status)
+            new_state = item_SM.run_transition(models.Enums.ShareObjectActions.Start.value)
+            item_SM.update_state_single_item(self.session, share_item, new_state)
+            jobs.append({'table': table, 'share_item': share_item, 'item_SM': item_SM})
+
+        # Status updates commit and expire the instances, everything the
+        # workers need is loaded here so that they never use the session
+        for job in jobs:
+            job['itemUri'] = job['share_item'].itemUri
+            job['data'] = self.build_share_data(job['table'])
+            job['error'] = None
+        return jobs
+
+    def run_share_items(self, jobs: [dict], action) -> None:
+        """
+        Runs the action on the jobs that did not fail yet with a bounded pool of workers.
+        Actions only make AWS calls, the session is not used until all workers are done.
+        Parameters
+        ----------
+        jobs : jobs from start_share_items
+        action : callable taking a job, its exception is stored as the job error
+        """
+        pending = [job for job in jobs if not job['error']]
+        if not pending:
+            return
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(pending))
+        ) as executor:
+            futures = {executor.submit(action, job): job for job in pending}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    futures[future]['error'] = e
+
+    def finish_share_items(self, jobs: [dict], handle_failure) -> bool:
+        """
+        Moves the share items to their success or failure state
+        Parameters
+        ----------
+        jobs : processed jobs
+        handle_failure : failure handler called with table, share item and error
+
+        Returns
+        -------
+        True if all the jobs succeeded
+        """
+        success = True
+        for job in jobs:
+            item_SM = job['item_SM']
+            if job['error']:
+                handle_failure(job['table'], job['share_item'], job['error'])
+                new_state = item_SM.run_transition(models.Enums.ShareItemActions.Failure.value)
+                success = False
+            else:
+                new_state = item_SM.run_transition(models.Enums.ShareItemActions.Success.value)
+            item_SM.update_state_single_item(self.session, job['share_item'], new_state)
+        return success
+
+    @staticmethod
+    def check_share_job_exists_on_glue_catalog(job: dict) -> None:
+        """Same as check_share_item_exists_on_glue_catalog, from the job share data"""
+        source = job['data']['source']
+        if not Glue.table_exists(
+            accountid=source['accountid'],
+            region=source['region'],
+            database=source['database'],
+            tablename=source['tablename'],
+        ):
+            raise exceptions.AWSResourceNotFound(
+                action='ProcessShare',
+                message=(
+                    f'Share Item {job["itemUri"]} found on share request'
+                    f' but its correspondent Glue table {source["tablename"]} does not exist.'
+                ),
+            )
+
     def check_share_item_exists_on_glue_catalog(
         self, share_item: models.ShareObjectItem, table: models.DatasetTable
     ) -> None:
@@ -194,9 +300,9 @@ class LFShareManager:
         )
 
         LakeFormation.grant_permissions_to_database(
-            client=SessionHelper.remote_session(
-                accountid=target_environment.AwsAccountId
-            ).client('lakeformation', region_name=target_environment.region),
+            client=SessionHelper.remote_client(
+                'lakeformation', target_environment.AwsAccountId, target_environment.region
+            ),
             principals=principals,
             database_name=shared_db_name,
             permissions=['DESCRIBE'],
@@ -233,9 +339,8 @@ class LFShareManager:
         """
         source = data['source']
         target = data['target']
-        target_session = SessionHelper.remote_session(accountid=target['accountid'])
-        lakeformation_client = target_session.client(
-            'lakeformation', region_name=target['region']
+        lakeformation_client = SessionHelper.remote_client(
+            'lakeformation', target['accountid'], target['region']
         )
         target_database = target['database']
         resource_link_input = {
@@ -297,35 +402,34 @@ class LFShareManager:
             )
             return True
 
-        for principal in principals:
-            logger.info(
-                f'Revoking resource link access '
-                f'on {self.target_environment.AwsAccountId}/{self.shared_db_name}/{table.GlueTableName} '
-                f'for principal {principal}'
-
-            )
-            LakeFormation.batch_revoke_permissions(
-                SessionHelper.remote_session(self.target_environment.AwsAccountId).client(
-                    'lakeformation', region_name=self.target_environment.region
-                ),
-                self.target_environment.AwsAccountId,
-                [
-                    {
-                        'Id': str(uuid.uuid4()),
-                        'Principal': {
-                            'DataLakePrincipalIdentifier': principal
-                        },
-                        'Resource': {
-                            'Table': {
-                                'DatabaseName': self.shared_db_name,
-                                'Name': table.GlueTableName,
-                                'CatalogId': self.target_environment.AwsAccountId,
-                            }
-                        },
-                        'Permissions': ['DESCRIBE'],
-                    }
-                ],
-            )
+        logger.info(
+            f'Revoking resource link access '
+            f'on {self.target_environment.AwsAccountId}/{self.shared_db_name}/{table.GlueTableName} '
+            f'for principals {principals}'
+        )
+        LakeFormation.batch_revoke_permissions(
+            SessionHelper.remote_client(
+                'lakeformation', self.target_environment.AwsAccountId, self.target_environment.region
+            ),
+            self.target_environment.AwsAccountId,
+            [
+                {
+                    'Id': str(uuid.uuid4()),
+                    'Principal': {
+                        'DataLakePrincipalIdentifier': principal
+                    },
+                    'Resource': {
+                        'Table': {
+                            'DatabaseName': self.shared_db_name,
+                            'Name': table.GlueTableName,
+                            'CatalogId': self.target_environment.AwsAccountId,
+                        }
+                    },
+                    'Permissions': ['DESCRIBE'],
+                }
+                for principal in principals
+            ],
+        )
         return True
 
     def revoke_source_table_access(self, table, principals: [str]):
@@ -347,20 +451,20 @@ class LFShareManager:
         ):
             logger.info(
                 f'Source table could not be found '
-                f'on {self.source_environment.AwsAccountId}/{self.dataset.GlueDatabaseName}/{table.GlueTableName} '
+                f'on {self.source_environment.AwsAccountId}/{table.GlueDatabaseName}/{table.GlueTableName} '
                 f'skipping revoke actions...'
             )
             return True
 
         logger.info(
             f'Revoking source table access '
-            f'on {self.source_environment.AwsAccountId}/{self.dataset.GlueDatabaseName}/{table.GlueTableName} '
+            f'on {self.source_environment.AwsAccountId}/{table.GlueDatabaseName}/{table.GlueTableName} '
             f'for principals {principals}'
         )
         LakeFormation.revoke_source_table_access(
             target_accountid=self.target_environment.AwsAccountId,
             region=self.target_environment.region,
-            source_database=self.dataset.GlueDatabaseName,
+            source_database=table.GlueDatabaseName,
             source_table=table.GlueTableName,
             target_principals=principals,
             source_accountid=self.source_environment.AwsAccountId,
@@ -399,9 +503,8 @@ class LFShareManager:
         target_accountid = data['target']['accountid']
         target_region = data['target']['region']
 
-        source_session = SessionHelper.remote_session(accountid=source_accountid)
-        source_lf_client = source_session.client(
-            'lakeformation', region_name=source_region
+        source_lf_client = SessionHelper.remote_client(
+            'lakeformation', source_accountid, source_region
         )
         try:
 
@@ -438,6 +541,78 @@ class LFShareManager:
             )
             raise e
 
+    def share_tables_with_target_account(self, jobs: [dict]) -> None:
+        """
+        Shares the tables of the jobs with the target account using Lake Formation,
+        revoking IAMAllowedGroups permissions and granting the target account
+        access with one batch of requests for all tables.
+        Tables that could not be granted are logged as warnings.
+        Parameters
+        ----------
+        jobs : jobs from start_share_items
+        """
+        jobs = [job for job in jobs if not job['error']]
+        if not jobs:
+            return
+        source_accountid = self.source_environment.AwsAccountId
+        target_accountid = self.target_environment.AwsAccountId
+        client = SessionHelper.remote_client(
+            'lakeformation', source_accountid, self.source_environment.region
+        )
+        tables = [
+            {
+                'DatabaseName': job['data']['source']['database'],
+                'Name': job['data']['source']['tablename'],
+                'CatalogId': source_accountid,
+            }
+            for job in jobs
+        ]
+        try:
+            LakeFormation.batch_revoke_permissions(
+                client,
+                source_accountid,
+                [
+                    {
+                        'Id': str(index),
+                        'Principal': {'DataLakePrincipalIdentifier': 'EVERYONE'},
+                        'Resource': {'Table': table},
+                        'Permissions': ['ALL'],
+                        'PermissionsWithGrantOption': [],
+                    }
+                    for index, table in enumerate(tables)
+                ],
+            )
+        except ClientError as e:
+            logger.debug(f'Could not revoke IAMAllowedGroups Super permissions due to {e}')
+        time.sleep(1)
+
+        failures = LakeFormation.batch_grant_permissions(
+            client,
+            source_accountid,
+            [
+                {
+                    'Id': str(index),
+                    'Principal': {'DataLakePrincipalIdentifier': target_accountid},
+                    'Resource': {'Table': table},
+                    'Permissions': ['DESCRIBE', 'SELECT'],
+                    'PermissionsWithGrantOption': ['DESCRIBE', 'SELECT'],
+                }
+                for index, table in enumerate(tables)
+            ],
+        )
+        for failure in failures:
+            job = jobs[int(failure['RequestEntry']['Id'])]
+            # Like the single table grants, failures are only warnings
+            logger.warning(
+                f'Could not grant access to table {job["data"]["source"]["tablename"]} '
+                f'to external account {target_accountid} due to: {failure["Error"]}'
+            )
+        time.sleep(2)
+        logger.info(
+            f'Granted access to {len(jobs) - len(failures)} tables '
+            f'to external account {target_accountid}'
+        )
+
     def revoke_external_account_access_on_source_account(self) -> [dict]:
         """
         1) Revokes access to external account
@@ -451,11 +626,8 @@ class LFShareManager:
         logger.info(
             f'Revoking Access for AWS account: {self.target_environment.AwsAccountId}'
         )
-        aws_session = SessionHelper.remote_session(
-            accountid=self.source_environment.AwsAccountId
-        )
-        client = aws_session.client(
-            'lakeformation', region_name=self.source_environment.region
+        client = SessionHelper.remote_client(
+            'lakeformation', self.source_environment.AwsAccountId, self.source_environment.region
         )
         revoke_entries = []
         for table in self.revoked_tables:
@@ -477,9 +649,9 @@ class LFShareManager:
                     'PermissionsWithGrantOption': ['DESCRIBE', 'SELECT'],
                 }
             )
-            LakeFormation.batch_revoke_permissions(
-                client, self.source_environment.AwsAccountId, revoke_entries
-            )
+        LakeFormation.batch_revoke_permissions(
+            client, self.source_environment.AwsAccountId, revoke_entries
+        )
         return revoke_entries
 
     def delete_ram_resource_shares(self, resource_arn: str) -> [dict]:
@@ -495,12 +667,21 @@ class LFShareManager:
         """
         logger.info(f'Cleaning RAM resource shares for resource: {resource_arn} ...')
         return Ram.delete_resource_shares(
-            SessionHelper.remote_session(
-                accountid=self.source_environment.AwsAccountId
-            ).client('ram', region_name=self.source_environment.region),
+            SessionHelper.remote_client(
+                'ram', self.source_environment.AwsAccountId, self.source_environment.region
+            ),
             resource_arn,
         )
 
+    def revoke_table_job(self, job: dict) -> None:
+        """
+        Revokes the access of the share principals to the job table
+        and deletes its resource link
+        """
+        self.revoke_table_resource_link_access(job['table'], self.principals)
+        self.revoke_source_table_access(job['table'], self.principals)
+        self.delete_resource_link_table(job['table'])
+
     def handle_share_failure(
         self,
         table: models.DatasetTable,
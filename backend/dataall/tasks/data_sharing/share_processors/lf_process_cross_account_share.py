@@ -36,15 +36,17 @@ class ProcessLFCrossAccountShare(LFShareManager):
         1) Grant ALL permissions to pivotRole for source database in source account
         2) Get share principals (requester IAM role and QS groups) and build shared db name
         3) Create the shared database in target account if it doesn't exist
-        4) For each shared table:
-            a) update its status to SHARE_IN_PROGRESS with Action Start
-            b) check if share item exists on glue catalog raise error if not and flag share item status to failed
-            c) grant external account (target account) access to table -> create RAM invitation and revoke_iamallowedgroups_super_permission_from_table
-            d) accept pending RAM invitation
-            e) create resource link for table in target account
-            f) grant permission to table for requester team IAM role in source account
-            g) grant permission to resource link table for requester team IAM role in target account
-            h) update share item status to SHARE_SUCCESSFUL with Action Success
+        4) Update the status of the shared tables items to SHARE_IN_PROGRESS with Action Start
+        5) Check concurrently that the tables exist on glue catalog, flag the missing ones as failed
+        6) Grant external account (target account) access to all tables with one batch of requests
+        -> create RAM invitations and revoke_iamallowedgroups_super_permission_from_table
+        7) Accept the pending RAM invitations once for all tables, sharing again the tables
+        whose invitation expired or was rejected
+        8) For each table, concurrently:
+            a) create resource link for table in target account
+            b) grant permission to table for requester team IAM role in source account
+            c) grant permission to resource link table for requester team IAM role in target account
+        9) Update share items status to SHARE_SUCCESSFUL with Action Success or SHARE_FAILED with Action Failure
 
         Returns
         -------
@@ -61,69 +63,59 @@ class ProcessLFCrossAccountShare(LFShareManager):
         else:
             self.grant_pivot_role_all_database_permissions()
 
-            shared_db_name = self.build_shared_db_name()
-            principals = self.get_share_principals()
-
             self.create_shared_database(
-                self.target_environment, self.dataset, shared_db_name, principals
+                self.target_environment, self.dataset, self.shared_db_name, self.principals
             )
 
-            for table in self.shared_tables:
-                log.info(f"Sharing table {table.GlueTableName}...")
-
-                share_item = api.ShareObject.find_share_item_by_table(
-                    self.session, self.share, table
-                )
-
-                if not share_item:
-                    log.info(
-                        f'Share Item not found for {self.share.shareUri} '
-                        f'and Dataset Table {table.GlueTableName} continuing loop...'
-                    )
-                    continue
-
-                shared_item_SM = api.ShareItemSM(models.ShareItemStatus.Share_Approved.value)
-                new_state = shared_item_SM.run_transition(models.Enums.ShareObjectActions.Start.value)
-                shared_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-                try:
-
-                    self.check_share_item_exists_on_glue_catalog(share_item, table)
-
-                    data = self.build_share_data(table)
-                    self.share_table_with_target_account(**data)
-
-                    (
-                        retry_share_table,
-                        failed_invitations,
-                    ) = Ram.accept_ram_invitation(**data)
-
-                    if retry_share_table:
-                        self.share_table_with_target_account(**data)
-                        Ram.accept_ram_invitation(**data)
+            jobs = self.start_share_items(
+                self.shared_tables, models.ShareItemStatus.Share_Approved.value
+            )
+            log.info(f'Sharing {len(jobs)} tables...')
+            self.run_share_items(jobs, self.check_share_job_exists_on_glue_catalog)
+            self.share_tables_with_target_account(jobs)
+            self.accept_ram_invitations(jobs)
+            self.run_share_items(jobs, self.share_table_job)
+            success = self.finish_share_items(jobs, self.handle_share_failure)
 
-                    self.create_resource_link(**data)
+        return success
 
-                    new_state = shared_item_SM.run_transition(models.Enums.ShareItemActions.Success.value)
-                    shared_item_SM.update_state_single_item(self.session, share_item, new_state)
+    def accept_ram_invitations(self, jobs: [dict]) -> None:
+        """
+        Accepts the RAM invitations of the tables of the jobs once for the
+        whole batch, the tables whose resource share was reset are shared
+        again and their new invitations accepted
+        """
+        jobs = [job for job in jobs if not job['error']]
+        if not jobs:
+            return
+        source = jobs[0]['data']['source']
+        target = jobs[0]['data']['target']
+        jobs_by_table = {job['data']['source']['tablename']: job for job in jobs}
+        try:
+            reshare_tables = Ram.accept_ram_invitations(source, target, list(jobs_by_table))
+            if reshare_tables:
+                log.info(f'Sharing again tables {reshare_tables}...')
+                self.share_tables_with_target_account(
+                    [jobs_by_table[tablename] for tablename in reshare_tables]
+                )
+                Ram.accept_ram_invitations(source, target, reshare_tables)
+        except Exception as e:
+            for job in jobs:
+                job['error'] = e
 
-                except Exception as e:
-                    self.handle_share_failure(table=table, share_item=share_item, error=e)
-                    new_state = shared_item_SM.run_transition(models.Enums.ShareItemActions.Failure.value)
-                    shared_item_SM.update_state_single_item(self.session, share_item, new_state)
-                    success = False
-
-        return success
+    def share_table_job(self, job: dict) -> None:
+        """Creates the resource link of the job table and grants access to it"""
+        self.create_resource_link(**job['data'])
 
     def process_revoked_shares(self) -> bool:
         """
-        For each revoked request item:
-            a) update its status to REVOKE_IN_PROGRESS with Action Start
-            b) check if item exists on glue catalog raise error if not and flag item status to failed
-            c) revoke table resource link: undo grant permission to resource link table for team role in target account
-            d) revoke source table access: undo grant permission to table for team role in source account
-            e) delete resource link table
-            h) update share item status to REVOKE_SUCCESSFUL with Action Success
+        1) Update the status of the revoked tables items to REVOKE_IN_PROGRESS with Action Start
+        2) Check concurrently that the tables exist on glue catalog, flag the missing ones as failed
+        3) For each revoked table, concurrently:
+            a) revoke table resource link: undo grant permission to resource link table for team role in target account
+            b) revoke source table access: undo grant permission to table for team role in source account
+            c) delete resource link table
+        4) Update share items status to REVOKE_SUCCESSFUL with Action Success or REVOKE_FAILED with Action Failure
 
         Returns
         -------
@@ -133,41 +125,14 @@ class ProcessLFCrossAccountShare(LFShareManager):
         log.info(
             '##### Starting Revoking tables cross account #######'
         )
-        success = True
-        shared_db_name = self.build_shared_db_name()
-        principals = self.get_share_principals()
-        for table in self.revoked_tables:
-            share_item = api.ShareObject.find_share_item_by_table(
-                self.session, self.share, table
-            )
-
-            revoked_item_SM = api.ShareItemSM(models.ShareItemStatus.Revoke_Approved.value)
-            new_state = revoked_item_SM.run_transition(models.Enums.ShareObjectActions.Start.value)
-            revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-            try:
-
-                self.check_share_item_exists_on_glue_catalog(share_item, table)
-
-                log.info(f'Starting revoke access for table: {table.GlueTableName} in database {shared_db_name} '
-                         f'For principals {principals}')
-
-                self.revoke_table_resource_link_access(table, principals)
-
-                self.revoke_source_table_access(table, principals)
-
-                self.delete_resource_link_table(table)
-
-                new_state = revoked_item_SM.run_transition(models.Enums.ShareItemActions.Success.value)
-                revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-            except Exception as e:
-                self.handle_revoke_failure(share_item=share_item, table=table, error=e)
-                new_state = revoked_item_SM.run_transition(models.Enums.ShareItemActions.Failure.value)
-                revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-                success = False
-
-        return success
+        jobs = self.start_share_items(
+            self.revoked_tables, models.ShareItemStatus.Revoke_Approved.value
+        )
+        log.info(f'Starting revoke access for {len(jobs)} tables in database {self.shared_db_name} '
+                 f'For principals {self.principals}')
+        self.run_share_items(jobs, self.check_share_job_exists_on_glue_catalog)
+        self.run_share_items(jobs, self.revoke_table_job)
+        return self.finish_share_items(jobs, self.handle_revoke_failure)
 
     def clean_up_share(self) -> bool:
         """"
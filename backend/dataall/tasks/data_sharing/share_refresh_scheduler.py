@@ -0,0 +1,281 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+from sqlalchemy import func, select
+
+from ...db import api, models, Engine
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_PER_ACCOUNT = 2
+RUN_LOCK = 'shares_refresh_run'
+
+
+class ShareRefreshStatus:
+    Pending = 'Pending'
+    InProgress = 'InProgress'
+    Succeeded = 'Succeeded'
+    Failed = 'Failed'
+    Skipped = 'Skipped'
+
+
+class AccountLimiter:
+    """Caps the number of operations running at the same time on an AWS account"""
+
+    def __init__(self, max_per_account: int):
+        self.max_per_account = max_per_account
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, account: str) -> threading.Semaphore:
+        with self._lock:
+            if account not in self._semaphores:
+                self._semaphores[account] = threading.Semaphore(self.max_per_account)
+            return self._semaphores[account]
+
+    @contextmanager
+    def acquire(self, *accounts: str):
+        # Always acquired in the same order so that workers never deadlock
+        semaphores = [self._semaphore(a) for a in sorted(set(accounts))]
+        for semaphore in semaphores:
+            semaphore.acquire()
+        try:
+            yield
+        finally:
+            for semaphore in reversed(semaphores):
+                semaphore.release()
+
+
+class ShareRefreshScheduler:
+    """
+    Refreshes shares concurrently. Shares are partitioned by source and target
+    account pair, partitions run on a pool of workers and the shares of a
+    partition run one after the other. The progress of every share is stored
+    in share_refresh_progress so that a run that did not complete is resumed
+    by the next one instead of starting over. A run holds a postgres advisory
+    lock until it ends, a run that overlaps it exits, and the lock of a run
+    that crashed is released with its connection so that the next run resumes
+    it.
+    """
+
+    def __init__(self, engine: Engine, max_workers=None, max_per_account=None):
+        self.engine = engine
+        self.max_workers = int(
+            max_workers or os.getenv('SHARES_REFRESH_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+        )
+        self.limiter = AccountLimiter(
+            int(
+                max_per_account
+                or os.getenv('SHARES_REFRESH_MAX_PER_ACCOUNT', DEFAULT_MAX_PER_ACCOUNT)
+            )
+        )
+
+    def run_environments(self, environments: [models.Environment], action) -> None:
+        """Runs the action on every environment, respecting the per account cap"""
+
+        def run(environment):
+            with self.limiter.acquire(environment.AwsAccountId):
+                log.info(
+                    f'Running {action.__name__} for environment: '
+                    f'{environment.AwsAccountId}/{environment.region}...'
+                )
+                action(environment)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(run, e): e for e in environments}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    environment = futures[future]
+                    log.error(
+                        f'Failed {action.__name__} for environment '
+                        f'{environment.AwsAccountId}/{environment.region} due to: {e}'
+                    )
+
+    def run(self, refresh_share) -> dict:
+        """
+        Refreshes the pending shares of the unfinished run, or of a new run
+        Parameters
+        ----------
+        refresh_share : callable taking an engine, a share uri and the share status
+
+        Returns
+        -------
+        Number of shares per final status
+        """
+        with self.run_lease() as leased:
+            if not leased:
+                log.info('Another shares refresh run is in progress, exiting')
+                return {}
+            return self._run(refresh_share)
+
+    @contextmanager
+    def run_lease(self):
+        """Yields whether the run lock was acquired, on a connection held for the whole run"""
+        lock_id = func.hashtext(RUN_LOCK)
+        connection = self.engine.engine.connect()
+        try:
+            leased = connection.execute(select([func.pg_try_advisory_lock(lock_id)])).scalar()
+            try:
+                yield leased
+            finally:
+                if leased:
+                    connection.execute(select([func.pg_advisory_unlock(lock_id)]))
+        finally:
+            connection.close()
+
+    def _run(self, refresh_share) -> dict:
+        started = time.monotonic()
+        run_uri, jobs = self.load_jobs()
+        partitions = {}
+        for job in jobs:
+            partitions.setdefault(
+                (job['sourceAccountId'], job['targetAccountId']), []
+            ).append(job)
+        log.info(
+            f'Refreshing {len(jobs)} shares of run {run_uri} in {len(partitions)} '
+            f'account pairs, running {self.max_workers} workers'
+        )
+
+        summary = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self.refresh_partition, refresh_share, run_uri, partition)
+                for partition in partitions.values()
+            ]
+            for future in as_completed(futures):
+                for status in future.result():
+                    summary[status] = summary.get(status, 0) + 1
+
+        log.info(
+            f'Refreshed {len(jobs)} shares of run {run_uri} in '
+            f'{time.monotonic() - started:.1f}s: {summary}'
+        )
+        return summary
+
+    def load_jobs(self) -> (str, [dict]):
+        """Returns the remaining shares of the last run if it did not complete, or starts a new run"""
+        with self.engine.scoped_session() as session:
+            unfinished = (
+                session.query(models.ShareRefreshProgress)
+                .filter(
+                    models.ShareRefreshProgress.status.in_(
+                        [ShareRefreshStatus.Pending, ShareRefreshStatus.InProgress]
+                    )
+                )
+                .order_by(models.ShareRefreshProgress.created.desc())
+                .first()
+            )
+            if unfinished:
+                run_uri = unfinished.runUri
+                progress = (
+                    session.query(models.ShareRefreshProgress)
+                    .filter(
+                        models.ShareRefreshProgress.runUri == run_uri,
+                        models.ShareRefreshProgress.status.in_(
+                            [ShareRefreshStatus.Pending, ShareRefreshStatus.InProgress]
+                        ),
+                    )
+                    .all()
+                )
+                log.info(f'Resuming run {run_uri} with {len(progress)} remaining shares')
+            else:
+                run_uri = str(uuid.uuid4())
+                session.query(models.ShareRefreshProgress).delete()
+                shares = (
+                    session.query(
+                        models.ShareObject.shareUri,
+                        models.Dataset.AwsAccountId,
+                        models.Environment.AwsAccountId,
+                    )
+                    .join(
+                        models.Dataset,
+                        models.Dataset.datasetUri == models.ShareObject.datasetUri,
+                    )
+                    .outerjoin(
+                        models.Environment,
+                        models.Environment.environmentUri
+                        == models.ShareObject.environmentUri,
+                    )
+                    .filter(
+                        models.ShareObject.status.in_(
+                            api.ShareObjectSM.get_share_object_refreshable_states()
+                        )
+                    )
+                    .all()
+                )
+                orphans = [share_uri for share_uri, _, target_account in shares if not target_account]
+                if orphans:
+                    log.warning(
+                        f'Not refreshing {len(orphans)} shares whose target environment '
+                        f'does not exist: {orphans}'
+                    )
+                progress = [
+                    models.ShareRefreshProgress(
+                        runUri=run_uri,
+                        shareUri=share_uri,
+                        sourceAccountId=source_account,
+                        targetAccountId=target_account,
+                        status=ShareRefreshStatus.Pending,
+                    )
+                    for share_uri, source_account, target_account in shares
+                    if target_account
+                ]
+                session.add_all(progress)
+                session.commit()
+
+            return run_uri, [
+                {
+                    'shareUri': p.shareUri,
+                    'sourceAccountId': p.sourceAccountId,
+                    'targetAccountId': p.targetAccountId,
+                }
+                for p in progress
+            ]
+
+    def refresh_partition(self, refresh_share, run_uri: str, jobs: [dict]) -> [str]:
+        """Refreshes the shares of one account pair in order, on a worker thread"""
+        statuses = []
+        for job in jobs:
+            with self.limiter.acquire(job['sourceAccountId'], job['targetAccountId']):
+                statuses.append(self.refresh_job(refresh_share, run_uri, job))
+        return statuses
+
+    def refresh_job(self, refresh_share, run_uri: str, job: dict) -> str:
+        with self.engine.scoped_session() as session:
+            share = session.query(models.ShareObject).get(job['shareUri'])
+            share_status = share.status if share else None
+        error = None
+        if share_status not in api.ShareObjectSM.get_share_object_refreshable_states():
+            log.info(f'Share {job["shareUri"]} is {share_status}, nothing to refresh')
+            status = ShareRefreshStatus.Skipped
+        else:
+            self.save_progress(self.engine, run_uri, job['shareUri'], ShareRefreshStatus.InProgress)
+            try:
+                log.info(f'Refreshing share {job["shareUri"]} with {share_status} status...')
+                refresh_share(self.engine, job['shareUri'], share_status)
+                status = ShareRefreshStatus.Succeeded
+            except Exception as e:
+                log.error(
+                    f'Failed refreshing share {job["shareUri"]} with {share_status}. '
+                    f'due to: {e}'
+                )
+                status = ShareRefreshStatus.Failed
+                error = str(e)
+        self.save_progress(self.engine, run_uri, job['shareUri'], status, error)
+        return status
+
+    @staticmethod
+    def save_progress(engine: Engine, run_uri: str, share_uri: str, status: str, error=None):
+        with engine.scoped_session() as session:
+            progress = session.query(models.ShareRefreshProgress).get((run_uri, share_uri))
+            progress.status = status
+            progress.error = error
+            session.commit()
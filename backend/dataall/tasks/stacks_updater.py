@@ -2,10 +2,13 @@ import logging
 import os
 import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 from .. import db
 from ..db import models
 from ..aws.handlers.ecs import Ecs
+from ..cdkproxy.deployment_planner import DeploymentPlanner, DEPLOYED_STATUSES
 from ..db import get_engine
 from ..utils import Parameter
 
@@ -15,53 +18,286 @@ if not root.hasHandlers():
     root.addHandler(logging.StreamHandler(sys.stdout))
 log = logging.getLogger(__name__)
 
-RETRIES = 30
-SLEEP_TIME = 30
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_PER_ACCOUNT = 2
+DEFAULT_TIMEOUT = 900
+DEFAULT_BATCH_SIZE = 10
+POLL_INITIAL_DELAY = 5
+POLL_MAX_DELAY = 60
 
 
-def update_stacks(engine, envname):
+class StackUpdateStatus:
+    Succeeded = 'Succeeded'
+    Failed = 'Failed'
+    Skipped = 'Skipped'
+    TimedOut = 'TimedOut'
+
+
+def update_stacks(engine, envname, force=False):
     with engine.scoped_session() as session:
 
         all_datasets: [models.Dataset] = db.api.Dataset.list_all_active_datasets(session)
         all_environments: [models.Environment] = db.api.Environment.list_all_active_environments(session)
 
-        log.info(f'Found {len(all_environments)} environments, triggering update stack tasks...')
-        environment: models.Environment
-        for environment in all_environments:
-            update_stack(session=session, envname=envname, target_uri=environment.environmentUri, wait=True)
-
-        log.info(f'Found {len(all_datasets)} datasets')
-        dataset: models.Dataset
-        for dataset in all_datasets:
-            update_stack(session=session, envname=envname, target_uri=dataset.datasetUri, wait=False)
+        log.info(f'Found {len(all_environments)} environments and {len(all_datasets)} datasets, triggering update stack tasks...')
+        orchestrator = StackUpdateOrchestrator(engine, envname, force=force)
+        orchestrator.run(all_environments, all_datasets)
 
         return all_environments, all_datasets
 
 
-def update_stack(session, envname, target_uri, wait=False):
+class StackUpdateOrchestrator:
+    """
+    Updates the stacks concurrently, at most max_workers in total and
+    max_per_account at the same time on an AWS account. Jobs wait in per
+    account queues and are only submitted when their account has a free
+    slot. The dataset stacks of an environment are updated once the
+    environment stack update completed, in batches of at most batch_size
+    stacks of the same account and region synthesized by one cdkproxy task.
+    The other stacks do not wait for each other. Completion is tracked on the cdkproxy ECS task, polled with
+    an exponential backoff, and the outcome is read from the stack status.
+    """
+
+    def __init__(
+        self,
+        engine,
+        envname,
+        force=False,
+        max_workers=None,
+        max_per_account=None,
+        timeout=None,
+        batch_size=None,
+    ):
+        self.engine = engine
+        self.envname = envname
+        self.force = force
+        self.max_workers = int(
+            max_workers or os.getenv('STACKS_UPDATER_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+        )
+        self.max_per_account = int(
+            max_per_account
+            or os.getenv('STACKS_UPDATER_MAX_PER_ACCOUNT', DEFAULT_MAX_PER_ACCOUNT)
+        )
+        self.timeout = float(
+            timeout or os.getenv('STACKS_UPDATER_TIMEOUT', DEFAULT_TIMEOUT)
+        )
+        self.batch_size = int(
+            batch_size or os.getenv('STACKS_UPDATER_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        )
+        self._cluster_name = None
+
+    @property
+    def cluster_name(self):
+        if self._cluster_name is None:
+            self._cluster_name = Parameter().get_parameter(
+                env=self.envname, path='ecs/cluster/name'
+            )
+        return self._cluster_name
+
+    def run(self, environments: [models.Environment], datasets: [models.Dataset]) -> [dict]:
+        """Updates the stacks and returns the summary of every stack update"""
+        started = time.monotonic()
+        ready = {}
+        environment_uris = {e.environmentUri for e in environments}
+        for environment in environments:
+            ready.setdefault(environment.AwsAccountId, deque()).append(
+                ([environment.environmentUri], environment.AwsAccountId, [environment.label])
+            )
+        groups = {}
+        for dataset in datasets:
+            if dataset.environmentUri in environment_uris:
+                groups.setdefault(
+                    (dataset.environmentUri, dataset.AwsAccountId, dataset.region), []
+                ).append(dataset)
+            else:
+                ready.setdefault(dataset.AwsAccountId, deque()).append(
+                    ([dataset.datasetUri], dataset.AwsAccountId, [dataset.label])
+                )
+        dependents = {}
+        for (environment_uri, account, region), group in groups.items():
+            for i in range(0, len(group), self.batch_size):
+                batch = group[i:i + self.batch_size]
+                dependents.setdefault(environment_uri, []).append(
+                    ([d.datasetUri for d in batch], account, [d.label for d in batch])
+                )
+
+        # Created once before the workers start, see Ecs.client
+        Ecs.client()
+        summary = []
+        running = {}
+        pending = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            def schedule():
+                # Jobs only start when their account has a free slot, so that
+                # workers never wait on a busy account
+                started_job = True
+                while started_job and len(pending) < self.max_workers:
+                    started_job = False
+                    for account, jobs in ready.items():
+                        if len(pending) >= self.max_workers:
+                            break
+                        if jobs and running.get(account, 0) < self.max_per_account:
+                            job = jobs.popleft()
+                            running[account] = running.get(account, 0) + 1
+                            pending[executor.submit(self.update, *job)] = job
+                            started_job = True
+
+            schedule()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    target_uris, account, labels = pending.pop(future)
+                    running[account] -= 1
+                    try:
+                        summary.extend(future.result())
+                    except Exception as e:
+                        for target_uri, label in zip(target_uris, labels):
+                            log.error(f'Failed to update stack of {label}//{target_uri} due to: {e}')
+                            summary.append(
+                                {
+                                    'targetUri': target_uri,
+                                    'label': label,
+                                    'status': StackUpdateStatus.Failed,
+                                    'duration': None,
+                                }
+                            )
+                    for target_uri in target_uris:
+                        for job in dependents.pop(target_uri, []):
+                            ready.setdefault(job[1], deque()).append(job)
+                schedule()
+
+        self.log_summary(summary, time.monotonic() - started)
+        return summary
+
+    def update(self, target_uris, account, labels) -> [dict]:
+        started = time.monotonic()
+        with self.engine.scoped_session() as session:
+            if len(target_uris) == 1:
+                task_arns = {
+                    target_uris[0]: update_stack(
+                        session=session,
+                        envname=self.envname,
+                        target_uri=target_uris[0],
+                        force=self.force,
+                    )
+                }
+            else:
+                task_arns = update_stack_batch(
+                    session=session,
+                    envname=self.envname,
+                    target_uris=target_uris,
+                    force=self.force,
+                )
+        results = []
+        for target_uri, label in zip(target_uris, labels):
+            task_arn = task_arns.get(target_uri)
+            if task_arn:
+                status = self.wait_for_stack(target_uri, task_arn)
+            else:
+                status = StackUpdateStatus.Skipped
+            results.append(
+                {
+                    'targetUri': target_uri,
+                    'label': label,
+                    'status': status,
+                    'duration': time.monotonic() - started,
+                }
+            )
+        return results
+
+    def wait_for_stack(self, target_uri, task_arn) -> str:
+        deadline = time.monotonic() + self.timeout
+        delay = POLL_INITIAL_DELAY
+        while Ecs.get_task_status(self.cluster_name, task_arn) != 'STOPPED':
+            if time.monotonic() + delay > deadline:
+                log.info(f'Update of stack {target_uri} did not complete in {self.timeout:.0f}s, continuing...')
+                return StackUpdateStatus.TimedOut
+            time.sleep(delay)
+            delay = min(delay * 2, POLL_MAX_DELAY)
+
+        with self.engine.scoped_session() as session:
+            stack = db.api.Stack.get_stack_by_target_uri(session, target_uri=target_uri)
+            if stack.status in DEPLOYED_STATUSES:
+                return StackUpdateStatus.Succeeded
+            return StackUpdateStatus.Failed
+
+    @staticmethod
+    def log_summary(summary: [dict], elapsed):
+        counts = {}
+        for result in summary:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        lines = [
+            f"  {r['label']}//{r['targetUri']}: {r['status']}"
+            + (f" in {r['duration']:.1f}s" if r['duration'] is not None else '')
+            for r in sorted(summary, key=lambda r: -(r['duration'] or 0))
+        ]
+        log.info(
+            f'Updated {len(summary)} stacks in {elapsed:.1f}s: {counts}\n' + '\n'.join(lines)
+        )
+
+
+def update_stack(session, envname, target_uri, force=False):
+    """
+    Starts the cdkproxy task updating the stack of the target, unless the
+    stack is up to date. Returns the arn of the task updating the stack or
+    None when skipped.
+    """
     stack: models.Stack = db.api.Stack.get_stack_by_target_uri(
         session, target_uri=target_uri
     )
+    if not force and DeploymentPlanner.is_up_to_date(session, stack):
+        log.info(f'Stack {stack.name}//{stack.stackUri} is up to date, skipping...')
+        return None
     cluster_name = Parameter().get_parameter(env=envname, path='ecs/cluster/name')
-    if not Ecs.is_task_running(cluster_name=cluster_name, started_by=f'awsworker-{stack.stackUri}'):
-        stack.EcsTaskArn = Ecs.run_cdkproxy_task(stack_uri=stack.stackUri)
-        if wait:
-            retries = 1
-            while Ecs.is_task_running(cluster_name=cluster_name, started_by=f'awsworker-{stack.stackUri}'):
-                log.info(f"Update for {stack.name}//{stack.stackUri} is not complete, waiting for {SLEEP_TIME} seconds...")
-                time.sleep(SLEEP_TIME)
-                retries = retries + 1
-                if retries > RETRIES:
-                    log.info(f"Maximum number of retries exceeded ({RETRIES} retries), continuing task...")
-                    break
-            log.info(f"Update for {stack.name}//{stack.stackUri} COMPLETE or maximum number of retries exceeded ({RETRIES} retries)")
-    else:
+    task_arn = Ecs.get_stack_task(cluster_name, stack)
+    if task_arn:
         log.info(
-            f'Stack update is already running... Skipping stack {stack.name}//{stack.stackUri}'
+            f'Stack update is already running... Waiting for {stack.name}//{stack.stackUri}'
+        )
+    else:
+        task_arn = stack.EcsTaskArn = Ecs.run_cdkproxy_task(stack_uri=stack.stackUri)
+    return task_arn
+
+
+def update_stack_batch(session, envname, target_uris, force=False) -> dict:
+    """
+    Starts one cdkproxy task updating the stacks of the targets that are not
+    up to date, they must be on the same account and region. Returns the arn
+    of the task updating the stack of each target, None when skipped.
+    """
+    cluster_name = Parameter().get_parameter(env=envname, path='ecs/cluster/name')
+    task_arns = {}
+    outdated = []
+    for target_uri in target_uris:
+        stack: models.Stack = db.api.Stack.get_stack_by_target_uri(
+            session, target_uri=target_uri
         )
+        if not force and DeploymentPlanner.is_up_to_date(session, stack):
+            log.info(f'Stack {stack.name}//{stack.stackUri} is up to date, skipping...')
+            task_arns[target_uri] = None
+            continue
+        task_arn = Ecs.get_stack_task(cluster_name, stack)
+        if task_arn:
+            log.info(
+                f'Stack update is already running... Waiting for {stack.name}//{stack.stackUri}'
+            )
+            task_arns[target_uri] = task_arn
+        else:
+            outdated.append(stack)
+    if len(outdated) == 1:
+        task_arn = Ecs.run_cdkproxy_task(stack_uri=outdated[0].stackUri)
+    elif outdated:
+        task_arn = Ecs.run_cdkproxy_task(stack_uris=[s.stackUri for s in outdated])
+    for stack in outdated:
+        stack.EcsTaskArn = task_arns[stack.targetUri] = task_arn
+    # The batch task is only found through the EcsTaskArn of its stacks
+    session.commit()
+    return task_arns
 
 
 if __name__ == '__main__':
     envname = os.environ.get('envname', 'local')
     engine = get_engine(envname=envname)
-    update_stacks(engine=engine, envname=envname)
+    force = os.getenv('FORCE_STACKS_UPDATE', 'false').lower() == 'true'
+    update_stacks(engine=engine, envname=envname, force=force)
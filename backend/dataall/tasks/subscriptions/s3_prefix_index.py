@@ -0,0 +1,54 @@
+class _Node:
+    __slots__ = ('children', 'value')
+
+    def __init__(self):
+        self.children = {}
+        self.value = None
+
+
+class S3PrefixIndex:
+    """
+    In-memory trie of the S3 prefixes of an (account, region), resolving the
+    prefix of a producer message to a table or a folder without a database
+    scan. Prefixes are compared path segment by path segment.
+    """
+
+    def __init__(self):
+        self._roots = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @staticmethod
+    def segments(prefix: str) -> [str]:
+        return prefix.rstrip('/').split('/')
+
+    def add(self, accountid, region, prefix, value):
+        node = self._roots.setdefault((accountid, region), _Node())
+        for segment in self.segments(prefix):
+            node = node.children.setdefault(segment, _Node())
+        if node.value is None:
+            self._size += 1
+        node.value = value
+
+    def find(self, accountid, region, prefix):
+        """Value of the prefix itself, or else of the first prefix under it"""
+        node = self._roots.get((accountid, region))
+        if not node or not prefix:
+            return None
+        for segment in self.segments(prefix):
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return self._first(node)
+
+    @staticmethod
+    def _first(node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.value is not None:
+                return node.value
+            stack.extend(reversed(list(node.children.values())))
+        return None
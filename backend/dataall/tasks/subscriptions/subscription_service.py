@@ -13,6 +13,7 @@ from ...aws.handlers.sqs import SqsQueue
 from ...db import get_engine
 from ...db import models
 from ...tasks.subscriptions import poll_queues
+from .s3_prefix_index import S3PrefixIndex
 from ...utils import json_utils
 
 root = logging.getLogger()
@@ -52,85 +53,135 @@ class SubscriptionService:
         log.info(f'Notifying consumers with messages {messages}')
 
         with engine.scoped_session() as session:
-
+            tables, locations = SubscriptionService.load_prefix_indexes(
+                session, {message.get('accountid') for message in messages}
+            )
+            updates = []
             for message in messages:
+                key = (
+                    message.get('accountid'),
+                    message.get('region'),
+                    message.get('prefix'),
+                )
+                table = tables.find(*key)
+                if not table:
+                    log.info(f'No table for message {message}')
+                else:
+                    log.info(
+                        f'Found table {table.tableUri}|{table.GlueTableName}|{table.S3Prefix}'
+                    )
+                    updates.append((message, table.datasetUri, table.tableUri, table.S3Prefix, table))
 
-                SubscriptionService.publish_table_update_message(engine, message)
+                location = locations.find(*key)
+                if not location:
+                    log.info(f'No location found for message {message}')
+                else:
+                    log.info(f'Found location {location.locationUri}|{location.S3Prefix}')
+                    updates.append((message, location.datasetUri, location.locationUri, location.S3Prefix, None))
 
-                SubscriptionService.publish_location_update_message(session, message)
+            if updates:
+                SubscriptionService.publish_updates(engine, session, updates)
 
         return True
 
     @staticmethod
-    def publish_table_update_message(engine, message):
-        with engine.scoped_session() as session:
-            table: models.DatasetTable = db.api.DatasetTable.get_table_by_s3_prefix(
-                session,
-                message.get('prefix'),
-                message.get('accountid'),
-                message.get('region'),
-            )
-            if not table:
-                log.info(f'No table for message {message}')
-            else:
-                log.info(
-                    f'Found table {table.tableUri}|{table.GlueTableName}|{table.S3Prefix}'
-                )
-
-                dataset: models.Dataset = session.query(models.Dataset).get(
-                    table.datasetUri
-                )
-                log.info(
-                    f'Found dataset {dataset.datasetUri}|{dataset.environmentUri}|{dataset.AwsAccountId}'
-                )
-                share_items: [models.ShareObjectItem] = (
-                    session.query(models.ShareObjectItem)
-                    .filter(models.ShareObjectItem.itemUri == table.tableUri)
-                    .all()
-                )
-                log.info(f'Found shared items for table {share_items}')
-
-                return SubscriptionService.publish_sns_message(
-                    engine,
-                    message,
-                    dataset,
-                    share_items,
-                    table.S3Prefix,
-                    table=table,
-                )
+    def load_prefix_indexes(session, accountids) -> (S3PrefixIndex, S3PrefixIndex):
+        """Indexes of the S3 prefixes of the tables and of the folders of the accounts"""
+        tables = S3PrefixIndex()
+        for table in session.query(
+            models.DatasetTable.tableUri,
+            models.DatasetTable.datasetUri,
+            models.DatasetTable.GlueTableName,
+            models.DatasetTable.S3Prefix,
+            models.DatasetTable.AWSAccountId,
+            models.DatasetTable.region,
+        ).filter(models.DatasetTable.AWSAccountId.in_(accountids)):
+            tables.add(table.AWSAccountId, table.region, table.S3Prefix, table)
+
+        locations = S3PrefixIndex()
+        for location in session.query(
+            models.DatasetStorageLocation.locationUri,
+            models.DatasetStorageLocation.datasetUri,
+            models.DatasetStorageLocation.S3Prefix,
+            models.DatasetStorageLocation.AWSAccountId,
+            models.DatasetStorageLocation.region,
+        ).filter(models.DatasetStorageLocation.AWSAccountId.in_(accountids)):
+            locations.add(location.AWSAccountId, location.region, location.S3Prefix, location)
+
+        log.info(f'Indexed {len(tables)} tables and {len(locations)} folders')
+        return tables, locations
 
     @staticmethod
-    def publish_location_update_message(session, message):
-        location: models.DatasetStorageLocation = (
-            db.api.DatasetStorageLocation.get_location_by_s3_prefix(
-                session,
-                message.get('prefix'),
-                message.get('accountid'),
-                message.get('region'),
-            )
-        )
-        if not location:
-            log.info(f'No location found for message {message}')
-
-        else:
-            log.info(f'Found location {location.locationUri}|{location.S3Prefix}')
-
-            dataset: models.Dataset = session.query(models.Dataset).get(
-                location.datasetUri
+    def publish_updates(engine, session, updates):
+        """
+        Notifies the consumers of the updated tables and folders, the datasets
+        and the consumers of the whole batch are loaded at once
+        """
+        datasets = {
+            dataset.datasetUri: dataset
+            for dataset in session.query(models.Dataset).filter(
+                models.Dataset.datasetUri.in_({u[1] for u in updates})
             )
+        }
+        consumers = SubscriptionService.get_consumers(session, {u[2] for u in updates})
+
+        published = set()
+        for message, dataset_uri, item_uri, prefix, table in updates:
+            # Bursts of notifications for the same object are published once
+            key = (item_uri, json.dumps(message, sort_keys=True, default=str))
+            if key in published:
+                continue
+            published.add(key)
+
+            dataset = datasets.get(dataset_uri)
+            if not dataset:
+                log.error(f'Dataset of shared item was deleted ? {item_uri}')
+                continue
             log.info(
                 f'Found dataset {dataset.datasetUri}|{dataset.environmentUri}|{dataset.AwsAccountId}'
             )
-            share_items: [models.ShareObjectItem] = (
-                session.query(models.ShareObjectItem)
-                .filter(models.ShareObjectItem.itemUri == location.locationUri)
-                .all()
+            item_consumers = consumers.get(item_uri, [])
+            log.info(f'Found {len(item_consumers)} approved shares for item {item_uri}')
+
+            SubscriptionService.publish_sns_message(
+                engine,
+                session,
+                dict(message),
+                dataset,
+                item_consumers,
+                prefix,
+                table=table,
             )
-            log.info(f'Found shared items for location {share_items}')
 
-            return SubscriptionService.publish_sns_message(
-                session, message, dataset, share_items, location.S3Prefix
+    @staticmethod
+    def get_consumers(session, item_uris) -> dict:
+        """Approved share objects of the items and environments of their principals, by item uri"""
+        rows = (
+            session.query(
+                models.ShareObjectItem.itemUri,
+                models.ShareObject,
+                models.Environment,
+            )
+            .join(
+                models.ShareObject,
+                models.ShareObject.shareUri == models.ShareObjectItem.shareUri,
+            )
+            .outerjoin(
+                models.Environment,
+                models.Environment.environmentUri == models.ShareObject.principalId,
+            )
+            .filter(
+                and_(
+                    models.ShareObjectItem.itemUri.in_(item_uris),
+                    models.ShareObject.status == 'Approved',
+                )
             )
+            .all()
+        )
+        consumers = {}
+        for item_uri, share_object, environment in rows:
+            consumers.setdefault(item_uri, []).append((share_object, environment))
+        return consumers
 
     @staticmethod
     def store_dataquality_results(session, message):
@@ -203,72 +254,62 @@ class SubscriptionService:
 
     @staticmethod
     def publish_sns_message(
-        engine, message, dataset, share_items, prefix, table: models.DatasetTable = None
+        engine,
+        session,
+        message,
+        dataset,
+        consumers,
+        prefix,
+        table=None,
     ):
-        with engine.scoped_session() as session:
-            for item in share_items:
-
-                share_object = SubscriptionService.get_approved_share_object(
-                    session, item
+        for share_object, environment in consumers:
+            if not share_object.principalId:
+                log.error(
+                    f'Share object with no principalId ? {share_object.shareUri}'
                 )
+            elif not environment:
+                log.error(
+                    f'Environment of share owner was deleted ? {share_object.principalId}'
+                )
+            else:
+                log.info(f'Notifying share owner {share_object.owner}')
 
-                if not share_object or not share_object.principalId:
-                    log.error(
-                        f'Share Item with no share object or no principalId ? {item.shareItemUri}'
-                    )
-                else:
-                    environment = session.query(models.Environment).get(
-                        share_object.principalId
-                    )
-                    if not environment:
-                        log.error(
-                            f'Environment of share owner was deleted ? {share_object.principalId}'
-                        )
-                    else:
-                        log.info(f'Notifying share owner {share_object.owner}')
-
-                        log.info(
-                            f'found environment {environment.environmentUri}|{environment.AwsAccountId} of share owner {share_object.owner}'
-                        )
+                log.info(
+                    f'found environment {environment.environmentUri}|{environment.AwsAccountId} of share owner {share_object.owner}'
+                )
 
-                        try:
+                try:
 
-                            if table:
-                                message['table'] = table.GlueTableName
+                    if table:
+                        message['table'] = table.GlueTableName
 
-                            log.info(
-                                f'Producer message before notifications: {message}'
-                            )
+                        log.info(f'Producer message before notifications: {message}')
 
-                            SubscriptionService.redshift_copy(
-                                engine, message, dataset, environment, table
-                            )
+                        SubscriptionService.redshift_copy(
+                            engine, message, dataset, environment, table
+                        )
 
-                            message = {
-                                'location': prefix,
-                                'owner': dataset.owner,
-                                'message': f'Dataset owner {dataset.owner} '
-                                f'has updated the table shared with you {prefix}',
-                            }
+                    sns_message = {
+                        'location': prefix,
+                        'owner': dataset.owner,
+                        'message': f'Dataset owner {dataset.owner} '
+                        f'has updated the table shared with you {prefix}',
+                    }
 
-                            response = SubscriptionService.sns_call(
-                                message, environment
-                            )
+                    response = SubscriptionService.sns_call(sns_message, environment)
 
-                            log.info(f'SNS update publish response {response}')
+                    log.info(f'SNS update publish response {response}')
 
-                            notifications = db.api.Notification.notify_new_data_available_from_owners(
-                                session=session,
-                                dataset=dataset,
-                                share=share_object,
-                                s3_prefix=prefix,
-                            )
-                            log.info(f'Notifications for share owners {notifications}')
+                    notifications = db.api.Notification.notify_new_data_available_from_owners(
+                        session=session,
+                        dataset=dataset,
+                        share=share_object,
+                        s3_prefix=prefix,
+                    )
+                    log.info(f'Notifications for share owners {notifications}')
 
-                        except ClientError as e:
-                            log.error(
-                                f'Failed to deliver message {message} due to: {e}'
-                            )
+                except ClientError as e:
+                    log.error(f'Failed to deliver message {message} due to: {e}')
 
     @staticmethod
     def sns_call(message, environment):
@@ -309,20 +350,6 @@ class SubscriptionService:
         response = Worker.queue(engine, [task.taskUri])
         return response
 
-    @staticmethod
-    def get_approved_share_object(session, item):
-        share_object: models.ShareObject = (
-            session.query(models.ShareObject)
-            .filter(
-                and_(
-                    models.ShareObject.shareUri == item.shareUri,
-                    models.ShareObject.status == 'Approved',
-                )
-            )
-            .first()
-        )
-        return share_object
-
 
 if __name__ == '__main__':
     ENVNAME = os.environ.get('envname', 'local')
@@ -332,5 +359,6 @@ if __name__ == '__main__':
     service = SubscriptionService()
     queues = service.get_queues(service.get_environments(ENGINE))
     messages = poll_queues(queues)
-    service.notify_consumers(ENGINE, messages)
+    with SqsQueue.buffer():
+        service.notify_consumers(ENGINE, messages)
     log.info('Datasets updates shared successfully')
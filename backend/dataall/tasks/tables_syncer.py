@@ -1,12 +1,14 @@
 import logging
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from operator import and_
 
 from .. import db
 from ..aws.handlers.glue import Glue
 from ..aws.handlers.sts import SessionHelper
-from ..db import get_engine
+from ..db import get_engine, exceptions
 from ..db import models
 from ..searchproxy import indexers
 from ..searchproxy.connect import (
@@ -20,19 +22,62 @@ if not root.hasHandlers():
     root.addHandler(logging.StreamHandler(sys.stdout))
 log = logging.getLogger(__name__)
 
+DEFAULT_MAX_WORKERS = 8
+
+
+def sync_tables(engine, es=None, max_workers=None):
+    """
+    Synchronizes the tables of all active datasets with their Glue databases.
+    AWS calls run on a pool of workers, one per account and region at a time,
+    sharing the pivot role session of the account. Database writes stay on
+    the calling thread, each dataset in its own transaction.
+    """
+    max_workers = int(
+        max_workers or os.getenv('TABLES_SYNCER_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+    )
+    started = time.monotonic()
+    processed_tables = []
+    report = []
+
+    jobs = list_sync_jobs(engine)
+    log.info(
+        f'Found {sum(len(j) for j in jobs.values())} datasets for tables sync '
+        f'in {len(jobs)} accounts/regions, running {max_workers} workers'
+    )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(sync_account_tables, account, region, datasets)
+            for (account, region), datasets in jobs.items()
+        ]
+        for future in as_completed(futures):
+            for result in future.result():
+                processed_tables.extend(save_dataset_tables(engine, es, result))
+                report.append(result)
+
+    failed = [r for r in report if r['error']]
+    for result in failed:
+        log.error(
+            f'Failed to sync tables for dataset '
+            f'{result["AwsAccountId"]}/{result["GlueDatabaseName"]} '
+            f'due to: {result["error"]}'
+        )
+    log.info(
+        f'Synchronized {len(report) - len(failed)}/{len(report)} datasets and '
+        f'{len(processed_tables)} tables in {time.monotonic() - started:.1f}s'
+    )
+    return processed_tables
 
-def sync_tables(engine, es=None):
+
+def list_sync_jobs(engine) -> dict:
+    """Groups the datasets to synchronize by AWS account and region"""
+    jobs = {}
     with engine.scoped_session() as session:
-        processed_tables = []
         all_datasets: [models.Dataset] = db.api.Dataset.list_all_active_datasets(
             session
         )
-        log.info(f'Found {len(all_datasets)} datasets for tables sync')
         dataset: models.Dataset
         for dataset in all_datasets:
-            log.info(
-                f'Synchronizing dataset {dataset.name}|{dataset.datasetUri} tables'
-            )
             env: models.Environment = (
                 session.query(models.Environment)
                 .filter(
@@ -43,70 +88,114 @@ def sync_tables(engine, es=None):
                 )
                 .first()
             )
-            env_group: models.EnvironmentGroup = (
-                db.api.Environment.get_environment_group(
-                    session, dataset.SamlAdminGroupName, env.environmentUri
+            if not env:
+                log.info(
+                    f'Dataset {dataset.GlueDatabaseName} has an invalid environment'
                 )
-            )
+                continue
             try:
-                if not env or not is_assumable_pivot_role(env):
-                    log.info(
-                        f'Dataset {dataset.GlueDatabaseName} has an invalid environment'
-                    )
-                else:
-
-                    tables = Glue.list_glue_database_tables(
-                        dataset.AwsAccountId, dataset.GlueDatabaseName, dataset.region
-                    )
-
-                    log.info(
-                        f'Found {len(tables)} tables on Glue database {dataset.GlueDatabaseName}'
-                    )
-
-                    db.api.DatasetTable.sync(
-                        session, dataset.datasetUri, glue_tables=tables
-                    )
-
-                    tables = (
-                        session.query(models.DatasetTable)
-                        .filter(models.DatasetTable.datasetUri == dataset.datasetUri)
-                        .all()
+                env_group: models.EnvironmentGroup = (
+                    db.api.Environment.get_environment_group(
+                        session, dataset.SamlAdminGroupName, env.environmentUri
                     )
-
-                    log.info('Updating tables permissions on Lake Formation...')
-
-                    for table in tables:
-                        Glue.grant_principals_all_table_permissions(
-                            table,
-                            principals=[
-                                SessionHelper.get_delegation_role_arn(env.AwsAccountId),
-                                env.EnvironmentDefaultIAMRoleArn,
-                                env_group.environmentIAMRoleArn,
-                            ],
-                        )
-
-                    processed_tables.extend(tables)
-
-                    if es:
-                        indexers.upsert_dataset_tables(session, es, dataset.datasetUri)
-            except Exception as e:
-                log.error(
-                    f'Failed to sync tables for dataset '
-                    f'{dataset.AwsAccountId}/{dataset.GlueDatabaseName} '
-                    f'due to: {e}'
                 )
+            except exceptions.ObjectNotFound as e:
+                log.error(f'Dataset {dataset.GlueDatabaseName} can not be synced: {e}')
                 AlarmService().trigger_dataset_sync_failure_alarm(dataset, str(e))
-        return processed_tables
+                continue
+            jobs.setdefault((dataset.AwsAccountId, dataset.region), []).append(
+                {
+                    'datasetUri': dataset.datasetUri,
+                    'AwsAccountId': dataset.AwsAccountId,
+                    'region': dataset.region,
+                    'GlueDatabaseName': dataset.GlueDatabaseName,
+                    'principals': [
+                        SessionHelper.get_delegation_role_arn(env.AwsAccountId),
+                        env.EnvironmentDefaultIAMRoleArn,
+                        env_group.environmentIAMRoleArn,
+                    ],
+                }
+            )
+    return jobs
+
+
+def sync_account_tables(account, region, datasets: [dict]) -> [dict]:
+    """
+    Lists the Glue tables of the datasets of one account and region and
+    grants the dataset principals all permissions on them, without touching
+    the database so that it can run on a worker thread
+    """
+    results = [
+        {**dataset, 'tables': [], 'error': None, 'duration': 0.0}
+        for dataset in datasets
+    ]
+    try:
+        aws_session = SessionHelper.remote_session(accountid=account)
+        if not aws_session:
+            raise Exception(
+                f'Failed to assume dataall pivot role in environment {account}'
+            )
+        glue = aws_session.client('glue', region_name=region)
+        lakeformation = aws_session.client('lakeformation', region_name=region)
+    except Exception as e:
+        for result in results:
+            result['error'] = str(e)
+        return results
+
+    for result in results:
+        started = time.monotonic()
+        try:
+            result['tables'] = Glue.list_glue_database_tables(
+                account, result['GlueDatabaseName'], region, client=glue
+            )
+            log.info(
+                f'Found {len(result["tables"])} tables on Glue database {result["GlueDatabaseName"]}'
+            )
+            if result['tables']:
+                Glue.batch_grant_principals_all_tables_permissions(
+                    account,
+                    result['GlueDatabaseName'],
+                    [t['Name'] for t in result['tables']],
+                    [p for p in result['principals'] if p],
+                    client=lakeformation,
+                )
+        except Exception as e:
+            result['error'] = str(e)
+        result['duration'] = time.monotonic() - started
+    return results
 
 
-def is_assumable_pivot_role(env: models.Environment):
-    aws_session = SessionHelper.remote_session(accountid=env.AwsAccountId)
-    if not aws_session:
-        log.error(
-            f'Failed to assume dataall pivot role in environment {env.AwsAccountId}'
-        )
-        return False
-    return True
+def save_dataset_tables(engine, es, result: dict) -> [models.DatasetTable]:
+    """Stores the Glue tables listed for a dataset in its own transaction"""
+    started = time.monotonic()
+    tables = []
+    with engine.scoped_session() as session:
+        dataset = session.query(models.Dataset).get(result['datasetUri'])
+        try:
+            if result['error']:
+                raise Exception(result['error'])
+
+            db.api.DatasetTable.sync(
+                session, result['datasetUri'], glue_tables=result['tables']
+            )
+            tables = (
+                session.query(models.DatasetTable)
+                .filter(models.DatasetTable.datasetUri == result['datasetUri'])
+                .all()
+            )
+            if es:
+                indexers.upsert_dataset_tables(session, es, result['datasetUri'])
+        except Exception as e:
+            session.rollback()
+            result['error'] = str(e)
+            AlarmService().trigger_dataset_sync_failure_alarm(dataset, str(e))
+    result['duration'] += time.monotonic() - started
+    log.info(
+        f'Dataset {result["GlueDatabaseName"]}|{result["datasetUri"]}: '
+        f'{len(tables)} tables synchronized in {result["duration"]:.2f}s'
+        + (f' with error: {result["error"]}' if result['error'] else '')
+    )
+    return tables
 
 
 if __name__ == '__main__':
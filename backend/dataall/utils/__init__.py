@@ -1,3 +1,4 @@
 from .parameter import Parameter
 from .secrets_manager import Secrets
 from .slugify import slugify
+from .ttl_cache import TTLCache
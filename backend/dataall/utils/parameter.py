@@ -1,20 +1,37 @@
 import json
 import logging
 import os
+import threading
 
 import boto3
 from botocore.exceptions import ClientError
 
+from .ttl_cache import TTLCache
+
 log = logging.getLogger('utils:Parameter')
 
 
 class Parameter:
+    """
+    Reads the /dataall/{env}/ parameters of SSM Parameter Store. The first read
+    of an environment loads its whole tree with GetParametersByPath, later reads
+    are served from memory for PARAMETER_CACHE_TTL seconds (default 300).
+    """
+
     prefix = 'dataall'
+    _client = None
+    _lock = threading.RLock()
+    _cache = TTLCache(ttl=int(os.getenv('PARAMETER_CACHE_TTL', '300')))
 
     @classmethod
     def ssm(cls):
-        client = boto3.client('ssm', region_name=os.getenv('AWS_REGION', 'eu-west-1'))
-        return client
+        if cls._client is None:
+            with cls._lock:
+                if cls._client is None:
+                    cls._client = boto3.client(
+                        'ssm', region_name=os.getenv('AWS_REGION', 'eu-west-1')
+                    )
+        return cls._client
 
     @classmethod
     def get_parameter_name(cls, env, path=''):
@@ -34,10 +51,50 @@ class Parameter:
             Type='String',
             Overwrite=True,
         )
-        return Parameter.get_parameter(env, path)
+        cls.invalidate(env)
+        return Parameter.get_parameter_value(env, path)
 
     @classmethod
     def get_parameter(cls, env, path=''):
+        pname = cls.get_parameter_name(env, path)
+        parameters = cls.get_cached_parameters(env)
+        if pname in parameters:
+            return parameters[pname]
+        return cls.get_parameter_value(env, path)
+
+    @classmethod
+    def get_cached_parameters(cls, env) -> dict:
+        """Returns the values of the environment parameters by name"""
+        parameters = cls._cache.get(env)
+        if parameters is None:
+            with cls._lock:
+                parameters = cls._cache.get(env)
+                if parameters is None:
+                    parameters = cls._cache.put(env, cls._load_parameters(env))
+        return parameters
+
+    @classmethod
+    def _load_parameters(cls, env) -> dict:
+        pname = cls.get_parameter_name(env)
+        try:
+            parameters = {}
+            paginator = cls.ssm().get_paginator('get_parameters_by_path')
+            for page in paginator.paginate(Path=pname, Recursive=True):
+                for p in page['Parameters']:
+                    parameters[p['Name']] = p['Value']
+            log.info(f'Loaded {len(parameters)} parameters under {pname}')
+            return parameters
+        except ClientError as e:
+            log.warning(f'Failed to load parameters under {pname}: {e}')
+            return {}
+
+    @classmethod
+    def invalidate(cls, env=None):
+        cls._cache.invalidate(env)
+
+    @classmethod
+    def get_parameter_value(cls, env, path=''):
+        """Reads the parameter from SSM, bypassing the cache"""
         pname = cls.get_parameter_name(env, path)
         ssm = cls.ssm()
         try:
@@ -61,6 +118,7 @@ class Parameter:
         for p in params[env]:
             pname = Parameter.get_parameter_name(env=env, path=p['Name'])
             cls.ssm().delete_parameter(Name=pname)
+        cls.invalidate(env)
 
     @classmethod
     def get_parameters(cls, env, prefix=None):
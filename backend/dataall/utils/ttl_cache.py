@@ -0,0 +1,61 @@
+import threading
+import time
+
+
+class TTLCache:
+    """Thread safe in-memory cache whose entries expire after ttl seconds"""
+
+    def __init__(self, ttl: float, maxsize: int = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def put(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return value
+        with self._lock:
+            if self.maxsize and len(self._entries) >= self.maxsize:
+                self._evict()
+            self._entries[key] = (time.monotonic() + ttl, value)
+        return value
+
+    def get_or_load(self, key, loader, ttl: float = None):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, loader(), ttl)
+        return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __contains__(self, key):
+        missing = object()
+        return self.get(key, missing) is not missing
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self):
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._entries.items() if expires < now]:
+            del self._entries[key]
+        while len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
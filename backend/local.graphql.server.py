@@ -72,14 +72,13 @@ def request_context(headers, mock=False):
             logger.error(str(e))
             raise e
 
-    for group in groups:
-        with engine.scoped_session() as session:
-            api.TenantPolicy.attach_group_tenant_policy(
-                session=session,
-                group=group,
-                permissions=db.permissions.TENANT_ALL,
-                tenant_name='dataall',
-            )
+    with engine.scoped_session() as session:
+        api.TenantPolicy.provision_groups(
+            session=session,
+            groups=groups,
+            permissions=db.permissions.TENANT_ALL,
+            tenant_name='dataall',
+        )
     context = Context(
         engine=engine,
         es=es,
@@ -25,6 +25,15 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # The pg_trgm search indexes are created by the trigram_search_indexes
+    # migration only when the extension is available. They are not declared
+    # on the models, so autogenerate must not propose to drop them.
+    if type_ == 'index' and reflected and name.endswith('_trgm'):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -45,6 +54,7 @@ def run_migrations_offline():
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         version_table_schema=ENVNAME,
         literal_binds=True,
     )
@@ -62,7 +72,11 @@ def run_migrations_online():
     """
 
     with get_engine(ENVNAME).engine.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
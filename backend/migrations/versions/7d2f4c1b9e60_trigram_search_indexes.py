@@ -0,0 +1,73 @@
+"""trigram_search_indexes
+
+Revision ID: 7d2f4c1b9e60
+Revises: 3a6c2d8e5b17
+Create Date: 2026-10-18 16:02:11.402913
+
+"""
+import logging
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision = '7d2f4c1b9e60'
+down_revision = '3a6c2d8e5b17'
+branch_labels = None
+depends_on = None
+
+log = logging.getLogger(__name__)
+
+# Columns searched with ILIKE '%term%' by the list APIs (see dataall.db.search)
+SEARCH_COLUMNS = {
+    'dataset': ['label', 'description'],
+    'dataset_table': ['label', 'description'],
+    'dataset_table_column': ['label', 'description'],
+    'glossary_node': ['label', 'readme'],
+    'permission': ['name', 'description'],
+    'share_object_item': ['itemName'],
+}
+
+
+def index_name(table, column):
+    return f'ix_{table}_{column}_trgm'.lower()
+
+
+def has_pg_trgm(bind):
+    return bool(
+        bind.execute(
+            text(
+                "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+            )
+        ).scalar()
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not has_pg_trgm(bind):
+        log.warning('pg_trgm is not available, skipping trigram search indexes')
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Built concurrently to avoid locking writes on the large item/column tables
+    with op.get_context().autocommit_block():
+        for table, columns in SEARCH_COLUMNS.items():
+            for column in columns:
+                op.create_index(
+                    index_name(table, column),
+                    table,
+                    [column],
+                    unique=False,
+                    postgresql_using='gin',
+                    postgresql_ops={column: 'gin_trgm_ops'},
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            op.execute(f'DROP INDEX IF EXISTS {index_name(table, column)}')
@@ -0,0 +1,49 @@
+"""hot_join_indexes
+
+Revision ID: a41e6c3f8d27
+Revises: 7d2f4c1b9e60
+Create Date: 2026-10-18 17:12:40.118254
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41e6c3f8d27'
+down_revision = '7d2f4c1b9e60'
+branch_labels = None
+depends_on = None
+
+# resource_policy_permission.sid is the leading column of its primary key
+# and is already served by the primary key index.
+INDEXES = [
+    ('ix_share_object_item_shareUri_status', 'share_object_item', ['shareUri', 'status']),
+    ('ix_share_object_item_itemUri', 'share_object_item', ['itemUri']),
+    ('ix_share_object_datasetUri', 'share_object', ['datasetUri']),
+    ('ix_share_object_environmentUri', 'share_object', ['environmentUri']),
+    ('ix_share_object_principalId', 'share_object', ['principalId']),
+    ('ix_dataset_table_datasetUri', 'dataset_table', ['datasetUri']),
+    ('ix_dataset_table_column_tableUri', 'dataset_table_column', ['tableUri']),
+    ('ix_term_link_nodeUri', 'term_link', ['nodeUri']),
+    ('ix_term_link_targetUri', 'term_link', ['targetUri']),
+    ('ix_notification_username', 'notification', ['username']),
+    ('ix_task_targetUri', 'task', ['targetUri']),
+]
+
+
+def upgrade():
+    # Built concurrently to avoid locking writes on the populated tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -135,7 +135,7 @@ class ContainerStack(pyNestedClass):
             log_group=self.create_log_group(
                 envname, resource_prefix, log_group_name='catalog-indexer'
             ),
-            schedule_expression=Schedule.expression('rate(6 hours)'),
+            schedule_expression=Schedule.expression('rate(15 minutes)'),
             scheduled_task_id=f'{resource_prefix}-{envname}-catalog-indexer-schedule',
             task_id=f'{resource_prefix}-{envname}-catalog-indexer',
             task_role=self.task_role,
@@ -46,6 +46,10 @@ def patch_stack_tasks(module_mocker):
         'dataall.aws.handlers.ecs.Ecs.is_task_running',
         return_value=False,
     )
+    module_mocker.patch(
+        'dataall.aws.handlers.ecs.Ecs.get_stack_task',
+        return_value=None,
+    )
     module_mocker.patch(
         'dataall.aws.handlers.ecs.Ecs.run_cdkproxy_task',
         return_value='arn:aws:eu-west-1:xxxxxxxx:ecs:task/1222222222',
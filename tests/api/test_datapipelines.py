@@ -156,8 +156,8 @@ def test_nopermissions_pipelines(client, env1, db, org1, user, group, pipeline):
 
 def test_get_pipeline(client, env1, db, org1, user, group, pipeline, module_mocker):
     module_mocker.patch(
-        'dataall.aws.handlers.service_handlers.Worker.process',
-        return_value=[{'response': 'return value'}],
+        'dataall.aws.handlers.service_handlers.Worker.run',
+        return_value='return value',
     )
     module_mocker.patch(
         'dataall.api.Objects.DataPipeline.resolvers._get_creds_from_aws',
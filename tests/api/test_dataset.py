@@ -1,6 +1,7 @@
 import typing
 
 import pytest
+import sqlalchemy
 
 import dataall
 
@@ -538,3 +539,59 @@ def test_stewardship(client, dataset, env1, org1, db, group2, group, user, patch
         },
     )
     assert response.data.createDataset.stewards == group2.name
+
+
+def test_list_datasets_nested_fields_are_batched(client, dataset, env1, org1, db, group):
+    for name in ['batched1', 'batched2', 'batched3']:
+        dataset(org=org1, env=env1, name=name, owner=env1.owner, group=group.name)
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    def list_datasets(page_size):
+        statements.clear()
+        response = client.query(
+            """
+            query ListDatasets($filter:DatasetFilter){
+                listDatasets(filter:$filter){
+                    count
+                    nodes{
+                        datasetUri
+                        userRoleForDataset
+                        environment{
+                            environmentUri
+                        }
+                        organization{
+                            organizationUri
+                        }
+                        statistics{
+                            tables
+                            locations
+                            upvotes
+                        }
+                    }
+                }
+            }
+            """,
+            filter={'page': 1, 'pageSize': page_size},
+            username='alice',
+            groups=[group.name],
+        )
+        return response, len(statements)
+
+    sqlalchemy.event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        single, single_count = list_datasets(1)
+        page, page_count = list_datasets(10)
+    finally:
+        sqlalchemy.event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+    assert len(single.data.listDatasets.nodes) == 1
+    assert len(page.data.listDatasets.nodes) >= 3
+    for node in page.data.listDatasets.nodes:
+        assert node.environment.environmentUri == env1.environmentUri
+        assert node.organization.organizationUri == org1.organizationUri
+        assert node.statistics.upvotes == 0
+    assert page_count == single_count
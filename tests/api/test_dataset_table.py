@@ -1,6 +1,7 @@
 import typing
 
 import pytest
+import sqlalchemy
 
 import dataall
 
@@ -330,6 +331,70 @@ def test_sync_tables_and_columns(client, table, dataset1, db):
         assert deleted_table.LastGlueTableStatus == 'Deleted'
 
 
+def test_sync_tables_diff(dataset1, db):
+    def glue_table(columns):
+        return {
+            'Name': 'diff_table',
+            'DatabaseName': dataset1.GlueDatabaseName,
+            'StorageDescriptor': {
+                'Columns': [{'Name': n, 'Type': t} for n, t in columns],
+                'Location': f's3://{dataset1.S3BucketName}/diff_table',
+            },
+            'PartitionKeys': [],
+        }
+
+    def table_columns(session):
+        return {
+            c.name: c
+            for c in session.query(dataall.db.models.DatasetTableColumn)
+            .join(
+                dataall.db.models.DatasetTable,
+                dataall.db.models.DatasetTable.tableUri
+                == dataall.db.models.DatasetTableColumn.tableUri,
+            )
+            .filter(dataall.db.models.DatasetTable.name == 'diff_table')
+        }
+
+    with db.scoped_session() as session:
+        dataall.db.api.DatasetTable.sync(
+            session,
+            dataset1.datasetUri,
+            [glue_table([('a', 'string'), ('b', 'int')])],
+        )
+        before = {n: c.columnUri for n, c in table_columns(session).items()}
+        assert set(before) == {'a', 'b'}
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with db.scoped_session() as session:
+        sqlalchemy.event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            dataall.db.api.DatasetTable.sync(
+                session,
+                dataset1.datasetUri,
+                [glue_table([('a', 'string'), ('b', 'int')])],
+            )
+        finally:
+            sqlalchemy.event.remove(db.engine, 'before_cursor_execute', count)
+        assert not [
+            s for s in statements if s.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))
+        ]
+
+    with db.scoped_session() as session:
+        dataall.db.api.DatasetTable.sync(
+            session,
+            dataset1.datasetUri,
+            [glue_table([('a', 'bigint'), ('c', 'string')])],
+        )
+        after = table_columns(session)
+        assert set(after) == {'a', 'c'}
+        assert after['a'].columnUri == before['a']
+        assert after['a'].typeName == 'bigint'
+
+
 def test_delete_table(client, table, dataset1, db, group):
     table_to_delete = table(
         dataset=dataset1, name=f'table_to_update', username=dataset1.owner
@@ -1,4 +1,5 @@
 from typing import List
+import dataall
 from dataall.db import models
 import pytest
 
@@ -245,6 +246,47 @@ def test_hierarchical_search(client):
     assert response.data.searchGlossary.count == 4
 
 
+def test_hierarchical_search_by_cursor(client):
+    query = """
+        query SearchGlossaryHierarchy($filter:TermFilter){
+            searchGlossaryHierarchy(filter:$filter){
+                count
+                hasNext
+                nextCursor
+                nodes{
+                    __typename
+                    ...on Glossary{
+                        nodeUri
+                        path
+                    }
+                    ...on Category{
+                        nodeUri
+                        path
+                    }
+                    ...on Term{
+                        nodeUri
+                        path
+                    }
+                }
+            }
+        }
+        """
+    paths = []
+    cursor = ''
+    while cursor is not None:
+        response = client.query(query, filter={'pageSize': 3, 'cursor': cursor})
+        result = response.data.searchGlossaryHierarchy
+        assert result.count == 4
+        paths.extend(node.path for node in result.nodes)
+        cursor = result.nextCursor
+        assert result.hasNext == (cursor is not None)
+    assert len(paths) == 4
+    assert paths == sorted(paths)
+
+    response = client.query(query, filter={'pageSize': 3, 'cursor': 'invalid'})
+    assert 'cursor is invalid' in str(response.errors[0].message)
+
+
 def test_get_glossary(client, g1):
     r = client.query(
         """
@@ -577,6 +619,25 @@ def test_get_term_associations(t1, client):
     print(r)
 
 
+def test_term_associations_filter(db, t1):
+    with db.scoped_session() as session:
+        term = session.query(models.GlossaryNode).get(t1.nodeUri)
+
+        def count(search):
+            return dataall.db.api.Glossary.list_term_associations(
+                session,
+                username='alice',
+                groups=[],
+                uri=None,
+                data={'source': term, 'filter': {'term': search}},
+            )['count']
+
+        assert count('column') == count(None) > 0
+        # A substring of a target type name does not disable the filter
+        assert count('a-term-matching-nothing') == 0
+        assert count('umn') == 0
+
+
 def test_delete_category(client, c1, group):
     r = client.query(
         """
@@ -70,6 +70,10 @@ def patch_aws(module_mocker):
         'dataall.aws.handlers.sagemaker.Sagemaker.get_notebook_instance_status',
         return_value='INSERVICE',
     )
+    module_mocker.patch(
+        'dataall.aws.handlers.live_status.NotebookStatuses.list_statuses',
+        return_value={},
+    )
 
 
 def test_list_notebooks(client, env1, db, org1, user, group, sgm_notebook, patch_aws):
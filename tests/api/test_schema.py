@@ -0,0 +1,67 @@
+import logging
+import timeit
+
+from dataall.api import gql
+from dataall.api.Objects import (
+    bootstrap,
+    get_executable_schema,
+    load_type_defs,
+    save,
+)
+from dataall.searchproxy import LazyConnection
+
+log = logging.getLogger(__name__)
+
+
+def test_executable_schema_from_saved_type_defs(tmp_path):
+    path = str(tmp_path / 'schema.graphql')
+    assert load_type_defs(path) is None
+
+    save(path, with_directives=False)
+    schema = bootstrap()
+    type_defs = load_type_defs(path)
+    assert type_defs == schema.gql(with_directives=False)
+
+    executable_schema = get_executable_schema(schema=schema, type_defs=type_defs)
+    rendered = get_executable_schema(schema=schema)
+    assert set(executable_schema.query_type.fields) == set(rendered.query_type.fields)
+    assert executable_schema.query_type.fields['up'].resolve is not None
+
+
+def test_lazy_connection_does_not_connect_until_used():
+    es = LazyConnection(envname='pytest')
+    assert 'connected=False' in repr(es)
+
+
+def test_schema_registry():
+    schema = gql.Schema(
+        types=[gql.ObjectType(name='Post', fields=[gql.Field(name='id', type=gql.String)])]
+    )
+    assert [t.name for t in schema.types] == ['Post', 'Query', 'Mutation']
+    assert schema.type('Post').name == 'Post'
+    assert schema.type('Comment') is None
+
+    sdl = schema.gql()
+    assert schema.gql() is sdl
+
+    schema.add_type(
+        gql.ObjectType(name='Comment', fields=[gql.Field(name='id', type=gql.String)])
+    )
+    assert 'type Comment' in schema.gql()
+    schema.remove_type('Comment')
+    assert schema.gql() == sdl
+
+
+def test_bootstrap_benchmark():
+    runs = 5
+    bootstrap_time = timeit.timeit(bootstrap, number=runs) / runs
+    schema = bootstrap()
+    render_time = timeit.timeit(
+        lambda: schema.gql(with_directives=False), number=runs
+    ) / runs
+    log.info(
+        f'bootstrap: {bootstrap_time * 1000:.1f}ms, '
+        f'gql (memoized): {render_time * 1000:.3f}ms, '
+        f'{len(list(schema.named_types()))} types'
+    )
+    assert schema.type('Query').field('up') is not None
@@ -1222,6 +1222,50 @@ def test_search_shared_items_in_environment(
                0].principalId == group2.name
 
 
+def test_search_shared_items_in_environment_by_cursor(
+        client, user2, group2, share3_processed, share3_item_shared, env2,
+):
+    q = """
+        query searchEnvironmentDataItems(
+            $environmentUri:String!, $filter:EnvironmentDataItemFilter
+        ){
+            searchEnvironmentDataItems(environmentUri:$environmentUri, filter:$filter){
+                count
+                hasNext
+                nextCursor
+                nodes{
+                    shareUri
+                    principalId
+                }
+            }
+        }
+    """
+    for filter in [{'cursor': ''}, {'cursor': '', 'uniqueShares': True}]:
+        response = client.query(
+            q,
+            username=user2.userName,
+            groups=[group2.name],
+            environmentUri=env2.environmentUri,
+            filter=filter,
+        )
+        result = response.data.searchEnvironmentDataItems
+        assert result.count == 1
+        assert not result.hasNext
+        assert result.nextCursor is None
+        assert result.nodes[0].shareUri == share3_processed.shareUri
+
+    response = get_share_object(
+        client=client,
+        user=user2,
+        group=group2,
+        shareUri=share3_processed.shareUri,
+        filter={'cursor': '', 'pageSize': 1, 'isShared': True},
+    )
+    items = response.data.getShareObject.get('items')
+    assert items.count == 1
+    assert len(items.nodes) == 1
+
+
 def test_revoke_items_share_request(
         db, client, user2, group2, share3_processed, share3_item_shared
 ):
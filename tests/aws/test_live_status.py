@@ -0,0 +1,50 @@
+import time
+
+from dataall.aws.handlers.live_status import LiveStatus
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_groups_are_listed_once(mocker):
+    list_statuses = mocker.MagicMock(
+        side_effect=lambda account, region: {f'{account}-{region}': 'InService'}
+    )
+    statuses = LiveStatus('test', list_statuses, ttl=60, stale_ttl=120)
+    groups = {('111', 'eu-west-1'), ('222', 'eu-west-1')}
+
+    assert statuses.get(('111', 'eu-west-1'), siblings=groups) == {
+        '111-eu-west-1': 'InService'
+    }
+    assert statuses.get(('222', 'eu-west-1'), siblings=groups) == {
+        '222-eu-west-1': 'InService'
+    }
+    assert list_statuses.call_count == 2
+
+
+def test_stale_statuses_are_served_while_refreshed(mocker):
+    list_statuses = mocker.MagicMock(
+        side_effect=lambda account, region: {
+            'a': 'Pending' if list_statuses.call_count == 1 else 'InService'
+        }
+    )
+    statuses = LiveStatus('test', list_statuses, ttl=60, stale_ttl=120)
+    assert statuses.get(('111', 'eu-west-1')) == {'a': 'Pending'}
+
+    statuses.ttl = 0
+    assert statuses.get(('111', 'eu-west-1')) == {'a': 'Pending'}
+    assert wait_for(lambda: list_statuses.call_count >= 2)
+    statuses.ttl = 60
+    assert wait_for(lambda: statuses.get(('111', 'eu-west-1')) == {'a': 'InService'})
+
+
+def test_failed_listings_are_not_cached(mocker):
+    list_statuses = mocker.MagicMock(side_effect=[Exception('denied'), {'a': 'InService'}])
+    statuses = LiveStatus('test', list_statuses, ttl=60, stale_ttl=120)
+
+    assert statuses.get(('111', 'eu-west-1')) is None
+    assert statuses.get(('111', 'eu-west-1')) == {'a': 'InService'}
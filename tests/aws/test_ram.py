@@ -0,0 +1,25 @@
+from dataall.aws.handlers.ram import Ram
+
+
+def invitation(status):
+    return {'resourceShareInvitationArn': 'arn:invitation', 'status': status}
+
+
+def test_wait_for_accepted_invitations(mocker):
+    sleep = mocker.patch('dataall.aws.handlers.ram.time.sleep')
+    mocker.patch.object(
+        Ram,
+        'get_resource_share_invitations',
+        side_effect=[[invitation('PENDING')], [invitation('PENDING')], [invitation('ACCEPTED')]],
+    )
+    assert Ram.wait_for_accepted_invitations(None, ['arn:share'], ['arn:invitation'], '1', '2')
+    assert [c[0][0] for c in sleep.call_args_list] == [0.5, 1, 2]
+
+
+def test_wait_for_accepted_invitations_timeout(mocker):
+    mocker.patch('dataall.aws.handlers.ram.INVITATION_POLL_TIMEOUT', 3)
+    mocker.patch('dataall.aws.handlers.ram.time.sleep')
+    mocker.patch.object(
+        Ram, 'get_resource_share_invitations', return_value=[invitation('PENDING')]
+    )
+    assert not Ram.wait_for_accepted_invitations(None, ['arn:share'], ['arn:invitation'], '1', '2')
@@ -0,0 +1,98 @@
+import datetime
+
+import pytest
+from botocore.exceptions import ClientError
+from dateutil.tz import tzutc
+
+from dataall.aws.handlers.sts import SessionHelper
+
+ROLE_ARN = 'arn:aws:iam::111111111111:role/dataallPivotRole'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    SessionHelper.clear_cache()
+    yield
+    SessionHelper.clear_cache()
+
+
+def assume_role_response(expires_in):
+    return {
+        'Credentials': {
+            'AccessKeyId': 'access_key',
+            'SecretAccessKey': 'secret_key',
+            'SessionToken': 'token',
+            'Expiration': datetime.datetime.now(tzutc()) + expires_in,
+        }
+    }
+
+
+@pytest.fixture
+def sts(mocker):
+    mocker.patch.object(SessionHelper, 'get_external_id_secret', return_value='external')
+    base_session = mocker.MagicMock()
+    base_session.client.return_value.assume_role.return_value = assume_role_response(
+        datetime.timedelta(hours=1)
+    )
+    yield base_session.client.return_value, base_session
+
+
+def test_role_credentials_are_assumed_once(sts):
+    client, base_session = sts
+    first = SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN)
+    second = SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN)
+    assert first.get_credentials() is second.get_credentials()
+    assert first.get_credentials().get_frozen_credentials().access_key == 'access_key'
+    client.assume_role.assert_called_once_with(
+        RoleArn=ROLE_ARN, RoleSessionName='dataallPivotRole', ExternalId='external'
+    )
+
+
+def test_role_credentials_are_refreshed_before_expiry(sts):
+    client, base_session = sts
+    client.assume_role.return_value = assume_role_response(datetime.timedelta(minutes=5))
+    credentials = SessionHelper.get_session(
+        base_session=base_session, role_arn=ROLE_ARN
+    ).get_credentials()
+    client.assume_role.return_value = assume_role_response(datetime.timedelta(hours=1))
+    credentials.get_frozen_credentials()
+    assert client.assume_role.call_count == 2
+
+
+def test_role_is_assumed_with_a_rotated_external_id(sts, mocker):
+    client, base_session = sts
+    get_external_id = mocker.patch.object(
+        SessionHelper, 'get_external_id_secret', side_effect=['old', 'new']
+    )
+    client.assume_role.side_effect = [
+        ClientError({'Error': {'Code': 'AccessDenied'}}, 'AssumeRole'),
+        assume_role_response(datetime.timedelta(hours=1)),
+    ]
+    SessionHelper.get_session(base_session=base_session, role_arn=ROLE_ARN)
+
+    assert get_external_id.call_args_list[1] == mocker.call(refresh=True)
+    assert client.assume_role.call_args[1]['ExternalId'] == 'new'
+
+
+def test_remote_clients_are_cached(sts, mocker):
+    _, base_session = sts
+    mocker.patch.object(
+        SessionHelper,
+        'remote_session',
+        side_effect=lambda accountid, role=None: SessionHelper.get_session(
+            base_session=base_session, role_arn=ROLE_ARN
+        ),
+    )
+    glue = SessionHelper.remote_client('glue', '111111111111', 'eu-west-1')
+    assert SessionHelper.remote_client('glue', '111111111111', 'eu-west-1') is glue
+    assert SessionHelper.remote_client('glue', '111111111111', 'us-east-1') is not glue
+    assert SessionHelper.remote_client('s3', '111111111111', 'eu-west-1') is not glue
+
+
+def test_secrets_are_cached(mocker):
+    session = mocker.patch('dataall.aws.handlers.sts.boto3.Session')
+    get_secret_value = session.return_value.client.return_value.get_secret_value
+    get_secret_value.return_value = {'SecretString': 'dataallPivotRole'}
+    assert SessionHelper.get_delegation_role_name() == 'dataallPivotRole'
+    assert SessionHelper.get_delegation_role_name() == 'dataallPivotRole'
+    get_secret_value.assert_called_once()
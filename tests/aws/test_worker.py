@@ -0,0 +1,114 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from dataall.aws.handlers.service_handlers import Worker
+from dataall.aws.handlers.sqs import SqsQueue
+from dataall.db import models
+
+
+@pytest.fixture(scope='module')
+def handlers():
+    Worker.handlers['test.ok'] = lambda engine, task: {'target': task.targetUri}
+    Worker.handlers['test.fail'] = lambda engine, task: 1 / 0
+    yield
+    Worker.handlers.pop('test.ok')
+    Worker.handlers.pop('test.fail')
+
+
+def create_tasks(db, *actions):
+    with db.scoped_session() as session:
+        tasks = [models.Task(action=action, targetUri=action) for action in actions]
+        session.add_all(tasks)
+        session.commit()
+        return [task.taskUri for task in tasks]
+
+
+def test_process_runs_every_task_of_a_message(db, handlers):
+    task_ids = create_tasks(db, 'test.ok', 'test.fail', 'test.ok')
+    responses = Worker.process(engine=db, task_ids=task_ids)
+    assert [r['taskUri'] for r in responses] == task_ids
+    assert [r['status'] for r in responses] == ['completed', 'failed', 'completed']
+    with db.scoped_session() as session:
+        assert [session.query(models.Task).get(uri).status for uri in task_ids] == [
+            'completed',
+            'failed',
+            'completed',
+        ]
+    # already processed tasks are reported as failed instead of being skipped
+    responses = Worker.process(engine=db, task_ids=task_ids[:1])
+    assert responses[0]['status'] == 'failed'
+
+
+def test_run_does_not_save_tasks(db, handlers):
+    with db.scoped_session() as session:
+        count = session.query(models.Task).count()
+    assert Worker.run(engine=db, action='test.ok', target_uri='pipe') == {
+        'target': 'pipe'
+    }
+    with pytest.raises(ZeroDivisionError):
+        Worker.run(engine=db, action='test.fail', target_uri='pipe')
+    with db.scoped_session() as session:
+        assert session.query(models.Task).count() == count
+
+
+def test_run_caches_responses(db, mocker):
+    handler = mocker.MagicMock(side_effect=lambda engine, task: task.payload['path'])
+    mocker.patch.dict(Worker.handlers, {'test.cached': handler})
+    Worker.responses.invalidate()
+    for path in ['a', 'b', 'a']:
+        assert (
+            Worker.run(db, 'test.cached', 'pipe', {'path': path}, cached=True) == path
+        )
+    assert handler.call_count == 2
+
+
+@pytest.fixture
+def sqs(mocker):
+    mocker.patch(
+        'dataall.aws.handlers.sqs.Parameter.get_parameter', return_value='https://queue'
+    )
+    client = mocker.MagicMock()
+    client.send_message_batch.return_value = {'Successful': [], 'Failed': []}
+    mocker.patch.object(SqsQueue, 'get_sqs_client', return_value=client)
+    yield client
+
+
+def test_send_without_buffer_sends_one_message(sqs):
+    SqsQueue.send(None, ['task1'])
+    sqs.send_message_batch.assert_called_once()
+    entries = sqs.send_message_batch.call_args[1]['Entries']
+    assert [e['MessageBody'] for e in entries] == ['["task1"]']
+
+
+def test_buffered_messages_are_sent_in_batches(sqs):
+    with SqsQueue.buffer():
+        for i in range(12):
+            assert SqsQueue.send(None, [f'task{i}']) is None
+        sqs.send_message_batch.assert_not_called()
+    assert sqs.send_message_batch.call_count == 2
+    sizes = [len(c[1]['Entries']) for c in sqs.send_message_batch.call_args_list]
+    assert sizes == [10, 2]
+
+
+def test_failed_entries_raise(sqs):
+    sqs.send_message_batch.return_value = {
+        'Failed': [{'Id': '1', 'SenderFault': False, 'Code': 'InternalError'}]
+    }
+    with pytest.raises(Exception, match='task1'):
+        SqsQueue.send_batch([['task0'], ['task1']])
+
+
+def test_failed_buffered_messages_fail_their_tasks(db, sqs):
+    task_ids = create_tasks(db, *[f'test.queue{i}' for i in range(12)])
+    sqs.send_message_batch.side_effect = [
+        ClientError({'Error': {'Code': 'Throttling'}}, 'SendMessageBatch'),
+        {'Failed': [{'Id': '1', 'SenderFault': False, 'Code': 'InternalError'}]},
+    ]
+    with SqsQueue.buffer():
+        for task_id in task_ids:
+            SqsQueue.send(db, [task_id])
+
+    assert sqs.send_message_batch.call_count == 2
+    with db.scoped_session() as session:
+        statuses = [session.query(models.Task).get(t).status for t in task_ids]
+    assert statuses == ['failed'] * 10 + ['pending', 'failed']
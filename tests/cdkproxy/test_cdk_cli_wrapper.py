@@ -0,0 +1,96 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from dataall.cdkproxy import cdk_cli_wrapper
+from dataall.cdkproxy.deployment_planner import DeploymentPlanner
+from dataall.db import models
+
+
+@pytest.fixture(scope='module')
+def stacks(db, env, dataset, notebook):
+    with db.scoped_session() as session:
+        stacks = [
+            models.Stack(
+                targetUri=target_uri,
+                accountid=env.AwsAccountId,
+                region=env.region,
+                stack=stack_type,
+                name=f'{stack_type}-stack',
+            )
+            for stack_type, target_uri in [
+                ('dataset', dataset.datasetUri),
+                ('notebook', notebook.notebookUri),
+            ]
+        ]
+        session.add_all(stacks)
+        session.commit()
+        stack_uris = [s.stackUri for s in stacks]
+    yield stack_uris
+
+
+@pytest.fixture(scope='function')
+def cdk(mocker):
+    commands = []
+
+    def run_cdk(args, env, cwd):
+        commands.append(args)
+        if args[0] == 'synth':
+            output = args[args.index('--output') + 1]
+            for name in ['dataset-stack', 'notebook-stack']:
+                with open(os.path.join(output, f'{name}.template.json'), 'w') as f:
+                    f.write(f'{{"Description": "{name}"}}')
+        return SimpleNamespace(returncode=0, stderr=None)
+
+    mocker.patch('dataall.cdkproxy.cdk_cli_wrapper.run_cdk', side_effect=run_cdk)
+    mocker.patch(
+        'dataall.cdkproxy.cdk_cli_wrapper.describe_stack',
+        return_value={'StackId': 'arn', 'StackStatus': 'UPDATE_COMPLETE'},
+    )
+    mocker.patch('dataall.cdkproxy.cdk_cli_wrapper.update_stack_output')
+    yield commands
+
+
+def test_batch_is_synthesized_once_and_deployed_concurrently(db, env, stacks, cdk):
+    cdk_cli_wrapper.deploy_cdk_stack_group(db, {}, env.AwsAccountId, env.region, stacks)
+
+    assert [args[0] for args in cdk] == ['synth', 'deploy']
+    assert 'dataset-stack' in cdk[1] and 'notebook-stack' in cdk[1]
+    assert '--concurrency' in cdk[1]
+    with db.scoped_session() as session:
+        for stack in session.query(models.Stack).filter(models.Stack.stackUri.in_(stacks)):
+            assert stack.status == 'UPDATE_COMPLETE'
+            assert stack.templateHash and stack.fingerprint
+
+
+def test_unchanged_batch_is_not_deployed(db, env, stacks, cdk, tmp_path):
+    for name in ['dataset-stack', 'notebook-stack']:
+        (tmp_path / f'{name}.template.json').write_text(f'{{"Description": "{name}"}}')
+    with db.scoped_session() as session:
+        for stack in session.query(models.Stack).filter(models.Stack.stackUri.in_(stacks)):
+            stack.status = 'UPDATE_COMPLETE'
+            stack.templateHash = DeploymentPlanner.template_hash(str(tmp_path), stack.name)
+            stack.fingerprint = DeploymentPlanner.fingerprint(session, stack)
+
+    cdk_cli_wrapper.deploy_cdk_stack_group(db, {}, env.AwsAccountId, env.region, stacks)
+
+    assert [args[0] for args in cdk] == ['synth']
+
+
+def test_unchanged_batch_marked_running_is_not_deployed(db, env, stacks, cdk, tmp_path, mocker):
+    mocker.patch('dataall.cdkproxy.cdk_cli_wrapper.cdk_environment', return_value={})
+    for name in ['dataset-stack', 'notebook-stack']:
+        (tmp_path / f'{name}.template.json').write_text(f'{{"Description": "{name}"}}')
+    with db.scoped_session() as session:
+        for stack in session.query(models.Stack).filter(models.Stack.stackUri.in_(stacks)):
+            stack.templateHash = DeploymentPlanner.template_hash(str(tmp_path), stack.name)
+            stack.fingerprint = DeploymentPlanner.fingerprint(session, stack)
+            # set by the cdkproxy endpoints before the deployment starts
+            stack.status = 'RUNNING'
+
+    cdk_cli_wrapper.deploy_cdk_stacks(
+        db, stacks, previous_statuses={uri: 'UPDATE_COMPLETE' for uri in stacks}
+    )
+
+    assert [args[0] for args in cdk] == ['synth']
@@ -1,4 +1,6 @@
 import os
+import threading
+
 import dataall
 
 
@@ -18,3 +20,34 @@ def test(db: dataall.db.Engine):
                 assert nb == 0
     else:
         assert True
+
+
+def test_session_per_thread(db: dataall.db.Engine):
+    sessions = {}
+
+    def open_session(name):
+        with db.scoped_session() as session:
+            sessions[name] = session
+            assert db.session() is session
+
+    threads = [threading.Thread(target=open_session, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    open_session('main')
+
+    assert len({id(s) for s in sessions.values()}) == 4
+
+
+def test_pool_config():
+    config = dataall.db.PoolConfig.from_env()
+    assert config.size >= 1
+    assert not config.proxy_mode
+
+
+def test_pool_metrics(db: dataall.db.Engine):
+    with db.scoped_session() as session:
+        session.execute('SELECT 1')
+        assert db.pool_metrics()['checkedOut'] >= 1
+    assert db.pool_metrics()['size'] == db.pool_config.size
@@ -0,0 +1,174 @@
+"""
+Query plans of the hot db.api lookups before and after their indexes.
+
+Each case calls the db.api function itself and explains the SELECT statements
+it emits, so the check follows the queries those functions actually build.
+Postgres DDL is transactional, so the "before" plans are taken after dropping
+the index inside a transaction that is rolled back. Sequential scans are
+disabled so the planner picks an index on these small test tables whenever
+one can serve the filter.
+"""
+import logging
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from dataall.db import models
+from dataall.db.api import (
+    Dataset,
+    DatasetTable,
+    Environment,
+    Glossary,
+    Notification,
+    ShareObject,
+    TaskRefresh,
+)
+
+log = logging.getLogger(__name__)
+
+HOT_QUERIES = [
+    (
+        'ix_share_object_item_shareUri_status',
+        lambda session: ShareObject.check_pending_share_items(session, 'share'),
+    ),
+    (
+        'ix_share_object_item_itemUri',
+        lambda session: DatasetTable.delete_dataset_table(
+            session,
+            'alice',
+            ['group1'],
+            'table',
+            data={'tableUri': 'table'},
+            check_perm=False,
+        ),
+    ),
+    (
+        'ix_share_object_datasetUri',
+        lambda session: Dataset.query_dataset_shares(session, 'dataset').all(),
+    ),
+    (
+        'ix_share_object_environmentUri',
+        lambda session: Environment.paginated_shared_with_environment_datasets(
+            session, 'alice', ['group1'], 'environment', data={}, check_perm=False
+        ),
+    ),
+    (
+        'ix_share_object_principalId',
+        lambda session: Environment.remove_consumption_role(
+            session,
+            'alice',
+            ['group1'],
+            'role',
+            data={'environmentUri': 'environment'},
+            check_perm=False,
+        ),
+    ),
+    (
+        'ix_dataset_table_datasetUri',
+        lambda session: Dataset.get_dataset_tables(session, 'dataset'),
+    ),
+    (
+        'ix_dataset_table_column_tableUri',
+        lambda session: DatasetTable.upsert_tables_columns(
+            session, [(models.DatasetTable(tableUri='table'), {})]
+        ),
+    ),
+    (
+        'ix_term_link_targetUri',
+        lambda session: Glossary.get_glossary_terms_links(
+            session, 'table', 'DatasetTable'
+        ),
+    ),
+    (
+        'ix_notification_username',
+        lambda session: Notification.list_my_notifications(session, 'alice'),
+    ),
+    (
+        'ix_task_targetUri',
+        lambda session: TaskRefresh.request_refresh(
+            session, 'table', 'glue.table.columns'
+        ),
+    ),
+]
+
+
+def add_fixtures(connection):
+    session = Session(bind=connection)
+    session.add_all(
+        [
+            models.ShareObject(
+                shareUri='share',
+                datasetUri='dataset',
+                environmentUri='environment',
+                owner='alice',
+                principalId='group1',
+                groupUri='group1',
+            ),
+            models.DatasetTable(
+                tableUri='table',
+                datasetUri='dataset',
+                label='table',
+                name='table',
+                owner='alice',
+                AWSAccountId='111111111111',
+                S3BucketName='bucket',
+                S3Prefix='table',
+                GlueDatabaseName='database',
+                GlueTableName='table',
+            ),
+            models.ConsumptionRole(
+                consumptionRoleUri='role',
+                consumptionRoleName='role',
+                environmentUri='environment',
+                groupUri='group1',
+                IAMRoleName='role',
+                IAMRoleArn='arn:aws:iam::111111111111:role/role',
+            ),
+        ]
+    )
+    session.flush()
+    session.close()
+
+
+def explain_calls(connection, call):
+    """Explains the SELECT statements emitted by the call, then undoes its writes"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(connection, 'before_cursor_execute', capture)
+    savepoint = connection.begin_nested()
+    session = Session(bind=connection)
+    try:
+        call(session)
+    finally:
+        session.close()
+        savepoint.rollback()
+        event.remove(connection, 'before_cursor_execute', capture)
+
+    cursor = connection.connection.cursor()
+    plans = []
+    for statement, parameters in statements:
+        cursor.execute(f'EXPLAIN {statement}', parameters)
+        plans.append('\n'.join(row[0] for row in cursor.fetchall()))
+    return '\n\n'.join(plans)
+
+
+@pytest.mark.parametrize('index,call', HOT_QUERIES)
+def test_hot_query_uses_index(db, index, call):
+    with db.engine.connect() as connection:
+        with connection.begin() as transaction:
+            connection.execute('SET LOCAL enable_seqscan = off')
+            add_fixtures(connection)
+            after = explain_calls(connection, call)
+
+            connection.execute(f'DROP INDEX "{index}"')
+            before = explain_calls(connection, call)
+            transaction.rollback()
+
+    log.info(f'{index}\nbefore:\n{before}\nafter:\n{after}')
+    assert index in after
+    assert index not in before
@@ -0,0 +1,51 @@
+import pytest
+
+from dataall.db import models
+from dataall.db.paginator import (
+    count_estimate,
+    decode_cursor,
+    encode_cursor,
+    paginate_by_cursor,
+)
+
+
+@pytest.fixture(scope='module')
+def tags(db):
+    with db.scoped_session() as session:
+        session.add_all([models.Tag(tag=f'tag{i:02d}', owner='alice') for i in range(25)])
+        session.commit()
+    yield
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(['a', 1]), 2) == ['a', 1]
+    with pytest.raises(AttributeError):
+        decode_cursor(encode_cursor(['a']), 2)
+    with pytest.raises(AttributeError):
+        decode_cursor('not a cursor', 1)
+
+
+def test_paginate_by_cursor(db, tags, caplog):
+    with db.scoped_session() as session:
+        query = session.query(models.Tag)
+        keys = [models.Tag.tag, models.Tag.id]
+        cursor, names, page = None, [], 1
+        while True:
+            result = paginate_by_cursor(query, keys, 10, cursor=cursor, page=page).to_dict()
+            assert result['count'] == 25
+            assert result['pages'] == 3
+            names.extend(tag.tag for tag in result['nodes'])
+            cursor = result['nextCursor']
+            if not result['hasNext']:
+                break
+            page += 1
+        assert page == 3
+        assert cursor is None
+        assert names == [f'tag{i:02d}' for i in range(25)]
+
+        result = paginate_by_cursor(query, keys, 10, count=None)
+        assert result.total is None and result.pages is None
+        assert result.has_next
+
+        assert count_estimate(query) > 0
+        assert 'Could not estimate' not in caplog.text
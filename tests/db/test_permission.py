@@ -1,8 +1,11 @@
 import pytest
+import sqlalchemy
 
 import dataall
 from dataall.api.constants import OrganisationUserRole
+from dataall.api.dataloader import RequestLoaders
 from dataall.db import exceptions
+from dataall.db.api.permission_evaluator import PermissionCache
 from dataall.db.models.Permission import PermissionType
 
 
@@ -266,3 +269,168 @@ def test_create_dataset(db, env, user, group, group_user, dataset, permissions,
             check_perm=True,
         )
         assert dataset
+
+
+def test_permission_evaluator_answers_from_memory(
+    db, user, group, group_user, dataset, permissions
+):
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    evaluator = dataall.db.api.PermissionEvaluator([group.name])
+    with evaluator.activate(), db.scoped_session() as session:
+        dataall.db.api.ResourcePolicy.preload_user_resource_permissions(
+            session, [group.name], [dataset.datasetUri, 'unknown-uri']
+        )
+        sqlalchemy.event.listen(db.engine, 'before_cursor_execute', count_statement)
+        try:
+            for permission in dataall.db.permissions.DATASET_WRITE:
+                assert dataall.db.api.ResourcePolicy.check_user_resource_permission(
+                    session=session,
+                    username=user.userName,
+                    groups=[group.name],
+                    permission_name=permission,
+                    resource_uri=dataset.datasetUri,
+                )
+            assert not dataall.db.api.ResourcePolicy.has_user_resource_permission(
+                session=session,
+                username=user.userName,
+                groups=[group.name],
+                permission_name=dataall.db.permissions.UPDATE_DATASET,
+                resource_uri='unknown-uri',
+            )
+        finally:
+            sqlalchemy.event.remove(db.engine, 'before_cursor_execute', count_statement)
+    assert not statements
+
+
+def test_request_loaders_preload_permissions_of_siblings(
+    db, user, group, group_user, dataset, permissions
+):
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    loaders = RequestLoaders(db)
+    unknown = dataall.db.models.Dataset(datasetUri='unknown-uri')
+    with db.scoped_session() as session:
+        page = [session.query(dataall.db.models.Dataset).get(dataset.datasetUri), unknown]
+    loaders.collect({'nodes': page})
+
+    evaluator = dataall.db.api.PermissionEvaluator([group.name])
+    with evaluator.activate(), db.scoped_session() as session:
+        sqlalchemy.event.listen(db.engine, 'before_cursor_execute', count_statement)
+        try:
+            loaders.preload_permissions(session, [group.name], page[0], 'datasetUri')
+            assert len(statements) == 1
+            for source in page:
+                dataall.db.api.ResourcePolicy.has_user_resource_permission(
+                    session=session,
+                    username=user.userName,
+                    groups=[group.name],
+                    permission_name=dataall.db.permissions.UPDATE_DATASET,
+                    resource_uri=source.datasetUri,
+                )
+        finally:
+            sqlalchemy.event.remove(db.engine, 'before_cursor_execute', count_statement)
+    assert len(statements) == 1
+
+
+def test_permission_evaluator_invalidated_on_policy_change(
+    db, user, group, group_user, permissions
+):
+    resource_uri = 'evaluator-resource'
+    evaluator = dataall.db.api.PermissionEvaluator([group.name])
+    with evaluator.activate(), db.scoped_session() as session:
+        assert not dataall.db.api.ResourcePolicy.has_user_resource_permission(
+            session=session,
+            username=user.userName,
+            groups=[group.name],
+            permission_name=dataall.db.permissions.UPDATE_DATASET,
+            resource_uri=resource_uri,
+        )
+        dataall.db.api.ResourcePolicy.attach_resource_policy(
+            session=session,
+            group=group.name,
+            permissions=dataall.db.permissions.DATASET_WRITE,
+            resource_uri=resource_uri,
+            resource_type=dataall.db.models.Dataset.__name__,
+        )
+        assert dataall.db.api.ResourcePolicy.has_user_resource_permission(
+            session=session,
+            username=user.userName,
+            groups=[group.name],
+            permission_name=dataall.db.permissions.UPDATE_DATASET,
+            resource_uri=resource_uri,
+        )
+        dataall.db.api.ResourcePolicy.delete_resource_policy(
+            session=session, group=group.name, resource_uri=resource_uri
+        )
+        assert not dataall.db.api.ResourcePolicy.has_user_resource_permission(
+            session=session,
+            username=user.userName,
+            groups=[group.name],
+            permission_name=dataall.db.permissions.UPDATE_DATASET,
+            resource_uri=resource_uri,
+        )
+
+
+def test_permission_cache_ttl():
+    cache = PermissionCache(ttl=60)
+    groups = frozenset(['g1'])
+    cache.put(groups, 'uri', {'READ': 'policy'})
+    assert cache.get(groups, 'uri') == {'READ': 'policy'}
+    assert cache.get(frozenset(['g2']), 'uri') is None
+    cache.invalidate('uri')
+    assert cache.get(groups, 'uri') is None
+
+    cache.ttl = 0
+    cache.put(groups, 'uri', {'READ': 'policy'})
+    assert cache.get(groups, 'uri') is None
+
+
+def test_provision_groups(db, group, permissions, tenant):
+    groups = [group.name, 'provisioned1', 'provisioned2']
+    with db.scoped_session() as session:
+        dataall.db.api.TenantPolicy.attach_group_tenant_policy(
+            session=session,
+            group=group.name,
+            permissions=dataall.db.permissions.TENANT_ALL,
+            tenant_name='dataall',
+        )
+        provisioned = dataall.db.api.TenantPolicy.provision_groups(
+            session=session,
+            groups=groups,
+            permissions=dataall.db.permissions.TENANT_ALL,
+            tenant_name='dataall',
+        )
+        assert sorted(provisioned) == ['provisioned1', 'provisioned2']
+        for name in provisioned:
+            assert dataall.db.api.TenantPolicy.check_user_tenant_permission(
+                session=session,
+                username='bob',
+                groups=[name],
+                permission_name=dataall.db.permissions.MANAGE_DATASETS,
+                tenant_name='dataall',
+            )
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        with db.scoped_session() as session:
+            assert not dataall.db.api.TenantPolicy.provision_groups(
+                session=session,
+                groups=groups,
+                permissions=dataall.db.permissions.TENANT_ALL,
+                tenant_name='dataall',
+            )
+    finally:
+        sqlalchemy.event.remove(db.engine, 'before_cursor_execute', count_statement)
+    assert not statements
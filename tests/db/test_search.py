@@ -0,0 +1,48 @@
+import pytest
+
+from dataall.db import models
+from dataall.db.search import contains, escape_like, search_filter
+
+
+@pytest.fixture(scope='module')
+def tags(db):
+    with db.scoped_session() as session:
+        session.add_all(
+            [
+                models.Tag(tag='Sales_2023', owner='alice'),
+                models.Tag(tag='sales-2024', owner='alice'),
+                models.Tag(tag='100%', owner='bob'),
+            ]
+        )
+        session.commit()
+    yield
+
+
+def test_escape_like():
+    assert escape_like('a%b_c\\d') == 'a\\%b\\_c\\\\d'
+
+
+def test_contains_is_case_insensitive(db, tags):
+    with db.scoped_session() as session:
+        tags = session.query(models.Tag).filter(contains(models.Tag.tag, 'SALES'))
+        assert {t.tag for t in tags} == {'Sales_2023', 'sales-2024'}
+
+
+def test_contains_matches_wildcards_literally(db, tags):
+    with db.scoped_session() as session:
+        assert [
+            t.tag
+            for t in session.query(models.Tag).filter(contains(models.Tag.tag, 's_2'))
+        ] == ['Sales_2023']
+        assert [
+            t.tag
+            for t in session.query(models.Tag).filter(contains(models.Tag.tag, '%'))
+        ] == ['100%']
+
+
+def test_search_filter_any_column(db, tags):
+    with db.scoped_session() as session:
+        tags = session.query(models.Tag).filter(
+            search_filter('bob', models.Tag.tag, models.Tag.owner)
+        )
+        assert [t.tag for t in tags] == ['100%']
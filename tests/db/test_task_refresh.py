@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from dataall.db import api, models
+
+ACTION = 'cloudformation.stack.describe_resources'
+
+
+def count_tasks(db, target_uri):
+    with db.scoped_session() as session:
+        return (
+            session.query(models.Task)
+            .filter(models.Task.targetUri == target_uri)
+            .count()
+        )
+
+
+def test_refresh_requests_are_coalesced(db):
+    with db.scoped_session() as session:
+        first = api.TaskRefresh.request_refresh(session, 'stack1', ACTION)
+        assert first
+        assert api.TaskRefresh.request_refresh(session, 'stack1', ACTION) is None
+        assert api.TaskRefresh.request_refresh(session, 'stack2', ACTION)
+    assert count_tasks(db, 'stack1') == 1
+
+
+def test_refresh_skipped_when_fresh(db):
+    with db.scoped_session() as session:
+        assert (
+            api.TaskRefresh.request_refresh(
+                session, 'stack3', ACTION, last_refreshed=datetime.now()
+            )
+            is None
+        )
+    assert count_tasks(db, 'stack3') == 0
+
+
+def test_refresh_after_staleness_window(db, monkeypatch):
+    monkeypatch.setenv('REFRESH_STALENESS_SECONDS', '60')
+    with db.scoped_session() as session:
+        task = api.TaskRefresh.request_refresh(session, 'stack4', ACTION)
+        task.created = datetime.now() - timedelta(minutes=5)
+        task.status = 'completed'
+        session.commit()
+        assert api.TaskRefresh.request_refresh(
+            session,
+            'stack4',
+            ACTION,
+            last_refreshed=datetime.now() - timedelta(minutes=5),
+        )
+    assert count_tasks(db, 'stack4') == 2
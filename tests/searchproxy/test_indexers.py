@@ -4,6 +4,7 @@ import pytest
 
 import dataall
 from dataall.searchproxy import indexers
+from dataall.searchproxy.bulk_indexer import BulkIndexer
 
 
 @pytest.fixture(scope='module', autouse=True)
@@ -152,3 +153,26 @@ def test_upsert_tables(db, dataset, env, mocker, folder):
             session, es={}, datasetUri=dataset.datasetUri
         )
         assert len(tables) == 1
+
+
+def test_bulk_indexer_indexes_parent_dataset_once(db, dataset, table, folder, mocker):
+    bulk = mocker.patch(
+        'dataall.searchproxy.bulk_indexer.helpers.bulk', return_value=(1, [])
+    )
+    with db.scoped_session() as session:
+        with BulkIndexer(session, es=True, batch_size=2) as indexer:
+            assert indexer.index_tables([dataset.datasetUri]) == [table.tableUri]
+            assert indexer.index_folders([dataset.datasetUri]) == [folder.locationUri]
+            assert indexer.index_datasets([dataset.datasetUri]) == [dataset.datasetUri]
+    assert bulk.call_count == 2
+    actions = [a for call in bulk.call_args_list for a in call[0][1]]
+    assert [a['_id'] for a in actions] == [
+        table.tableUri,
+        folder.locationUri,
+        dataset.datasetUri,
+    ]
+    dataset_doc = actions[2]['_source']
+    assert dataset_doc['tables'] == 1
+    assert dataset_doc['folders'] == 1
+    assert dataset_doc['resourceKind'] == 'dataset'
+    assert indexer.indexed == 3
@@ -1,3 +1,5 @@
+import datetime
+
 import pytest
 import dataall
 
@@ -82,13 +84,84 @@ def table(org, env, db, sync_dataset):
 
 
 def test_catalog_indexer(db, org, env, sync_dataset, table, mocker):
-    mocker.patch(
-        'dataall.searchproxy.indexers.upsert_dataset_tables', return_value=[table]
-    )
-    mocker.patch(
-        'dataall.searchproxy.indexers.upsert_dataset', return_value=sync_dataset
+    bulk = mocker.patch(
+        'dataall.searchproxy.bulk_indexer.helpers.bulk', return_value=(2, [])
     )
+    mocker.patch('dataall.searchproxy.bulk_indexer.helpers.scan', return_value=[])
     indexed_objects_counter = dataall.tasks.catalog_indexer.index_objects(
         engine=db, es=True
     )
     assert indexed_objects_counter == 2
+    assert bulk.call_count == 1
+    actions = bulk.call_args[0][1]
+    assert sorted(action['_id'] for action in actions) == sorted(
+        [sync_dataset.datasetUri, table.tableUri]
+    )
+
+
+def test_catalog_indexer_incremental(db, sync_dataset, table, mocker):
+    bulk = mocker.patch(
+        'dataall.searchproxy.bulk_indexer.helpers.bulk', return_value=(1, [])
+    )
+    mocker.patch(
+        'dataall.tasks.catalog_indexer.WATERMARK_OVERLAP', datetime.timedelta(0)
+    )
+    with db.scoped_session() as session:
+        watermark = dataall.tasks.catalog_indexer.get_watermark(session)
+        assert watermark.lastFullRebuild == watermark.watermark
+        since = watermark.watermark
+
+    assert dataall.tasks.catalog_indexer.index_objects(engine=db, es=True, full=False) == 0
+    assert bulk.call_count == 0
+
+    with db.scoped_session() as session:
+        dataset = session.query(dataall.db.models.Dataset).get(sync_dataset.datasetUri)
+        dataset.description = 'changed'
+    assert dataall.tasks.catalog_indexer.index_objects(engine=db, es=True, full=False) == 1
+    actions = bulk.call_args[0][1]
+    assert [action['_id'] for action in actions] == [sync_dataset.datasetUri]
+
+    with db.scoped_session() as session:
+        t = session.query(dataall.db.models.DatasetTable).get(table.tableUri)
+        t.LastGlueTableStatus = 'Deleted'
+    assert dataall.tasks.catalog_indexer.index_objects(engine=db, es=True, full=False) == 2
+    actions = bulk.call_args[0][1]
+    assert {(action['_op_type'], action['_id']) for action in actions} == {
+        ('index', sync_dataset.datasetUri),
+        ('delete', table.tableUri),
+    }
+
+    with db.scoped_session() as session:
+        watermark = dataall.tasks.catalog_indexer.get_watermark(session)
+        assert watermark.watermark > since
+        assert watermark.lastFullRebuild == since
+
+
+def test_catalog_indexer_full_rebuild_when_stale(db, sync_dataset, mocker):
+    bulk = mocker.patch(
+        'dataall.searchproxy.bulk_indexer.helpers.bulk', return_value=(1, [])
+    )
+    mocker.patch('dataall.searchproxy.bulk_indexer.helpers.scan', return_value=[])
+    mocker.patch(
+        'dataall.tasks.catalog_indexer.FULL_REBUILD_INTERVAL', datetime.timedelta(0)
+    )
+    assert dataall.tasks.catalog_indexer.index_objects(engine=db, es=True, full=False) == 1
+    assert [a['_id'] for a in bulk.call_args[0][1]] == [sync_dataset.datasetUri]
+    with db.scoped_session() as session:
+        watermark = dataall.tasks.catalog_indexer.get_watermark(session)
+        assert watermark.lastFullRebuild == watermark.watermark
+
+
+def test_catalog_indexer_full_rebuild_deletes_removed_objects(db, sync_dataset, mocker):
+    bulk = mocker.patch(
+        'dataall.searchproxy.bulk_indexer.helpers.bulk', return_value=(2, [])
+    )
+    mocker.patch(
+        'dataall.searchproxy.bulk_indexer.helpers.scan',
+        return_value=[{'_id': sync_dataset.datasetUri}, {'_id': 'hard-deleted-uri'}],
+    )
+    assert dataall.tasks.catalog_indexer.index_objects(engine=db, es=True) == 2
+    assert {(a['_op_type'], a['_id']) for a in bulk.call_args[0][1]} == {
+        ('index', sync_dataset.datasetUri),
+        ('delete', 'hard-deleted-uri'),
+    }
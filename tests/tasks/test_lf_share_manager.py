@@ -10,6 +10,7 @@ from typing import Callable
 
 from dataall.db import models
 from dataall.api import constants
+from dataall.aws.handlers.ram import Ram
 
 from dataall.tasks.data_sharing.share_processors.lf_process_cross_account_share import ProcessLFCrossAccountShare
 from dataall.tasks.data_sharing.share_processors.lf_process_same_account_share import ProcessLFSameAccountShare
@@ -699,3 +700,112 @@ def test_handle_revoke_failure(
 
     # Then
     alarm_service_mock.assert_called_once()
+
+
+def test_process_approved_shares_cross_account(
+        db,
+        dataset1: models.Dataset,
+        share_cross_account: models.ShareObject,
+        share_item_cross_account: models.ShareObjectItem,
+        table1: models.DatasetTable,
+        source_environment: models.Environment,
+        target_environment: models.Environment,
+        target_environment_group: models.EnvironmentGroup,
+        mocker,
+):
+    mocker.patch("dataall.aws.handlers.sts.SessionHelper.remote_client")
+    mocker.patch("dataall.tasks.data_sharing.share_managers.lf_share_manager.time.sleep")
+    mocker.patch(
+        "dataall.aws.handlers.lakeformation.LakeFormation.grant_pivot_role_all_database_permissions",
+    )
+    mocker.patch.object(ProcessLFCrossAccountShare, "create_shared_database")
+    glue_mock = mocker.patch("dataall.aws.handlers.glue.Glue.table_exists", return_value=True)
+    revoke_mock = mocker.patch(
+        "dataall.aws.handlers.lakeformation.LakeFormation.batch_revoke_permissions",
+    )
+    grant_mock = mocker.patch(
+        "dataall.aws.handlers.lakeformation.LakeFormation.batch_grant_permissions",
+        return_value=[],
+    )
+    ram_mock = mocker.patch(
+        "dataall.aws.handlers.ram.Ram.accept_ram_invitations",
+        return_value=[],
+    )
+    link_mock = mocker.patch.object(ProcessLFCrossAccountShare, "create_resource_link")
+
+    with db.scoped_session() as session:
+        processor = ProcessLFCrossAccountShare(
+            session,
+            dataset1,
+            share_cross_account,
+            [table1],
+            [],
+            source_environment,
+            target_environment,
+            target_environment_group,
+        )
+        assert processor.process_approved_shares()
+
+        glue_mock.assert_called_once()
+        revoke_mock.assert_called_once()
+        grant_mock.assert_called_once()
+        entries = grant_mock.call_args[0][2]
+        assert [e['Resource']['Table']['Name'] for e in entries] == [table1.GlueTableName]
+        assert entries[0]['Principal']['DataLakePrincipalIdentifier'] == TARGET_ACCOUNT_ENV
+        ram_mock.assert_called_once()
+        link_mock.assert_called_once()
+        item = session.query(models.ShareObjectItem).get(share_item_cross_account.shareItemUri)
+        assert item.status == constants.ShareItemStatus.Share_Succeeded.value
+
+
+def test_share_tables_with_target_account_failures(
+        processor_cross_account: ProcessLFCrossAccountShare,
+        table1: models.DatasetTable,
+        table2: models.DatasetTable,
+        mocker,
+):
+    mocker.patch("dataall.aws.handlers.sts.SessionHelper.remote_client")
+    mocker.patch("dataall.tasks.data_sharing.share_managers.lf_share_manager.time.sleep")
+    mocker.patch("dataall.aws.handlers.lakeformation.LakeFormation.batch_revoke_permissions")
+    mocker.patch(
+        "dataall.aws.handlers.lakeformation.LakeFormation.batch_grant_permissions",
+        return_value=[{'RequestEntry': {'Id': '1'}, 'Error': {'ErrorCode': 'AccessDeniedException'}}],
+    )
+    jobs = [
+        {'data': processor_cross_account.build_share_data(table), 'error': None}
+        for table in [table1, table2]
+    ]
+    processor_cross_account.share_tables_with_target_account(jobs)
+    # Grant failures are warnings, like the single table grants
+    assert jobs[0]['error'] is None
+    assert jobs[1]['error'] is None
+
+
+def test_accept_ram_invitations_resets_expired_share_once(mocker):
+    source_ram, target_ram = mocker.MagicMock(), mocker.MagicMock()
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.remote_client",
+        side_effect=[source_ram, target_ram],
+    )
+    mocker.patch(
+        "dataall.aws.handlers.ram.Ram.list_resource_share_associations",
+        return_value=[{'resourceShareArn': 'lf-share'}],
+    )
+    mocker.patch(
+        "dataall.aws.handlers.ram.Ram.get_resource_share_invitations",
+        return_value=[
+            {
+                'resourceShareName': 'LakeFormation-V2-share',
+                'resourceShareArn': 'lf-share',
+                'resourceShareInvitationArn': 'invitation',
+                'status': 'EXPIRED',
+            }
+        ],
+    )
+    source = {'accountid': SOURCE_ENV_ACCOUNT, 'region': 'eu-central-1', 'database': 'db'}
+    target = {'accountid': TARGET_ACCOUNT_ENV, 'region': 'eu-central-1'}
+
+    reshare = Ram.accept_ram_invitations(source, target, ['table1', 'table2'])
+
+    assert reshare == ['table1', 'table2']
+    source_ram.delete_resource_share.assert_called_once_with(resourceShareArn='lf-share')
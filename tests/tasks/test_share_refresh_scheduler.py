@@ -0,0 +1,152 @@
+import threading
+import time
+from typing import Callable
+
+import pytest
+
+from dataall.api import constants
+from dataall.db import models
+from dataall.tasks.data_sharing.share_refresh_scheduler import (
+    ShareRefreshScheduler,
+    ShareRefreshStatus,
+)
+
+
+@pytest.fixture(scope='module')
+def org1(org: Callable) -> models.Organization:
+    yield org(label='org', owner='alice', SamlGroupName='admins')
+
+
+@pytest.fixture(scope='module')
+def environments(environment: Callable, org1, group) -> [models.Environment]:
+    yield [
+        environment(
+            organization=org1,
+            awsAccountId=account * 12,
+            label=f'env{account}',
+            owner=group.owner,
+            samlGroupName=group.name,
+            environmentDefaultIAMRoleName='role',
+        )
+        for account in ['1', '2', '3']
+    ]
+
+
+@pytest.fixture(scope='module')
+def shares(db, dataset: Callable, environment_group: Callable, share: Callable, org1, group, environments):
+    source, target1, target2 = environments
+    dataset1 = dataset(organization=org1, environment=source, label='dataset1')
+    env_groups = {
+        target.environmentUri: environment_group(environment=target, group=group)
+        for target in [target1, target2]
+    }
+    shares = [
+        share(dataset1, target, env_groups[target.environmentUri])
+        for target in [target1, target1, target2, target2]
+    ]
+    with db.scoped_session() as session:
+        session.query(models.ShareObject).filter(
+            models.ShareObject.shareUri == shares[1].shareUri
+        ).update({'status': constants.ShareObjectStatus.Revoked.value})
+        session.query(models.ShareObject).filter(
+            models.ShareObject.shareUri == shares[3].shareUri
+        ).update({'status': constants.ShareObjectStatus.Draft.value})
+        session.commit()
+    yield shares
+
+
+def progress_statuses(db):
+    with db.scoped_session() as session:
+        return {
+            p.shareUri: p.status
+            for p in session.query(models.ShareRefreshProgress).all()
+        }
+
+
+def test_refresh_shares(db, shares):
+    calls = {}
+
+    def refresh_share(engine, share_uri, status):
+        assert engine is db
+        calls[share_uri] = status
+        if share_uri == shares[2].shareUri:
+            raise Exception('failed')
+
+    summary = ShareRefreshScheduler(db, max_workers=4).run(refresh_share)
+
+    assert summary == {ShareRefreshStatus.Succeeded: 2, ShareRefreshStatus.Failed: 1}
+    assert calls == {
+        shares[0].shareUri: constants.ShareObjectStatus.Approved.value,
+        shares[1].shareUri: constants.ShareObjectStatus.Revoked.value,
+        shares[2].shareUri: constants.ShareObjectStatus.Approved.value,
+    }
+    assert progress_statuses(db) == {
+        shares[0].shareUri: ShareRefreshStatus.Succeeded,
+        shares[1].shareUri: ShareRefreshStatus.Succeeded,
+        shares[2].shareUri: ShareRefreshStatus.Failed,
+    }
+
+
+def test_refresh_shares_account_cap(db, shares):
+    lock = threading.Lock()
+    in_flight = {'current': 0, 'max': 0}
+
+    def refresh_share(engine, share_uri, status):
+        with lock:
+            in_flight['current'] += 1
+            in_flight['max'] = max(in_flight['max'], in_flight['current'])
+        time.sleep(0.05)
+        with lock:
+            in_flight['current'] -= 1
+
+    summary = ShareRefreshScheduler(db, max_workers=4, max_per_account=1).run(
+        refresh_share
+    )
+    assert summary == {ShareRefreshStatus.Succeeded: 3}
+    # every share has the same source account
+    assert in_flight['max'] == 1
+
+
+def test_refresh_shares_resumes_unfinished_run(db, shares):
+    with db.scoped_session() as session:
+        session.query(models.ShareRefreshProgress).delete()
+        session.add_all(
+            [
+                models.ShareRefreshProgress(
+                    runUri='crashed',
+                    shareUri=share.shareUri,
+                    sourceAccountId='1' * 12,
+                    targetAccountId='2' * 12,
+                    status=status,
+                )
+                for share, status in [
+                    (shares[0], ShareRefreshStatus.Succeeded),
+                    (shares[1], ShareRefreshStatus.InProgress),
+                    (shares[2], ShareRefreshStatus.Pending),
+                ]
+            ]
+        )
+        session.commit()
+    calls = []
+
+    summary = ShareRefreshScheduler(db).run(
+        lambda engine, share_uri, status: calls.append(share_uri)
+    )
+    assert summary == {ShareRefreshStatus.Succeeded: 2}
+    assert sorted(calls) == sorted([shares[1].shareUri, shares[2].shareUri])
+    assert set(progress_statuses(db).values()) == {ShareRefreshStatus.Succeeded}
+
+
+def test_refresh_shares_exits_while_another_run_holds_the_lease(db, shares):
+    calls = []
+    running = ShareRefreshScheduler(db)
+    with running.run_lease() as leased:
+        assert leased
+        summary = ShareRefreshScheduler(db).run(
+            lambda engine, share_uri, status: calls.append(share_uri)
+        )
+    assert summary == {}
+    assert calls == []
+
+    with running.run_lease() as leased:
+        assert leased
@@ -1,6 +1,11 @@
+import threading
+from types import SimpleNamespace
+
 import pytest
 import dataall
 from dataall.api.constants import OrganisationUserRole
+from dataall.cdkproxy.deployment_planner import DeploymentPlanner
+from dataall.tasks import stacks_updater
 
 
 @pytest.fixture(scope='module', autouse=True)
@@ -66,10 +71,208 @@ def sync_dataset(org, env, db):
 def test_stacks_update(db, org, env, sync_dataset, mocker):
     mocker.patch(
         'dataall.tasks.stacks_updater.update_stack',
-        return_value=True,
+        return_value=None,
     )
     envs, datasets = dataall.tasks.stacks_updater.update_stacks(
         engine=db, envname='local'
     )
     assert len(envs) == 1
     assert len(datasets) == 1
+
+
+@pytest.fixture(scope='module')
+def env_stack(env, db):
+    with db.scoped_session() as session:
+        stack = dataall.db.models.Stack(
+            targetUri=env.environmentUri,
+            accountid=env.AwsAccountId,
+            region=env.region,
+            stack='environment',
+            name='dataall-env-stack',
+        )
+        session.add(stack)
+    yield stack
+
+
+def test_fingerprint_tracks_target_and_sources(db, env, env_stack):
+    with db.scoped_session() as session:
+        stack = session.query(dataall.db.models.Stack).get(env_stack.stackUri)
+        fingerprint = DeploymentPlanner.fingerprint(session, stack)
+        assert DeploymentPlanner.fingerprint(session, stack) == fingerprint
+
+        environment = session.query(dataall.db.models.Environment).get(env.environmentUri)
+        environment.description = 'updated description'
+        session.flush()
+        assert DeploymentPlanner.fingerprint(session, stack) != fingerprint
+        session.rollback()
+
+
+def test_update_stack_skips_unchanged_stacks(db, env, env_stack, mocker):
+    mocker.patch('dataall.tasks.stacks_updater.Parameter')
+    mocker.patch(
+        'dataall.tasks.stacks_updater.Ecs.list_running_tasks', return_value=[]
+    )
+    mocker.patch(
+        'dataall.tasks.stacks_updater.Ecs.get_task_status', return_value='STOPPED'
+    )
+    run_task = mocker.patch(
+        'dataall.tasks.stacks_updater.Ecs.run_cdkproxy_task', return_value='arn'
+    )
+    with db.scoped_session() as session:
+        stack = session.query(dataall.db.models.Stack).get(env_stack.stackUri)
+        stack.status = 'UPDATE_COMPLETE'
+        stack.fingerprint = DeploymentPlanner.fingerprint(session, stack)
+        session.commit()
+
+        stacks_updater.update_stack(
+            session=session, envname='local', target_uri=env.environmentUri
+        )
+        run_task.assert_not_called()
+
+        stacks_updater.update_stack(
+            session=session, envname='local', target_uri=env.environmentUri, force=True
+        )
+        run_task.assert_called_once_with(stack_uri=stack.stackUri)
+
+        stack.status = 'UPDATE_ROLLBACK_COMPLETE'
+        stacks_updater.update_stack(
+            session=session, envname='local', target_uri=env.environmentUri
+        )
+        assert run_task.call_count == 2
+
+
+def test_orchestrator_updates_environment_before_its_datasets(db, env, sync_dataset, mocker):
+    started = []
+
+    def update_stack(session, envname, target_uri, force):
+        started.append(target_uri)
+        return f'arn-{target_uri}'
+
+    mocker.patch('dataall.tasks.stacks_updater.update_stack', side_effect=update_stack)
+    mocker.patch('dataall.tasks.stacks_updater.Parameter')
+    mocker.patch('dataall.tasks.stacks_updater.Ecs.client')
+    task_status = mocker.patch(
+        'dataall.tasks.stacks_updater.Ecs.get_task_status',
+        side_effect=['RUNNING', 'STOPPED', 'STOPPED'],
+    )
+    mocker.patch('dataall.tasks.stacks_updater.time.sleep')
+    mocker.patch(
+        'dataall.db.api.Stack.get_stack_by_target_uri',
+        return_value=dataall.db.models.Stack(status='UPDATE_COMPLETE'),
+    )
+    with db.scoped_session() as session:
+        environments = session.query(dataall.db.models.Environment).all()
+        datasets = session.query(dataall.db.models.Dataset).all()
+        summary = stacks_updater.StackUpdateOrchestrator(
+            db, 'local', max_workers=4, max_per_account=1
+        ).run(environments, datasets)
+
+    assert started == [env.environmentUri, sync_dataset.datasetUri]
+    assert task_status.call_count == 3
+    assert [r['targetUri'] for r in summary] == started
+    assert {r['status'] for r in summary} == {stacks_updater.StackUpdateStatus.Succeeded}
+    assert all(r['duration'] is not None for r in summary)
+
+
+def test_orchestrator_does_not_block_workers_on_a_busy_account(db, mocker):
+    mocker.patch('dataall.tasks.stacks_updater.Ecs.client')
+    other_account_started = threading.Event()
+
+    def update(target_uris, account, labels):
+        if account == 'other':
+            other_account_started.set()
+        else:
+            other_account_started.wait(timeout=5)
+        return [
+            {
+                'targetUri': target_uri,
+                'label': label,
+                'status': stacks_updater.StackUpdateStatus.Succeeded,
+                'duration': 0,
+            }
+            for target_uri, label in zip(target_uris, labels)
+        ]
+
+    orchestrator = stacks_updater.StackUpdateOrchestrator(
+        db, 'local', max_workers=2, max_per_account=1
+    )
+    mocker.patch.object(orchestrator, 'update', side_effect=update)
+    environments = [
+        SimpleNamespace(environmentUri=uri, AwsAccountId=account, label=uri)
+        for uri, account in [('busy-1', 'busy'), ('busy-2', 'busy'), ('other-1', 'other')]
+    ]
+    summary = orchestrator.run(environments, [])
+
+    assert other_account_started.is_set()
+    assert [r['targetUri'] for r in summary][0] == 'other-1'
+
+
+def test_orchestrator_times_out_with_backoff(db, env, mocker):
+    mocker.patch('dataall.tasks.stacks_updater.Parameter')
+    mocker.patch(
+        'dataall.tasks.stacks_updater.Ecs.get_task_status', return_value='RUNNING'
+    )
+    sleep = mocker.patch('dataall.tasks.stacks_updater.time.sleep')
+    orchestrator = stacks_updater.StackUpdateOrchestrator(db, 'local', timeout=0.5)
+    assert (
+        orchestrator.wait_for_stack(env.environmentUri, 'arn')
+        == stacks_updater.StackUpdateStatus.TimedOut
+    )
+    sleep.assert_not_called()
+
+
+def test_update_stack_batch_starts_one_task(db, env, env_stack, sync_dataset, mocker):
+    mocker.patch('dataall.tasks.stacks_updater.Parameter')
+    mocker.patch(
+        'dataall.tasks.stacks_updater.Ecs.list_running_tasks', return_value=[]
+    )
+    mocker.patch(
+        'dataall.tasks.stacks_updater.Ecs.get_task_status', return_value='STOPPED'
+    )
+    run_task = mocker.patch(
+        'dataall.tasks.stacks_updater.Ecs.run_cdkproxy_task', return_value='arn'
+    )
+    with db.scoped_session() as session:
+        dataset_stack = dataall.db.models.Stack(
+            targetUri=sync_dataset.datasetUri,
+            accountid=env.AwsAccountId,
+            region=env.region,
+            stack='dataset',
+            name='dataall-dataset-stack',
+        )
+        session.add(dataset_stack)
+        session.commit()
+
+        task_arns = stacks_updater.update_stack_batch(
+            session=session,
+            envname='local',
+            target_uris=[env.environmentUri, sync_dataset.datasetUri],
+            force=True,
+        )
+        assert task_arns == {env.environmentUri: 'arn', sync_dataset.datasetUri: 'arn'}
+        run_task.assert_called_once_with(
+            stack_uris=[env_stack.stackUri, dataset_stack.stackUri]
+        )
+
+
+def test_update_stack_waits_for_the_batch_deploying_it(db, env, env_stack, mocker):
+    mocker.patch('dataall.tasks.stacks_updater.Parameter')
+    mocker.patch(
+        'dataall.tasks.stacks_updater.Ecs.list_running_tasks', return_value=[]
+    )
+    mocker.patch(
+        'dataall.tasks.stacks_updater.Ecs.get_task_status', return_value='RUNNING'
+    )
+    run_task = mocker.patch('dataall.tasks.stacks_updater.Ecs.run_cdkproxy_task')
+    with db.scoped_session() as session:
+        stack = session.query(dataall.db.models.Stack).get(env_stack.stackUri)
+        stack.EcsTaskArn = 'batch-arn'
+        session.commit()
+
+        assert (
+            stacks_updater.update_stack(
+                session=session, envname='local', target_uri=env.environmentUri, force=True
+            )
+            == 'batch-arn'
+        )
+        run_task.assert_not_called()
@@ -2,6 +2,7 @@ import pytest
 
 import dataall
 from dataall.api.constants import OrganisationUserRole
+from dataall.tasks.subscriptions.s3_prefix_index import S3PrefixIndex
 
 
 @pytest.fixture(scope='module')
@@ -150,3 +151,61 @@ def test_subscriptions(org, env, otherenv, db, dataset, share, mocker):
     queues = subscriber.get_queues(envs)
     assert queues
     assert subscriber.notify_consumers(db, messages)
+
+
+def test_s3_prefix_index():
+    index = S3PrefixIndex()
+    index.add('111', 'eu-west-1', 's3://bucket/sales/', 'sales')
+    index.add('111', 'eu-west-1', 's3://bucket/sales/2023/', 'sales_2023')
+    index.add('111', 'eu-west-1', 's3://bucket/hr/', 'hr')
+    assert len(index) == 3
+
+    assert index.find('111', 'eu-west-1', 's3://bucket/sales/') == 'sales'
+    assert index.find('111', 'eu-west-1', 's3://bucket/sales') == 'sales'
+    assert index.find('111', 'eu-west-1', 's3://bucket/sales/2023/') == 'sales_2023'
+    assert index.find('111', 'eu-west-1', 's3://bucket/sales/2023/01/file.csv') is None
+    assert index.find('111', 'eu-west-1', 's3://bucket/') == 'sales'
+    assert index.find('111', 'eu-west-1', 's3://bucket/finance/') is None
+    assert index.find('111', 'us-east-1', 's3://bucket/sales/') is None
+    assert index.find('222', 'eu-west-1', 's3://bucket/sales/') is None
+
+
+def test_subscriptions_fan_out_batch(org, env, otherenv, db, dataset, share, mocker):
+    sns_call = mocker.patch(
+        'dataall.tasks.subscriptions.subscription_service.SubscriptionService.sns_call',
+        return_value=True,
+    )
+    get_consumers = mocker.spy(
+        dataall.tasks.subscriptions.subscription_service.SubscriptionService,
+        'get_consumers',
+    )
+    with db.scoped_session() as session:
+        share_object = session.query(dataall.db.models.ShareObject).filter(
+            dataall.db.models.ShareObject.datasetUri == dataset.datasetUri
+        ).first()
+        share_object.principalId = otherenv.environmentUri
+    mocker.patch(
+        'dataall.tasks.subscriptions.subscription_service.SubscriptionService.redshift_copy',
+        return_value=True,
+    )
+    message = {
+        'prefix': 's3://dataset/testtable/csv/',
+        'accountid': '123456789012',
+        'region': 'eu-west-1',
+    }
+    assert dataall.tasks.subscriptions.subscription_service.SubscriptionService.notify_consumers(
+        db, [dict(message) for _ in range(50)]
+    )
+    assert get_consumers.call_count == 1
+    assert sns_call.call_count == 1
+
+    # Object notifications below the table prefix are not table updates
+    sns_call.reset_mock()
+    assert dataall.tasks.subscriptions.subscription_service.SubscriptionService.notify_consumers(
+        db,
+        [
+            dict(message, prefix=f's3://dataset/testtable/csv/part-{i:04}.csv')
+            for i in range(50)
+        ],
+    )
+    sns_call.assert_not_called()
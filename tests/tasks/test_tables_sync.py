@@ -3,6 +3,12 @@ import dataall
 from dataall.api.constants import OrganisationUserRole
 
 
+@pytest.fixture(scope='module', autouse=True)
+def permissions(db):
+    with db.scoped_session() as session:
+        yield dataall.db.api.Permission.init_permissions(session)
+
+
 @pytest.fixture(scope='module', autouse=True)
 def org(db):
     with db.scoped_session() as session:
@@ -92,7 +98,7 @@ def table(org, env, db, sync_dataset):
     yield table
 
 
-def _test_tables_sync(db, org, env, sync_dataset, table, mocker):
+def test_tables_sync(db, org, env, sync_dataset, table, mocker):
     mocker.patch(
         'dataall.aws.handlers.glue.Glue.list_glue_database_tables',
         return_value=[
@@ -146,16 +152,25 @@ def _test_tables_sync(db, org, env, sync_dataset, table, mocker):
             },
         ],
     )
-    mocker.patch(
-        'dataall.tasks.tables_syncer.is_assumable_pivot_role', return_value=True
+    aws_session = mocker.patch(
+        'dataall.aws.handlers.sts.SessionHelper.remote_session',
     )
     mocker.patch(
-        'dataall.aws.handlers.glue.Glue.grant_principals_all_table_permissions',
-        return_value=True,
+        'dataall.aws.handlers.sts.SessionHelper.get_delegation_role_arn',
+        return_value='arn:aws:iam::123456789012:role/dataallPivotRole',
+    )
+    batch_grant = mocker.patch(
+        'dataall.aws.handlers.lakeformation.LakeFormation.batch_grant_permissions',
+        return_value=[],
     )
 
     processed_tables = dataall.tasks.tables_syncer.sync_tables(engine=db)
     assert len(processed_tables) == 2
+    aws_session.assert_called_once_with(accountid=sync_dataset.AwsAccountId)
+    assert batch_grant.call_count == 1
+    entries = batch_grant.call_args[0][2]
+    assert len(entries) == 6
+    assert {e['Resource']['Table']['Name'] for e in entries} == {'new_table', 'table1'}
     with db.scoped_session() as session:
         saved_table: dataall.db.models.DatasetTable = (
             session.query(dataall.db.models.DatasetTable)
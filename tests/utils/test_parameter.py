@@ -0,0 +1,49 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from dataall.utils import Parameter
+
+
+@pytest.fixture
+def ssm(mocker):
+    Parameter.invalidate()
+    client = mocker.MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {
+            'Parameters': [
+                {'Name': '/dataall/test/sqs/queue_url', 'Value': 'https://queue'},
+                {'Name': '/dataall/test/ecs/cluster/name', 'Value': 'cluster'},
+            ]
+        }
+    ]
+    client.get_parameter.side_effect = ClientError(
+        {'Error': {'Code': 'ParameterNotFound', 'Message': 'not found'}},
+        'GetParameter',
+    )
+    mocker.patch.object(Parameter, 'ssm', return_value=client)
+    yield client
+    Parameter.invalidate()
+
+
+def test_parameters_are_loaded_once(ssm):
+    assert Parameter.get_parameter(env='test', path='sqs/queue_url') == 'https://queue'
+    assert Parameter.get_parameter(env='test', path='ecs/cluster/name') == 'cluster'
+    assert Parameter().get_parameter(env='test', path='/sqs/queue_url') == 'https://queue'
+    ssm.get_paginator.return_value.paginate.assert_called_once_with(
+        Path='/dataall/test/', Recursive=True
+    )
+    ssm.get_parameter.assert_not_called()
+
+
+def test_missing_parameter_falls_back_to_get_parameter(ssm):
+    assert Parameter.get_parameter(env='test', path='unknown') is None
+    ssm.get_parameter.assert_called_once_with(Name='/dataall/test/unknown')
+
+
+def test_put_parameter_invalidates_the_cache(ssm):
+    Parameter.get_parameter(env='test', path='sqs/queue_url')
+    ssm.get_parameter.side_effect = None
+    ssm.get_parameter.return_value = {'Parameter': {'Value': 'new'}}
+    assert Parameter.put_parameter(env='test', path='new/param', value='new') == 'new'
+    Parameter.get_parameter(env='test', path='sqs/queue_url')
+    assert ssm.get_paginator.return_value.paginate.call_count == 2
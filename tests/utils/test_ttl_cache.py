@@ -0,0 +1,41 @@
+from dataall.utils import TTLCache
+
+
+def test_ttl_cache_get_put():
+    cache = TTLCache(ttl=60)
+    assert cache.get('key') is None
+    cache.put('key', 'value')
+    assert cache.get('key') == 'value'
+    assert 'key' in cache
+    cache.invalidate('key')
+    assert 'key' not in cache
+
+
+def test_ttl_cache_expiry():
+    cache = TTLCache(ttl=60)
+    cache.put('key', 'value', ttl=-1)
+    assert cache.get('key', 'default') == 'default'
+    cache.put('key', 'value', ttl=0)
+    assert 'key' not in cache
+
+
+def test_ttl_cache_get_or_load():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_load('key', loader) is None
+    assert cache.get_or_load('key', loader) is None
+    assert len(calls) == 1
+
+
+def test_ttl_cache_maxsize():
+    cache = TTLCache(ttl=60, maxsize=2)
+    for key in ['a', 'b', 'c']:
+        cache.put(key, key)
+    assert len(cache) == 2
+    assert 'a' not in cache
+    assert cache.get('c') == 'c'